@@ -134,6 +134,9 @@ def _ensure_mpl_font_cache(log, mpl, font_manager):
         log(f"font cache write failed: {exc}")
 
 def main():
+    # needed by the parallel-fitting process pool in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     log = _startup_logger()
     log("main start")
     debug_mode, cleaned_argv = _consume_debug_flag(sys.argv)
@@ -252,6 +255,9 @@ def main():
 
         startup.close()
 
+        # warm the auto-pick model once the window is up
+        QTimer.singleShot(0, navigator.preload_autopick_model)
+
     def _start_background():
         startup.set_message("Loading graphics…")
         threading.Thread(target=_load_background, daemon=True).start()
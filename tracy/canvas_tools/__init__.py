@@ -15,11 +15,14 @@ from .dialogs import (
     SaveKymographDialog,
     StepSettingsDialog,
     DiffusionSettingsDialog,
+    DriftSettingsDialog,
     ShortcutsDialog,
 )
 from .layout import CustomSplitter, CustomSplitterHandle, RoundedFrame
 from .animators import AxesRectAnimator
 from .recalc import RecalcDialog, RecalcWorker, RecalcAllWorker
+from .steps import StepsWorker
+from .kymographs import KymographWorker
 from .widgets import ClickableLabel, AnimatedIconButton
 from .tooltips import (
     BubbleTip,
@@ -41,6 +44,7 @@ __all__ = [
     "SaveKymographDialog",
     "StepSettingsDialog",
     "DiffusionSettingsDialog",
+    "DriftSettingsDialog",
     "ShortcutsDialog",
     "CustomSplitter",
     "CustomSplitterHandle",
@@ -49,6 +53,8 @@ __all__ = [
     "RecalcDialog",
     "RecalcWorker",
     "RecalcAllWorker",
+    "StepsWorker",
+    "KymographWorker",
     "ClickableLabel",
     "AnimatedIconButton",
     "BubbleTip",
@@ -1216,6 +1216,73 @@ class DiffusionSettingsDialog(QDialog):
         self.calculate_all = False
         self.accept()
 
+class DriftSettingsDialog(QDialog):
+    def __init__(self, n_channels, current_channel, n_frames, has_spot: bool, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Drift correction")
+        self.new_channel = current_channel
+        self.new_reference = "first"
+        self.new_ref_frames = min(10, n_frames)
+        self.use_spot = False
+
+        layout = QVBoxLayout(self)
+        self.setStyleSheet(QApplication.instance().styleSheet())
+
+        self.chan_combo = None
+        if n_channels > 1:
+            chan_layout = QHBoxLayout()
+            chan_label = QLabel("Channel:")
+            chan_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.chan_combo = QComboBox()
+            for ch in range(n_channels):
+                self.chan_combo.addItem(f"Channel {ch+1}")
+            self.chan_combo.setCurrentIndex(current_channel)
+            chan_layout.addWidget(chan_label)
+            chan_layout.addWidget(self.chan_combo)
+            layout.addLayout(chan_layout)
+
+        ref_layout = QHBoxLayout()
+        ref_label = QLabel("Reference:")
+        ref_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.ref_combo = QComboBox()
+        self.ref_combo.addItem("First N frames", "first")
+        self.ref_combo.addItem("Rolling (previous N frames)", "rolling")
+        ref_layout.addWidget(ref_label)
+        ref_layout.addWidget(self.ref_combo)
+        layout.addLayout(ref_layout)
+
+        n_layout = QHBoxLayout()
+        n_label = QLabel("N (frames):")
+        n_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.n_spin = QSpinBox()
+        self.n_spin.setRange(1, max(1, n_frames))
+        self.n_spin.setValue(self.new_ref_frames)
+        n_layout.addWidget(n_label)
+        n_layout.addWidget(self.n_spin)
+        layout.addLayout(n_layout)
+
+        # the clicked spot is only a fallback for frames that fail to register
+        self.spot_check = QCheckBox("Fall back to the selected spot")
+        self.spot_check.setEnabled(has_spot)
+        self.spot_check.setChecked(has_spot)
+        layout.addWidget(self.spot_check)
+
+        btns = QHBoxLayout()
+        btns.addWidget(QPushButton("Cancel", clicked=self.reject))
+        btn_set = QPushButton("Run", clicked=self._on_set)
+        btn_set.setDefault(True)
+        btns.addWidget(btn_set)
+
+        layout.addLayout(btns)
+
+    def _on_set(self):
+        if self.chan_combo is not None:
+            self.new_channel = self.chan_combo.currentIndex()
+        self.new_reference = self.ref_combo.currentData()
+        self.new_ref_frames = self.n_spin.value()
+        self.use_spot = self.spot_check.isEnabled() and self.spot_check.isChecked()
+        self.accept()
+
 
 class ShortcutsDialog(QDialog):
     def __init__(self, parent=None):
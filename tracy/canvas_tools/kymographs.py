@@ -0,0 +1,45 @@
+from ._shared import *
+
+class KymographWorker(QObject):
+    """
+    Background kymograph generation for many ROIs and channels.
+    navigator.build_kymographs walks the movie once, sampling every ROI and
+    channel per chunk of frames; `progress` reports frames done and the run
+    stops at the next chunk after cancel().
+    With stream=True, `chunk` hands out the kymographs after every chunk of
+    frames; they are filled in place, so the UI can show them while the rest
+    is sampled.
+    """
+    progress = pyqtSignal(int)          # frames done so far
+    chunk    = pyqtSignal(object, int)  # (kymographs being filled, frames done)
+    finished = pyqtSignal(dict)         # {(roi_name, channel): kymograph}
+    canceled = pyqtSignal()
+    failed   = pyqtSignal(str)
+
+    def __init__(self, rois, channels, navigator, stream=False):
+        super().__init__()
+        self._rois        = dict(rois)
+        self._channels    = list(channels)
+        self._navigator   = navigator
+        self._stream      = bool(stream)
+        self._is_canceled = False
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self._navigator.build_kymographs(
+                self._rois, self._channels,
+                progress=self.progress.emit,
+                is_canceled=lambda: self._is_canceled,
+                on_chunk=self.chunk.emit if self._stream else None,
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if result is None or self._is_canceled:
+            self.canceled.emit()
+            return
+        self.finished.emit(result)
+
+    def cancel(self):
+        self._is_canceled = True
@@ -21,7 +21,7 @@ class RecalcDialog(QDialog):
         mode_label = QLabel("Tracking mode:")
         mode_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.mode_combo = QComboBox()
-        self.mode_combo.addItems(["Independent", "Tracked", "Smooth"]) #, "Same center"
+        self.mode_combo.addItems(["Independent", "Tracked", "Smooth", "Fast"]) #, "Same center"
         self.mode_combo.setCurrentText(current_mode)
         mode_layout.addWidget(mode_label)
         mode_layout.addWidget(self.mode_combo)
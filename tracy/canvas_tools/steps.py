@@ -0,0 +1,65 @@
+from ._shared import *
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+class StepsWorker(QObject):
+    """
+    Background step detection for many trajectories.
+    Traces are split into chunks, each chunk is filtered in one go by
+    navigator.compute_steps_for_many, and chunks run on a thread pool (the
+    cumulative-sum filter spends its time in NumPy, which releases the GIL).
+    Every finished chunk is streamed back through `chunk` as a list of
+    (row, step_indices, step_medians).
+    """
+    progress = pyqtSignal(int)      # trajectories done so far
+    chunk    = pyqtSignal(list)
+    finished = pyqtSignal()
+    canceled = pyqtSignal()
+
+    def __init__(self, rows, traces, navigator, chunk_size=64, max_workers=None):
+        super().__init__()
+        # traces: list of (frames, intensities), copied so edits on the GUI
+        # thread cannot change them mid-run
+        self._rows        = list(rows)
+        self._traces      = [(list(f), list(i)) for f, i in traces]
+        self._navigator   = navigator
+        self._chunk_size  = max(1, int(chunk_size))
+        self._max_workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+        self._is_canceled = False
+
+    @pyqtSlot()
+    def run(self):
+        n = len(self._rows)
+        chunks = [
+            (self._rows[s:s + self._chunk_size], self._traces[s:s + self._chunk_size])
+            for s in range(0, n, self._chunk_size)
+        ]
+        done = 0
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = {
+                pool.submit(self._navigator.compute_steps_for_many, traces): rows
+                for rows, traces in chunks
+            }
+            for fut in as_completed(futures):
+                if self._is_canceled:
+                    for f in futures:
+                        f.cancel()
+                    self.canceled.emit()
+                    return
+                rows = futures[fut]
+                try:
+                    results = fut.result()
+                except Exception as e:
+                    print(f"Step detection failed for rows {rows[0]}–{rows[-1]}: {e}")
+                    results = [([], []) for _ in rows]
+                self.chunk.emit([
+                    (row, idxs, meds) for row, (idxs, meds) in zip(rows, results)
+                ])
+                done += len(rows)
+                self.progress.emit(done)
+        if self._is_canceled:
+            self.canceled.emit()
+            return
+        self.finished.emit()
+
+    def cancel(self):
+        self._is_canceled = True
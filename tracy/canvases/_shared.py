@@ -65,6 +65,9 @@ from typing import Optional, List
 from ..tools.roi_tools import is_point_near_roi, compute_roi_point
 from ..canvas_tools import RecalcDialog, RecalcWorker, RecalcAllWorker, subpixel_crop
 from ..tools.gaussian_tools import filterX, find_minima, find_maxima
+from ..tools.trajectory_store import TrajectoryStore, PointColumn, point_array
+from ..tools.movie_backend import max_projection
+from ..tools.kymo_tools import batch_kymographs
 # from .kymotrace import prune_skeleton, overlay_trace_centers, extract_main_path
 
 warnings.filterwarnings(
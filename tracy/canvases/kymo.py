@@ -165,6 +165,27 @@ class KymoCanvas(ImageCanvas):
     #     self.max_scale = self.scale * self.padding
     #     self.update_view()
 
+    def update_image_rows(self, image, valid=None):
+        """
+        Swap in new pixels for the kymograph on screen (same shape), keeping
+        zoom, contrast and overlays; used while it is still being generated.
+        valid: rows to take the scaling percentiles from.
+        """
+        if image is None:
+            return
+        if self._im is None or self.image is None or self.image.shape[:2] != image.shape[:2]:
+            self.display_image(image)
+            return
+        ref = image if valid is None else image[valid]
+        if ref.size == 0:
+            return
+        p15, p99 = np.percentile(ref, (15, 99))
+        img8 = np.clip((image - p15)/max(p99 - p15, 1e-12), 0, 1)*255
+        img8 = img8.astype(np.uint8)
+        self._im.set_data(img8)
+        self.image = img8
+        self.draw_idle()
+
     def update_view(self):
         if self.image is None or self.zoom_center is None:
             return
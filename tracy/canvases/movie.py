@@ -837,7 +837,8 @@ class MovieCanvas(ImageCanvas):
             # blit only the axes region
             canvas.blit(self._roi_bbox)
 
-    def finalize_roi(self, suppress_display: bool = False):
+    def finalize_roi(self, suppress_display: bool = False, build_kymographs: bool = True,
+                     stream: bool = False):
         # Make sure we have at least two pointsf
         if not self.roiPoints or len(self.roiPoints) < 2:
             print("Not enough points to finalize ROI.")
@@ -855,9 +856,6 @@ class MovieCanvas(ImageCanvas):
             "points": self.roiPoints.copy()
         }
 
-        # Generate the kymograph from the full ROI.
-        kymo = self.generate_kymograph(roi)
-
         # Combine keys from both dictionaries.
         all_names = set(self.navigator.rois.keys()) | set(self.navigator.kymographs.keys())
         numeric_names = []
@@ -884,20 +882,12 @@ class MovieCanvas(ImageCanvas):
             self.navigator.roiCombo.setCurrentText(name)
         self.navigator.update_roilist_visibility()
 
-        if self.navigator.movie.ndim == 4:
-            n_chan = self.navigator.movie.shape[self.navigator._channel_axis]
-        else:
-            n_chan = 1
-
-        for ch in range(n_chan):
-            kymo = self.generate_kymograph(roi, channel_override=ch)
-            kymo_name = f"ch{ch+1}-{name}"
-            self.navigator.kymographs[kymo_name] = kymo
-            self.navigator.kymo_roi_map[kymo_name] = {
-                "roi":      name,
-                "channel":  ch+1,
-                "orphaned": False
-            }
+        # Kymographs for every channel, from one pass over the movie (callers
+        # batching many ROIs pass build_kymographs=False and generate them later).
+        # With stream, they are shown after the first chunk of frames and fill
+        # in while the user can already work on them.
+        if build_kymographs and not stream:
+            self.navigator.store_kymographs(self.navigator.build_kymographs({name: roi}))
 
         # self.navigator.last_kymo_by_channel[ch+1] = kymo_name
 
@@ -914,110 +904,59 @@ class MovieCanvas(ImageCanvas):
                 pass
             self.tempRoiLine = None
 
-        if not suppress_display:
+        def show_kymographs():
             self.navigator.update_kymo_list_for_channel()
             self.navigator.kymo_changed()
             self.navigator.update_kymo_visibility()
             self.navigator.update_kymo_list_for_channel()
 
+        if build_kymographs and stream:
+            self.navigator.register_orphaned_kymographs([name])
+            self.navigator.build_kymographs_in_background(
+                {name: roi}, stream=True,
+                on_ready=None if suppress_display else show_kymographs,
+            )
+        elif not suppress_display:
+            show_kymographs()
+
         if not suppress_display:
             self.draw()
 
-    def generate_kymograph(self, roi, channel_override=None):
-        # --- Compute the ROI sample positions along the drawn line ---
-        xs = np.array(roi["x"], dtype=float)
-        ys = np.array(roi["y"], dtype=float)
-        
-        # Compute cumulative distances along the ROI.
-        distances = np.sqrt(np.diff(xs)**2 + np.diff(ys)**2)
-        cum_dist = np.concatenate(([0], np.cumsum(distances)))
-        total_length = cum_dist[-1]
-        
-        # Determine the number of sample positions (at least 2)
-        num_samples = max(int(total_length), 2)
-        sample_positions = np.linspace(0, total_length, num_samples)
-        
-        # Interpolate the ROI coordinates at these positions.
-        sample_x = np.interp(sample_positions, cum_dist, xs)
-        sample_y = np.interp(sample_positions, cum_dist, ys)
-        
-        # --- Compute the tangent and then the normal direction at each sample point ---
-        # Use finite differences (np.gradient) to approximate the tangent.
-        tangent_dx = np.gradient(sample_x)
-        tangent_dy = np.gradient(sample_y)
-        # A unit normal can be taken as (-dy, dx)
-        normal_x = -tangent_dy
-        normal_y = tangent_dx
-        norm = np.sqrt(normal_x**2 + normal_y**2)
-        norm[norm == 0] = 1  # avoid division by zero if any
-        normal_x /= norm
-        normal_y /= norm
-
-        # --- Obtain integration parameters ---
-        # n pixels in either direction perpendicular to the line
-        line_width = getattr(self.navigator, "line_width", 2)
-        # Method: "max" (default) or "average"
-        line_method = getattr(self.navigator, "line_integration_method", "max").lower()
+        return name
 
-        # Create an array of offsets along the normal direction.
-        # This gives a 1D array from -line_width to +line_width.
-        offsets = np.arange(-line_width, line_width + 1, dtype=float)  # shape (n_offsets,)
-        n_offsets = offsets.size
-
-        # For each sample point, compute its neighborhood along the normal.
-        # These arrays have shape (num_samples, n_offsets).
-        sample_x_full = sample_x[:, None] + normal_x[:, None] * offsets[None, :]
-        sample_y_full = sample_y[:, None] + normal_y[:, None] * offsets[None, :]
-
-        # Flatten the coordinate arrays so they can be passed to map_coordinates.
-        # Note: the first row are y coordinates (rows) and the second row x coordinates.
-        coords = np.vstack((sample_y_full.ravel(), sample_x_full.ravel()))
+    def _kymograph_channel(self, channel_override=None):
+        """
+        0-based channel sampled for a kymograph: channel_override, else the
+        channel selected in the GUI (None for 3D movies).
+        """
+        movie = self.navigator.movie
+        if movie.ndim != 4:
+            return None
+        if hasattr(self.navigator, "movieChannelCombo") and self.navigator.movieChannelCombo.isEnabled():
+            if channel_override is not None:
+                return channel_override
+            return int(self.navigator.movieChannelCombo.currentText()) - 1
+        return 0
 
+    def generate_kymograph(self, roi, channel_override=None):
         # --- Retrieve the movie ---
         if hasattr(self, "navigator") and self.navigator.movie is not None:
             movie = self.navigator.movie
         else:
             return None
 
-        # --- Process each frame using vectorized interpolation per frame ---
-        kymo_rows = []
-        n_frames = movie.shape[0]
-        for i in range(n_frames):
-            # For multi–channel movies, extract the 2D frame for the chosen channel.
-            if movie.ndim == 4:
-                frame = movie[i]
-                if hasattr(self.navigator, "movieChannelCombo") and self.navigator.movieChannelCombo.isEnabled():
-                    if channel_override is not None:
-                        channel_index = channel_override
-                    else:
-                        channel_index = int(self.navigator.movieChannelCombo.currentText()) - 1
-                else:
-                    channel_index = 0
-                if self.navigator._channel_axis == 1:
-                    frame_2d = frame[channel_index]
-                else:
-                    frame_2d = frame[..., channel_index]
-            else:
-                # For 3D movies (single channel), take the frame directly.
-                frame_2d = movie[i]
-
-            # Use map_coordinates to extract the pixel values at all normal offsets,
-            # in one vectorized call.
-            patch_values = map_coordinates(frame_2d, coords, order=1, mode='reflect')
-            # Reshape so that each row corresponds to one sample point (along the ROI)
-            # and each column corresponds to one offset along the normal.
-            patch_values = patch_values.reshape(num_samples, n_offsets)
-
-            # Integrate along the normal direction based on the selected method.
-            if line_method == "average":
-                profile = np.mean(patch_values, axis=1)
-            else:
-                profile = np.max(patch_values, axis=1)
-            kymo_rows.append(profile)
-
-        kymo = np.vstack(kymo_rows)
+        # n pixels in either direction perpendicular to the line, integrated
+        # with "max" (default) or "average"
+        line_width = getattr(self.navigator, "line_width", 2)
+        line_method = getattr(self.navigator, "line_integration_method", "max").lower()
 
-        return kymo
+        channel = self._kymograph_channel(channel_override)
+        kymos = batch_kymographs(
+            movie, {"roi": roi}, channels=(channel,),
+            channel_axis=getattr(self.navigator, "_channel_axis", None),
+            line_width=line_width, method=line_method,
+        )
+        return kymos[("roi", channel)]
 
     def clear_temporary_roi_markers(self):
         # Clear any temporary ROI dotted line.
@@ -1047,17 +986,15 @@ class MovieCanvas(ImageCanvas):
                 sum_frame = self.sum_frame_cache[ch]
             else:
                 channel_axis = self.navigator._channel_axis
-                idx = [slice(None)] * movie.ndim
-                idx[channel_axis] = ch
-                channel_movie = movie[tuple(idx)]
-                sum_frame = np.max(channel_movie, axis=0)
+                # chunked, so memory-mapped / lazy movies are not read whole
+                sum_frame = max_projection(movie, channel=ch, channel_axis=channel_axis)
                 self.sum_frame_cache[ch] = sum_frame
 
         elif movie.ndim == 3:
             if movie.shape[0] <= 4:
                 sum_frame = movie[0]
             else:
-                sum_frame = np.max(movie, axis=0)
+                sum_frame = max_projection(movie)
         else:
             sum_frame = movie
 
@@ -1466,9 +1403,13 @@ class MovieCanvas(ImageCanvas):
                     self.movie_trajectory_markers.append(lbl)
 
             # 5d) Draw the solid connecting line through spot_centers for every trajectory
-            spot_centers = traj.get('spot_centers', [])
-            xs_pts = [pt[0] if pt is not None else np.nan for pt in spot_centers]
-            ys_pts = [pt[1] if pt is not None else np.nan for pt in spot_centers]
+            try:
+                spot_xy = point_array(traj, 'spot_centers')
+                xs_pts, ys_pts = spot_xy[:, 0], spot_xy[:, 1]
+            except ValueError:
+                spot_centers = traj.get('spot_centers', [])
+                xs_pts = [pt[0] if pt is not None else np.nan for pt in spot_centers]
+                ys_pts = [pt[1] if pt is not None else np.nan for pt in spot_centers]
             frames = traj.get("frames", [])
 
             fade_prev = 10
@@ -1483,7 +1424,7 @@ class MovieCanvas(ImageCanvas):
             point_alphas = None
             if (
                 current_frame is not None
-                and isinstance(frames, (list, tuple))
+                and isinstance(frames, (list, tuple, PointColumn))
                 and len(frames) == len(xs_pts)
             ):
                 point_alphas = []
@@ -9,7 +9,7 @@ class TrajectoryCanvas(QWidget):
         self.kymoCanvas = kymo_canvas
         self.movieCanvas = movie_canvas
         self.navigator = navigator
-        self.trajectories = []  # List of trajectory dicts.
+        self.trajectories = []  # TrajectoryStore of trajectory records (dict-like).
         self._trajectory_counter = 1
 
         # Table widget for displaying trajectory summary information.
@@ -113,6 +113,17 @@ class TrajectoryCanvas(QWidget):
         self._recalc_thread = None
         self._recalc_worker = None
 
+    @property
+    def trajectories(self):
+        return self._trajectory_store
+
+    @trajectories.setter
+    def trajectories(self, value):
+        # plain lists of dicts (loading, clearing) are packed into a columnar store
+        if not isinstance(value, TrajectoryStore):
+            value = TrajectoryStore(value)
+        self._trajectory_store = value
+
     def _cleanup_recalc_thread_objects(self, thread=None, worker=None):
         thread = thread if thread is not None else getattr(self, "_recalc_thread", None)
         worker = worker if worker is not None else getattr(self, "_recalc_worker", None)
@@ -2460,7 +2471,7 @@ class TrajectoryCanvas(QWidget):
         progress.show()
 
         loaded = []
-        self.navigator.past_centers = []
+        self.navigator.past_centers.clear()
 
         force_cancel = False
 
@@ -3067,7 +3078,12 @@ class TrajectoryCanvas(QWidget):
         thread.finished.connect(thread.deleteLater)
         thread.start()
 
-    def _compute_segment_diffusion(self, traj: dict, navigator) -> List[dict]:
+    def _segment_diffusion_tracks(self, traj: dict, navigator) -> tuple:
+        """
+        Split `traj` at its nodes into (segment_info, tracks) for
+        navigator.compute_diffusion_for_many; both lists are empty when the
+        trajectory has no segments or the scale is not set.
+        """
         nodes = traj.get("nodes") or []
         anchors = traj.get("anchors") or []
         roi = traj.get("roi", None)
@@ -3082,39 +3098,54 @@ class TrajectoryCanvas(QWidget):
         ]
         nodes_sorted.sort(key=lambda n: n[0])
         if len(nodes_sorted) < 2:
-            return []
+            return [], []
 
         if navigator.pixel_size is None or navigator.frame_interval is None:
-            return []
+            return [], []
 
-        frames = traj.get("frames", []) or []
-        spots = traj.get("spot_centers", []) or []
-        out = []
+        try:
+            frames = point_array(traj, "frames")
+            spots = point_array(traj, "spot_centers")
+        except ValueError:
+            frames = np.empty(0, dtype=int)
+            spots = np.empty((0, 2))
+        if len(spots) < len(frames):
+            spots = np.vstack([spots, np.full((len(frames) - len(spots), 2), np.nan)])
+        info = []
+        tracks = []
         for idx in range(len(nodes_sorted) - 1):
             start_frame = int(nodes_sorted[idx][0])
             end_frame = int(nodes_sorted[idx + 1][0])
             seg_start = start_frame if idx == 0 else (start_frame + 1)
-            seg_indices = [
-                i for i, f in enumerate(frames)
-                if seg_start <= f <= end_frame
-            ]
-            seg_frames = [frames[i] for i in seg_indices]
-            seg_spots = [
-                spots[i] if i < len(spots) else None
-                for i in seg_indices
-            ]
-            try:
-                D, alpha = navigator.compute_diffusion_for_data(seg_frames, seg_spots)
-            except ValueError:
-                D, alpha = (None, None)
-            out.append({
+            in_seg = (frames >= seg_start) & (frames <= end_frame)
+            seg_frames = frames[in_seg]
+            seg_spots = spots[:len(frames)][in_seg]
+            info.append({
                 "segment": idx + 1,
                 "start_frame": start_frame,
                 "end_frame": end_frame,
-                "D": D,
-                "alpha": alpha,
             })
-        return out
+            tracks.append((seg_frames, seg_spots))
+        return info, tracks
+
+    def _compute_segment_diffusion(self, traj: dict, navigator, results=None) -> List[dict]:
+        """
+        Per-segment D / α. `results` may hold precomputed (D, alpha) pairs for
+        the tracks from _segment_diffusion_tracks (batched callers); otherwise
+        all segments are fitted in one call.
+        """
+        info, tracks = self._segment_diffusion_tracks(traj, navigator)
+        if not info:
+            return []
+        if results is None:
+            try:
+                results = navigator.compute_diffusion_for_many(tracks)
+            except ValueError:
+                results = [(None, None)] * len(tracks)
+        return [
+            dict(seg, D=D, alpha=alpha)
+            for seg, (D, alpha) in zip(info, results)
+        ]
 
     @staticmethod
     def _rebuild_one_trajectory(old: dict, navigator) -> dict:
@@ -3850,7 +3881,7 @@ class TrajectoryCanvas(QWidget):
             self.kymoCanvas.draw()
             self.movieCanvas.draw()
 
-            self.navigator.past_centers = []
+            self.navigator.past_centers.clear()
 
     def update_trajectory_visibility(self):
         has_rows = self.table_widget.rowCount() > 0
@@ -22,6 +22,9 @@ from PyQt5.QtGui import (
     )
 
 from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
+from contextlib import closing
+import threading
 import matplotlib.patheffects as pe
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
@@ -87,12 +90,25 @@ from ..canvas_tools import (
     ClickableLabel, RadiusDialog, BubbleTipFilter,
     CenteredBubbleFilter, AnimatedIconButton,
     StepSettingsDialog, KymoContrastControlsWidget,
-    DiffusionSettingsDialog, ShortcutsDialog
+    DiffusionSettingsDialog, DriftSettingsDialog, ShortcutsDialog,
+    StepsWorker, KymographWorker
 )
 from tracy import __version__
-from ..tools.gaussian_tools import perform_gaussian_fit, filterX, find_minima, find_maxima
+from ..tools.gaussian_tools import perform_gaussian_fit, perform_gaussian_fit_batch, perform_fast_localization_batch, filterX, filterX_batch, find_minima, find_maxima
 from ..tools.roi_tools import is_point_near_roi, convert_roi_to_binary, parse_roi_blob, generate_multipoint_roi_bytes
 from ..tools.track_tools import calculate_velocities
+from ..tools.fit_cache import FitCache
+from ..tools.frame_cache import FrameCache
+from ..tools.frame_prefetch import FramePrefetcher
+from ..tools.kymo_tools import batch_kymographs, raw_samples_nbytes, KymoSampleCache
+from ..tools.drift_tools import estimate_drift
+from ..tools.movie_writer import write_movie
+from ..tools.autopick_model import AutoPickModel, get_autopick_model, TILE_FRAMES, TILE_OVERLAP
+from ..tools.parallel_fit import ParallelFitter
+from ..tools.msd_tools import diffusion_for_tracks
+from ..tools.trajectory_store import PointColumn, point_array
+from ..tools.spatial_index import FrameSpatialIndex
+from ..tools.movie_backend import open_movie, close_movie, is_lazy_movie, CopyOnWriteMovie
 
 # from hmmlearn.hmm import GaussianHMM
 # from sklearn.preprocessing import StandardScaler
@@ -1,6 +1,16 @@
 from ._shared import *
 from .extra_calculations import ExtraCalculationSpec
 
+# frames fitted per perform_gaussian_fit_batch call; progress and cancel are
+# checked between batches
+_FIT_BATCH_SIZE = 128
+
+# trajectories per filterX_batch call in the background step detection
+_STEP_BATCH_SIZE = 64
+
+# trajectories per compute_diffusion_for_many call (whole tracks + segments)
+_DIFF_BATCH_SIZE = 256
+
 class NavigatorAnalysisMixin:
     def _extra_calc_specs(self):
         return [
@@ -186,6 +196,196 @@ class NavigatorAnalysisMixin:
         self.analysis_motion_state = None
         self.analysis_motion_segments = None
 
+    def _get_fit_cache(self):
+        if getattr(self, "fit_cache", None) is None:
+            self.fit_cache = FitCache()
+        return self.fit_cache
+
+    def invalidate_fit_cache(self):
+        """
+        Drop all memoized fits. The movie token is bumped too, so results that a
+        worker thread is still computing for the old movie never get reused.
+        """
+        self._movie_token = getattr(self, "_movie_token", 0) + 1
+        self._get_fit_cache().clear()
+
+    def _fit_channel_key(self, channel_override=None):
+        # same channel resolution as get_movie_frame
+        if self.movie is None or self.movie.ndim != 4:
+            return None
+        if channel_override is None:
+            chan = int(self.movieChannelCombo.currentText()) - 1
+        else:
+            chan = channel_override - 1
+        return (chan, self._channel_axis)
+
+    def cached_gaussian_fit(self, frame, center, crop_size, bg_fixed=None,
+                            frame_image=None, channel_override=None,
+                            fitter=perform_gaussian_fit):
+        """
+        perform_gaussian_fit (or another single-spot fitter with the same signature)
+        on movie frame `frame`, memoized in self.fit_cache.
+        """
+        cache = self._get_fit_cache()
+        key = cache.make_key(
+            getattr(self, "_movie_token", 0), self._fit_channel_key(channel_override),
+            frame, center, crop_size,
+            bg_fixed=bg_fixed, pixel_size=self.pixel_size, fitter=fitter.__name__
+        )
+        found, result = cache.lookup(key)
+        if found:
+            return result
+        if frame_image is None:
+            frame_image = self.get_movie_frame(frame, channel_override=channel_override)
+        if frame_image is None:
+            return (None,)*5
+        result = fitter(frame_image, center, crop_size,
+                        pixelsize=self.pixel_size, bg_fixed=bg_fixed)
+        cache.store(key, result)
+        return result
+
+    def _lookup_fit_batch(self, frames, centers, crop_size, bg_fixed, channel_override, fitter_name):
+        """
+        Look every (frame, center) up in the fit cache.
+        Returns (results, keys, todo) where todo lists the indices that missed.
+        """
+        cache = self._get_fit_cache()
+        token = getattr(self, "_movie_token", 0)
+        chan = self._fit_channel_key(channel_override)
+        results = [None] * len(frames)
+        keys = [None] * len(frames)
+        todo = []
+        for k, (f, c) in enumerate(zip(frames, centers)):
+            keys[k] = cache.make_key(
+                token, chan, f, c, crop_size,
+                bg_fixed=bg_fixed, pixel_size=self.pixel_size, fitter=fitter_name
+            )
+            found, res = cache.lookup(keys[k])
+            if found:
+                results[k] = res
+            else:
+                todo.append(k)
+        return results, keys, todo
+
+    def cached_gaussian_fit_batch(self, frames, centers, crop_size, bg_fixed=None,
+                                  frame_images=None, channel_override=None,
+                                  fit_batch=perform_gaussian_fit_batch):
+        """
+        Batched cached_gaussian_fit: only the cache misses are sent to fit_batch.
+        """
+        results, keys, todo = self._lookup_fit_batch(
+            frames, centers, crop_size, bg_fixed, channel_override, fit_batch.__name__
+        )
+        if todo:
+            if frame_images is None:
+                imgs = [self.get_movie_frame(frames[k], channel_override=channel_override) for k in todo]
+            else:
+                imgs = [frame_images[k] for k in todo]
+            fitted = fit_batch(imgs, [centers[k] for k in todo], crop_size,
+                               pixelsize=self.pixel_size, bg_fixed=bg_fixed)
+            cache = self._get_fit_cache()
+            for k, res in zip(todo, fitted):
+                results[k] = res
+                cache.store(keys[k], res)
+        return results
+
+    def _get_parallel_fitter(self):
+        """
+        ParallelFitter process pool, started on first use and kept until the
+        app exits (it holds no movie data, so a new movie does not restart it).
+        """
+        with self._parallel_lock:
+            if getattr(self, "_parallel_fitter", None) is None:
+                self._parallel_fitter = ParallelFitter()
+            return self._parallel_fitter
+
+    def close_parallel_fitter(self):
+        with self._parallel_lock:
+            fitter = getattr(self, "_parallel_fitter", None)
+            self._parallel_fitter = None
+        if fitter is not None:
+            fitter.close()
+
+    def _iter_fit_batches(self, frames, centers, crop_size, bg_fixed, frame_cache,
+                          fit_batch=perform_gaussian_fit_batch):
+        """
+        Fit every (frame, center) pair in chunks of _FIT_BATCH_SIZE and yield
+        (stop, rows, results) per chunk, in order, so callers can report progress
+        and stop early. With parallel fitting on, chunks go to the process pool
+        as patches of the frame_cache images, a few chunks ahead of the one
+        being collected; events are processed while waiting, and chunks still
+        pending when the caller stops are canceled.
+        """
+        N = len(frames)
+        chunks = []
+        for start in range(0, N, _FIT_BATCH_SIZE):
+            stop = min(N, start + _FIT_BATCH_SIZE)
+            rows = [idx for idx in range(start, stop) if frame_cache.get(frames[idx]) is not None]
+            chunks.append((stop, rows))
+
+        if not (getattr(self, "parallel_fitting", False) and len(chunks) > 1):
+            for stop, rows in chunks:
+                results = self.cached_gaussian_fit_batch(
+                    [frames[idx] for idx in rows],
+                    [centers[idx] for idx in rows],
+                    crop_size,
+                    bg_fixed=bg_fixed,
+                    frame_images=[frame_cache[frames[idx]] for idx in rows],
+                    fit_batch=fit_batch
+                )
+                yield stop, rows, results
+            return
+
+        from collections import deque
+        from concurrent.futures import wait
+
+        pool = self._get_parallel_fitter()
+        # a few chunks ahead of the one being collected keep every worker busy
+        # without cutting patches for the whole trajectory at once
+        ahead = 2 * pool.max_workers
+        pending = deque()
+        next_chunk = 0
+        cache = self._get_fit_cache()
+
+        def submit_next():
+            nonlocal next_chunk
+            stop, rows = chunks[next_chunk]
+            next_chunk += 1
+            row_frames = [frames[idx] for idx in rows]
+            row_centers = [centers[idx] for idx in rows]
+            results, keys, todo = self._lookup_fit_batch(
+                row_frames, row_centers, crop_size, bg_fixed, None, fit_batch.__name__
+            )
+            future = None
+            if todo:
+                future = pool.submit(
+                    [frame_cache[row_frames[k]] for k in todo], [row_centers[k] for k in todo],
+                    crop_size, pixelsize=self.pixel_size, bg_fixed=bg_fixed,
+                    fitter=fit_batch.__name__
+                )
+            pending.append((stop, rows, results, keys, todo, future))
+
+        try:
+            while next_chunk < len(chunks) or pending:
+                while next_chunk < len(chunks) and len(pending) < ahead:
+                    submit_next()
+                stop, rows, results, keys, todo, future = pending.popleft()
+                if future is not None:
+                    # keep the GUI (and its Cancel button) responsive meanwhile
+                    while not future.done():
+                        QApplication.processEvents()
+                        if getattr(self, "_is_canceled", False):
+                            return
+                        wait([future], timeout=0.05)
+                    for k, res in zip(todo, future.result()):
+                        results[k] = res
+                        cache.store(keys[k], res)
+                yield stop, rows, results
+        finally:
+            for *_, future in pending:
+                if future is not None:
+                    future.cancel()
+
     def _compute_analysis(self, points, bg=None, showprogress=True):
         def _normalize_result(result):
             if result is None:
@@ -220,6 +420,11 @@ class NavigatorAnalysisMixin:
                 self._is_canceled = True #REMOVE THIS?
                 return None, None, None, None, None, None
             return _normalize_result(self._postprocess_smooth(frames, coords, ints, fit_params, background, bg))
+        elif mode == "Fast":
+            # independent pass with the non-iterative localizer instead of a fit
+            return _normalize_result(self._compute_independent(
+                points, bg, showprogress, fit_batch=perform_fast_localization_batch
+            ))
         elif mode == "Same center":
             return _normalize_result(self._compute_same_center(points, bg, showprogress))
         else:
@@ -238,7 +443,6 @@ class NavigatorAnalysisMixin:
 
         # 3) Prepare outputs
         N = len(all_frames)
-        all_coords             = []
         integrated_intensities = [None] * N
         background             = [None] * N
         fit_params             = [(None, None, None)] * N
@@ -251,40 +455,34 @@ class NavigatorAnalysisMixin:
             progress.setMinimumDuration(0)
             progress.show()
 
-        # 5) Loop once per point, exactly at the provided cx,cy
-        for idx, (f, cx, cy) in enumerate(points):
-            all_coords.append((cx, cy))
-            img = frame_cache.get(f)
-            if img is not None:
-                # reuse gaussian fit call
-                fc, sigma, intensity, peak, bkgr = perform_gaussian_fit(
-                    img,
-                    (cx, cy),
-                    int(2 * self.searchWindowSpin.value()),
-                    pixelsize=self.pixel_size,
-                    bg_fixed=bg
-                )
-                if fc is not None:
-                    background[idx]            = max(0, bkgr)
-                    fit_params[idx]            = (fc, sigma, peak)
-                    integrated_intensities[idx] = max(0, intensity)
-            # otherwise leave None/grey
+        # 5) Fit exactly at the provided cx,cy, one batch of frames at a time
+        all_coords = [(cx, cy) for _, cx, cy in points]
+        crop_size = int(2 * self.searchWindowSpin.value())
+        with closing(self._iter_fit_batches(all_frames, all_coords, crop_size, bg, frame_cache)) as batches:
+            for stop, rows, results in batches:
+                for idx, (fc, sigma, intensity, peak, bkgr) in zip(rows, results):
+                    if fc is not None:
+                        background[idx]            = max(0, bkgr)
+                        fit_params[idx]            = (fc, sigma, peak)
+                        integrated_intensities[idx] = max(0, intensity)
+                # otherwise leave None/grey
 
-            # update progress
-            if progress:
-                progress.setValue(idx+1)
-                QApplication.processEvents()
-                if progress.wasCanceled():
-                    self._is_canceled = True
-                    progress.close()
-                    break
+                # update progress
+                if progress:
+                    progress.setValue(stop)
+                    QApplication.processEvents()
+                    if progress.wasCanceled():
+                        self._is_canceled = True
+                        progress.close()
+                        break
 
         if progress:
             progress.close()
 
         return all_frames, all_coords, all_coords, integrated_intensities, fit_params, background
 
-    def _compute_independent(self, points, bg=None, showprogress=True):  
+    def _compute_independent(self, points, bg=None, showprogress=True,
+                             fit_batch=perform_gaussian_fit_batch):
 
         # print("compute", self._is_canceled)
 
@@ -312,54 +510,45 @@ class NavigatorAnalysisMixin:
             progress.setAutoClose(False)
             progress.show()
 
-        # 4) Walk each segment in turn
-        idx = 0
+        # 4) Walk each segment in turn to get the interpolated search centers
         for i in range(len(points)-1):
-            if getattr(self, "_is_canceled", False):
-                if progress:
-                    progress.close()
-                return all_frames, all_coords, all_coords, integrated_intensities, fit_params, background
             f1, x1, y1 = points[i]
             f2, x2, y2 = points[i+1]
             seg = list(range(f1, f2+1)) if i==0 else list(range(f1+1, f2+1))
             n = len(seg)
 
             for j, f in enumerate(seg):
-                if getattr(self, "_is_canceled", False):
-                    if progress:
-                        progress.close()
-                    return all_frames, all_coords, all_coords, integrated_intensities, fit_params, background
                 # compute independent center
                 t = j/(n-1) if n>1 else 0
                 cx = x1 + t*(x2-x1)
                 cy = y1 + t*(y2-y1)
                 all_coords.append((cx, cy))
-                img = frame_cache[f]
-                fc, sigma, intensity, peak, bkgr = None, None, None, None, None
-                if img is not None:
-                    fc, sigma, intensity, peak, bkgr = perform_gaussian_fit(
-                        img, (cx, cy), int(2 * self.searchWindowSpin.value()), pixelsize = self.pixel_size, bg_fixed=bg
-                    )
-                if fc is not None:
+
+        # 5) Fit every frame independently, one batch of frames at a time
+        crop_size = int(2 * self.searchWindowSpin.value())
+        with closing(self._iter_fit_batches(all_frames, all_coords, crop_size, bg, frame_cache, fit_batch)) as batches:
+            for stop, rows, results in batches:
+                if getattr(self, "_is_canceled", False):
+                    if progress:
+                        progress.close()
+                    return all_frames, all_coords, all_coords, integrated_intensities, fit_params, background
+                for idx, (fc, sigma, intensity, peak, bkgr) in zip(rows, results):
+                    if fc is None:
+                        # leave None / grey
+                        continue
+                    f = all_frames[idx]
                     is_retrack = (
                         self.avoid_previous_spot
-                        and any(
-                            pf == f and
-                            np.hypot(fc[0] - px, fc[1] - py) < self.same_spot_threshold
-                            for pf, px, py in self.past_centers
-                        )
+                        and self.past_centers.any_within(f, fc[0], fc[1], self.same_spot_threshold)
                     )
                     if not is_retrack:
                         fit_params[idx]            = (fc, sigma, peak)
                         background[idx]            = max(0, bkgr)
                         integrated_intensities[idx] = max(0, intensity)
-                # else: leave None / grey
-                # t1 = time.perf_counter()
-                # print(f"1 {(t1 - t0)*1000:.2f} ms")
-                idx += 1
+
                 # update progress & allow cancel
                 if progress:
-                    progress.setValue(idx)
+                    progress.setValue(stop)
                     QApplication.processEvents()
                     if progress.wasCanceled():
                         self._is_canceled = True
@@ -489,18 +678,17 @@ class NavigatorAnalysisMixin:
             # fallback to midpoint
             return nc, None, None, None, None, None
 
-        fc, sigma, intensity, peak, bkgr = perform_gaussian_fit(
-            img, current, radius,
-            pixelsize=pixel_size,
-            bg_fixed=bg
+        fc, sigma, intensity, peak, bkgr = self.cached_gaussian_fit(
+            framenum, current, radius,
+            bg_fixed=bg,
+            frame_image=img
         )
         if fc is None:
             return nc, None, None, None, None, None
 
         if self.avoid_previous_spot and fc is not None:
-            for pf, px, py in self.past_centers:
-                if pf == framenum and np.hypot(fc[0] - px, fc[1] - py) < self.same_spot_threshold:
-                    return (nc, None, None, None, None, None)
+            if self.past_centers.any_within(framenum, fc[0], fc[1], self.same_spot_threshold):
+                return (nc, None, None, None, None, None)
 
         dx, dy = fc[0]-icx, fc[1]-icy
         d       = np.hypot(dx, dy)
@@ -559,11 +747,10 @@ class NavigatorAnalysisMixin:
             if img is None:
                 continue
 
-            fc, sx, intensity, peak, bkgr = perform_gaussian_fit(
-                img, (cx, cy),
-                crop_size=radius,
-                pixelsize=self.pixel_size,
-                bg_fixed=bg_fixed
+            fc, sx, intensity, peak, bkgr = self.cached_gaussian_fit(
+                all_frames[i], (cx, cy), radius,
+                bg_fixed=bg_fixed,
+                frame_image=img
             )
             if fc is not None:
                 # overwrite spot_centers and returned list
@@ -612,11 +799,10 @@ class NavigatorAnalysisMixin:
             img = self.get_movie_frame(frame, channel_override=tgt_ch)
             ok = False
             if img is not None:
-                fc2, *_ = perform_gaussian_fit(
-                    img, (x0,y0),
-                    crop_size=int(2*self.searchWindowSpin.value()),
-                    pixelsize=self.pixel_size,
-                    bg_fixed=None
+                fc2, *_ = self.cached_gaussian_fit(
+                    frame, (x0,y0), int(2*self.searchWindowSpin.value()),
+                    frame_image=img,
+                    channel_override=tgt_ch
                 )
                 if fc2 is not None and np.hypot(fc2[0]-x0, fc2[1]-y0) <= self.colocalization_threshold:
                     ok = True
@@ -731,25 +917,16 @@ class NavigatorAnalysisMixin:
         valid = [
             (f, x, y)
             for f, x, y in centers_to_remove
-            if isinstance(f, (int,float))
-            and isinstance(x, (int,float))
-            and isinstance(y, (int,float))
+            if isinstance(f, (int, float, np.integer, np.floating))
+            and isinstance(x, (int, float, np.integer, np.floating))
+            and isinstance(y, (int, float, np.integer, np.floating))
         ]
         if not valid:
             return
 
-        # 2) Keep only those past-centers that are either a different frame
-        #    or are farther than threshold on the same frame.
-        kept = []
-        for pf, px, py in self.past_centers:
-            drop = False
-            for cf, cx, cy in valid:
-                if pf == cf and np.hypot(px - cx, py - cy) < self.same_spot_threshold:
-                    drop = True
-                    break
-            if not drop:
-                kept.append((pf, px, py))
-        self.past_centers = kept
+        # 2) Drop past-centers on the same frame within threshold; the index
+        #    only looks at the grid cells around each point
+        self.past_centers.remove_near(valid, self.same_spot_threshold)
 
     # @pyqtSlot(list, list, list)
     # def debug_plot_track_smoothing(self, spot_centers, smooth_centers, new_centers):
@@ -825,7 +1002,11 @@ class NavigatorAnalysisMixin:
             return
         self.jump_to_analysis_point(self.loop_index, animate="discrete")
         self.intensityCanvas.current_index = self.loop_index
-        self.loop_index = (self.loop_index + 1) % len(self.analysis_frames)
+        n = len(self.analysis_frames)
+        self.loop_index = (self.loop_index + 1) % n
+        # the next frames of the playback order, decoded ahead of the timer
+        ahead = min(n, int(getattr(self, "prefetch_lookahead", 8)))
+        self.prefetch_frames(self.analysis_frames[(self.loop_index + k) % n] for k in range(ahead))
 
     def stoploop(self, prompt=True):
         self.looping = False
@@ -1381,16 +1562,11 @@ class NavigatorAnalysisMixin:
         traj["step_indices"] = step_idxs        # now a List[int], not None
         traj["step_medians"] = medians          # now a List[(start,end,median)]
 
-    def compute_steps_for_data(self, frames, intensities):
+    @staticmethod
+    def _valid_step_input(frames, intensities):
         """
-        Given a list of frame‐indices and a list of (possibly‐gapped) intensities,
-        return (step_indices, step_medians).  Neither argument is modified.
+        Drop gaps (None / NaN) from a trace. Returns (valid_frames, valid_ints).
         """
-
-        W = self.W
-        passes = self.passes
-        min_step = self.min_step
-
         frame_arr = np.array(frames, dtype=int)
         intensity_arr = np.array(
             [np.nan if (v is None or (isinstance(v, float) and np.isnan(v))) else float(v)
@@ -1398,14 +1574,14 @@ class NavigatorAnalysisMixin:
             dtype=float
         )
         valid_mask   = ~np.isnan(intensity_arr)
-        valid_frames = frame_arr[valid_mask]
-        valid_ints   = intensity_arr[valid_mask]
+        return frame_arr[valid_mask], intensity_arr[valid_mask]
 
-        # If too few points, return empty lists:
-        if valid_ints.size < 2:
-            return [], []
-
-        fx = filterX(valid_ints, W=W, passes=passes)
+    def _steps_from_filtered(self, valid_frames, fx):
+        """
+        Turn a filterX result for the valid part of a trace into
+        (step_indices, step_medians).
+        """
+        min_step = self.min_step
         I_smooth = fx["I"]
         P        = fx["Px"]
 
@@ -1455,6 +1631,34 @@ class NavigatorAnalysisMixin:
 
         return step_frames, seg_medians
 
+    def compute_steps_for_data(self, frames, intensities):
+        """
+        Given a list of frame‐indices and a list of (possibly‐gapped) intensities,
+        return (step_indices, step_medians).  Neither argument is modified.
+        """
+        valid_frames, valid_ints = self._valid_step_input(frames, intensities)
+
+        # If too few points, return empty lists:
+        if valid_ints.size < 2:
+            return [], []
+
+        fx = filterX(valid_ints, W=self.W, passes=self.passes)
+        return self._steps_from_filtered(valid_frames, fx)
+
+    def compute_steps_for_many(self, traces):
+        """
+        compute_steps_for_data for a list of (frames, intensities) pairs, with one
+        filterX_batch call for all of them. Returns a list of
+        (step_indices, step_medians), in the same order.
+        """
+        inputs = [self._valid_step_input(frames, ints) for frames, ints in traces]
+        usable = [k for k, (_, vi) in enumerate(inputs) if vi.size >= 2]
+        results = [([], []) for _ in inputs]
+        filtered = filterX_batch([inputs[k][1] for k in usable], W=self.W, passes=self.passes)
+        for k, fx in zip(usable, filtered):
+            results[k] = self._steps_from_filtered(inputs[k][0], fx)
+        return results
+
     def compute_diffusion_for_data(self, frames, spot_centers):
         """
         Estimate anomalous diffusion parameters from MSD:
@@ -1464,91 +1668,92 @@ class NavigatorAnalysisMixin:
         Requires calibration (pixel size + frame interval). If scale is not set,
         this function raises a ValueError.
         """
+        return self.compute_diffusion_for_many([(frames, spot_centers)])[0]
 
+    def compute_diffusion_for_many(self, tracks):
+        """
+        compute_diffusion_for_data for a list of (frames, spot_centers) tracks
+        in one vectorized pass (see tools.msd_tools). MSD lags are true frame
+        lags; frames without a spot are masked out rather than closed up.
+        Returns a list of (D, alpha) in μm²/s^α, with None for failed fits.
+        """
         if self.pixel_size is None or self.frame_interval is None:
             raise ValueError(
                 "Scale not set: please set pixel size and frame interval (Movie > Set Scale) before computing diffusion."
             )
+        if not tracks:
+            return []
 
-        # gather valid points: (frame, x_px, y_px)
-        pts = [
-            (int(f), float(c[0]), float(c[1]))
-            for f, c in zip(frames, spot_centers)
-            if isinstance(c, (tuple, list)) and c[0] is not None and c[1] is not None
-        ]
-        if len(pts) < 3:
-            return None, None
-
-        pts.sort(key=lambda t: t[0])
-        fr = np.array([p[0] for p in pts], dtype=int)
-        xy = np.array([[p[1], p[2]] for p in pts], dtype=float)
-
-        max_lag = int(getattr(self, "diffusion_max_lag", 10))
-        min_pairs = int(getattr(self, "diffusion_min_pairs", 5))
-        eps = float(getattr(self, "_EPS", 1e-12))
-
-        n = len(xy)
-        msd = []
-        dts = []
-
-        # Use actual frame deltas, not "lag * dt" blindly
-        for lag in range(1, min(max_lag, n - 1) + 1):
-            disp = xy[lag:] - xy[:-lag]
-            sq = disp[:, 0] ** 2 + disp[:, 1] ** 2
-            if sq.size < min_pairs:
-                continue
-
-            m = float(np.nanmean(sq))
-            if not np.isfinite(m):
-                continue
-
-            # Clamp instead of dropping; helps keep >=2 points for the fit
-            m = max(m, eps)
-
-            # dt in "frames" from actual frame indices
-            dt_frames = fr[lag:] - fr[:-lag]
-            if dt_frames.size < min_pairs:
-                continue
-            dt = float(np.nanmean(dt_frames))  # average frame delta for this lag
-            if not np.isfinite(dt) or dt <= 0:
-                continue
-
-            msd.append(m)
-            dts.append(dt)
-
-        if len(msd) < 2:
-            return None, None
-
-        msd = np.array(msd, float)
-        dts = np.array(dts, float)
-
-        # Fit log(MSD) = log(4D) + alpha*log(dt)
-        x = np.log(np.maximum(dts, eps))
-        y = np.log(np.maximum(msd, eps))
-
-        A = np.vstack([np.ones_like(x), x]).T
-        coef, *_ = np.linalg.lstsq(A, y, rcond=None)
-        intercept, alpha = float(coef[0]), float(coef[1])
-
-        if not np.isfinite(alpha):
-            return None, None
-
-        # Prefactor in px^2 / frame^alpha
-        D = float(np.exp(intercept) / 4.0)
-        if not np.isfinite(D):
-            return None, alpha
+        D, alpha = diffusion_for_tracks(
+            tracks,
+            max_lag=int(getattr(self, "diffusion_max_lag", 10)),
+            min_pairs=int(getattr(self, "diffusion_min_pairs", 5)),
+            eps=float(getattr(self, "_EPS", 1e-12)),
+        )
 
-        # Convert to um^2 / s^alpha if possible
-        if self.pixel_size is not None:
-            px_um = float(self.pixel_size) / 1000.0
-            D *= (px_um ** 2)
+        # px^2 / frame^alpha -> um^2 / s^alpha
+        px_um = float(self.pixel_size) / 1000.0
+        dt_frame_s = float(self.frame_interval) / 1000.0
+        with np.errstate(invalid="ignore", over="ignore"):
+            D = D * (px_um ** 2) / (dt_frame_s ** alpha)
 
-        if self.frame_interval is not None:
-            dt_frame_s = float(self.frame_interval) / 1000.0
-            # since dt was in frames, convert time base: (frames)^alpha -> (seconds)^alpha
-            D /= (dt_frame_s ** alpha)
+        return [
+            (float(d) if np.isfinite(d) else None, float(a) if np.isfinite(a) else None)
+            for d, a in zip(D, alpha)
+        ]
 
-        return D, alpha
+    def _compute_diffusion_rows(self, rows, whole_rows, progress=None):
+        """
+        Fill D / α (rows in `whole_rows`) and segment diffusion (all `rows`),
+        fitting each chunk of _DIFF_BATCH_SIZE trajectories with one
+        compute_diffusion_for_many call. Returns False if canceled.
+        Raises ValueError when the scale is not set.
+        """
+        tc = self.trajectoryCanvas
+        whole_rows = set(whole_rows)
+        for start in range(0, len(rows), _DIFF_BATCH_SIZE):
+            if progress is not None:
+                progress.setValue(start)
+                QApplication.processEvents()
+                if progress.wasCanceled():
+                    return False
+
+            chunk = rows[start:start + _DIFF_BATCH_SIZE]
+            tracks = []
+            plan = []
+            for r in chunk:
+                traj = tc.trajectories[r]
+                whole = None
+                if r in whole_rows:
+                    whole = len(tracks)
+                    try:
+                        tracks.append((point_array(traj, "frames"), point_array(traj, "spot_centers")))
+                    except ValueError:
+                        tracks.append((traj["frames"], traj.get("spot_centers", [])))
+                try:
+                    info, seg_tracks = tc._segment_diffusion_tracks(traj, self)
+                except Exception:
+                    info, seg_tracks = None, []
+                plan.append((r, whole, info, len(tracks), len(seg_tracks)))
+                tracks.extend(seg_tracks)
+
+            results = self.compute_diffusion_for_many(tracks)
+
+            for r, whole, info, s0, ns in plan:
+                traj = tc.trajectories[r]
+                if whole is not None:
+                    D, alpha = results[whole]
+                    cf = traj.setdefault("custom_fields", {})
+                    cf[self._DIFF_D_COL] = "" if D is None else f"{D:.4g}"
+                    cf[self._DIFF_A_COL] = "" if alpha is None else f"{alpha:.3f}"
+                if info is None:
+                    traj["segment_diffusion"] = []
+                else:
+                    traj["segment_diffusion"] = tc._compute_segment_diffusion(
+                        traj, self, results=results[s0:s0 + ns]
+                    )
+                tc.updateTableRow(r, traj)
+        return True
 
     def _confirm_missing_calculation(self, label: str, count: int) -> bool:
         noun = "trajectory" if count == 1 else "trajectories"
@@ -1577,22 +1782,87 @@ class NavigatorAnalysisMixin:
         return missing
 
     def _compute_steps_for_indices(self, indices: list) -> None:
+        """
+        Detect steps for the given trajectory rows in a background StepsWorker.
+        Results are written into the table chunk by chunk as they come in; the
+        progress dialog is not modal, so the rest of the UI stays usable.
+        """
         if not indices:
             return
+        # one run at a time
+        self.shutdown_steps_thread()
+
+        trajectories = self.trajectoryCanvas.trajectories
+        traces = [(trajectories[i]["frames"], trajectories[i]["intensities"]) for i in indices]
+        # remember which dict each row held, so results for rows that were
+        # deleted or replaced in the meantime are dropped
+        targets = {i: trajectories[i] for i in indices}
+
         progress = QProgressDialog("Computing steps…", "Cancel", 0, len(indices), self)
-        progress.setWindowModality(Qt.WindowModal)
+        progress.setWindowModality(Qt.NonModal)
         progress.setMinimumDuration(0)
         progress.show()
 
-        for i, traj_idx in enumerate(indices):
-            progress.setValue(i)
-            QApplication.processEvents()
-            if progress.wasCanceled():
-                break
-            self._compute_steps_for_trajectory(traj_idx)
+        thread = QtCore.QThread()
+        worker = StepsWorker(indices, traces, self, chunk_size=_STEP_BATCH_SIZE)
+        worker.moveToThread(thread)
+        self._steps_thread = thread
+        self._steps_worker = worker
+
+        def on_chunk(results):
+            trajs = self.trajectoryCanvas.trajectories
+            refresh = False
+            for row, step_idxs, medians in results:
+                traj = targets.get(row)
+                if row >= len(trajs) or trajs[row] is not traj:
+                    continue
+                traj["step_indices"] = step_idxs
+                traj["step_medians"] = medians
+                self.trajectoryCanvas.updateTableRow(row, traj)
+                refresh |= (row == self.trajectoryCanvas.current_index)
+            if refresh:
+                self._refresh_intensity_canvas()
+
+        def on_done():
+            progress.close()
+            thread.quit()
+
+        worker.chunk.connect(on_chunk)
+        worker.progress.connect(progress.setValue)
+        worker.finished.connect(on_done)
+        worker.canceled.connect(on_done)
+        progress.canceled.connect(worker.cancel)
+        thread.started.connect(worker.run)
+        thread.finished.connect(lambda: self._cleanup_steps_thread_objects(thread, worker))
+        thread.start()
+
+    def _cleanup_steps_thread_objects(self, thread=None, worker=None):
+        thread = thread if thread is not None else getattr(self, "_steps_thread", None)
+        worker = worker if worker is not None else getattr(self, "_steps_worker", None)
+        if thread is getattr(self, "_steps_thread", None):
+            self._steps_thread = None
+        if worker is getattr(self, "_steps_worker", None):
+            self._steps_worker = None
+        for obj in (worker, thread):
+            if obj is not None:
+                try:
+                    obj.deleteLater()
+                except Exception:
+                    pass
 
-        progress.setValue(len(indices))
-        progress.close()
+    def shutdown_steps_thread(self, timeout_ms: int = 4000) -> bool:
+        thread = getattr(self, "_steps_thread", None)
+        if thread is None:
+            return True
+        worker = getattr(self, "_steps_worker", None)
+        if thread.isRunning():
+            if worker is not None:
+                worker.cancel()
+            thread.quit()
+            if not thread.wait(int(timeout_ms)):
+                return False
+        self._cleanup_steps_thread_objects(thread=thread, worker=worker)
+        return True
 
     def _maybe_compute_missing_steps(self) -> None:
         if not self.trajectoryCanvas.trajectories:
@@ -1628,26 +1898,11 @@ class NavigatorAnalysisMixin:
         return missing_vals, missing_segments
 
     def _compute_diffusion_for_trajectory(self, traj_idx: int) -> bool:
-        traj = self.trajectoryCanvas.trajectories[traj_idx]
         try:
-            D, alpha = self.compute_diffusion_for_data(
-                traj["frames"],
-                traj.get("spot_centers", [])
-            )
+            self._compute_diffusion_rows([traj_idx], [traj_idx])
         except ValueError as e:
             QMessageBox.critical(self, "Diffusion Error", str(e))
             return False
-
-        cf = traj.setdefault("custom_fields", {})
-        cf[self._DIFF_D_COL] = "" if D is None else f"{D:.4g}"
-        cf[self._DIFF_A_COL] = "" if alpha is None else f"{alpha:.3f}"
-        try:
-            traj["segment_diffusion"] = self.trajectoryCanvas._compute_segment_diffusion(
-                traj, self
-            )
-        except Exception:
-            traj["segment_diffusion"] = []
-        self.trajectoryCanvas.updateTableRow(traj_idx, traj)
         return True
 
     def _compute_segment_diffusion_for_trajectory(self, traj_idx: int) -> None:
@@ -1671,17 +1926,12 @@ class NavigatorAnalysisMixin:
         progress.setMinimumDuration(0)
         progress.show()
 
-        for i, traj_idx in enumerate(indices):
-            progress.setValue(i)
-            QApplication.processEvents()
-            if progress.wasCanceled():
-                break
-            if traj_idx in missing_vals_set:
-                ok = self._compute_diffusion_for_trajectory(traj_idx)
-                if not ok:
-                    break
-            else:
-                self._compute_segment_diffusion_for_trajectory(traj_idx)
+        try:
+            self._compute_diffusion_rows(indices, missing_vals_set, progress)
+        except ValueError as e:
+            progress.close()
+            QMessageBox.critical(self, "Diffusion Error", str(e))
+            return
 
         progress.setValue(len(indices))
         progress.close()
@@ -1852,9 +2102,6 @@ class NavigatorAnalysisMixin:
 
     def _compute_diffusion_for_all_trajectories(self):
         tc = self.trajectoryCanvas
-        D_COL = self._DIFF_D_COL
-        A_COL = self._DIFF_A_COL
-
         if not tc.trajectories:
             return
 
@@ -1863,29 +2110,13 @@ class NavigatorAnalysisMixin:
         progress.setMinimumDuration(0)
         progress.show()
 
-        for i, traj in enumerate(tc.trajectories):
-            progress.setValue(i)
-            QApplication.processEvents()
-            if progress.wasCanceled():
-                break
-
-            try:
-                D, alpha = self.compute_diffusion_for_data(
-                    traj["frames"],
-                    traj.get("spot_centers", [])
-                )
-            except ValueError as e:
-                progress.close()
-                QMessageBox.critical(self, "Diffusion Error", str(e))
-                return
-            cf = traj.setdefault("custom_fields", {})
-            cf[D_COL] = "" if D is None else f"{D:.4g}"
-            cf[A_COL] = "" if alpha is None else f"{alpha:.3f}"
-            try:
-                traj["segment_diffusion"] = tc._compute_segment_diffusion(traj, self)
-            except Exception:
-                traj["segment_diffusion"] = []
-            tc.updateTableRow(i, traj)
+        rows = list(range(len(tc.trajectories)))
+        try:
+            self._compute_diffusion_rows(rows, rows, progress)
+        except ValueError as e:
+            progress.close()
+            QMessageBox.critical(self, "Diffusion Error", str(e))
+            return
 
         progress.setValue(len(tc.trajectories))
         progress.close()
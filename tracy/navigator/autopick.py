@@ -63,6 +63,7 @@ def _postprocess_with_fallback_impl(
     cancel_requested=None,
 ):
     from kymo_autopick.postprocess import postprocess_prob_to_tracks
+    from concurrent.futures import wait
 
     _raise_if_autopick_canceled(cancel_requested)
 
@@ -74,28 +75,16 @@ def _postprocess_with_fallback_impl(
     base_max_tracks = int(base.get("max_tracks", 12) or 12)
     per_mode_cap = int(max(24, min(220, max(base_max_tracks, 48))))
 
-    strict_params = {**base, "max_tracks": per_mode_cap}
-    strict_debug: dict = {}
-    strict_tracks = postprocess_prob_to_tracks(
-        prob_move,
-        embedding_map=embedding_map,
-        debug=strict_debug,
-        **strict_params,
-    )
-    strict_quality = _trackset_quality_impl(strict_tracks)
-    strict_count = int(len(strict_tracks))
-    strict_med_prob = (
-        float(np.median([float(tr.get("mean_prob", 0.0)) for tr in strict_tracks]))
-        if strict_tracks
-        else 0.0
-    )
-
-    strict_target = int(max(8, min(24, round(0.16 * max(24, base_max_tracks)))))
-    if strict_tracks and strict_count >= strict_target and strict_med_prob >= max(0.11, 0.85 * base_min_mean_prob):
-        return strict_tracks, "strict", strict_params, strict_quality, strict_debug
-
-    if disable_fallback:
-        return strict_tracks, "single-pass", strict_params, strict_quality, strict_debug
+    def run_pass(mode_params):
+        # prob_move and embedding_map are only read, so passes can share them
+        mode_debug: dict = {}
+        tracks = postprocess_prob_to_tracks(
+            prob_move,
+            embedding_map=embedding_map,
+            debug=mode_debug,
+            **mode_params,
+        )
+        return tracks, mode_debug
 
     # Keep fallback close to the user's requested threshold. The earlier hard
     # caps at 0.88/0.80 made high thresholds like 0.97 jump into much looser
@@ -155,6 +144,23 @@ def _postprocess_with_fallback_impl(
         ),
     ]
 
+    strict_params = {**base, "max_tracks": per_mode_cap}
+    strict_tracks, strict_debug = run_pass(strict_params)
+    strict_quality = _trackset_quality_impl(strict_tracks)
+    strict_count = int(len(strict_tracks))
+    strict_med_prob = (
+        float(np.median([float(tr.get("mean_prob", 0.0)) for tr in strict_tracks]))
+        if strict_tracks
+        else 0.0
+    )
+
+    strict_target = int(max(8, min(24, round(0.16 * max(24, base_max_tracks)))))
+    if strict_tracks and strict_count >= strict_target and strict_med_prob >= max(0.11, 0.85 * base_min_mean_prob):
+        return strict_tracks, "strict", strict_params, strict_quality, strict_debug
+
+    if disable_fallback:
+        return strict_tracks, "single-pass", strict_params, strict_quality, strict_debug
+
     mode_results = []
     merged_inputs: list[list[dict]] = []
     selected_debug = strict_debug
@@ -162,32 +168,38 @@ def _postprocess_with_fallback_impl(
         merged_inputs.append(strict_tracks)
         mode_results.append(("strict", strict_params, strict_quality, strict_count))
 
-    for mode, mode_params in ladders:
-        _raise_if_autopick_canceled(cancel_requested)
-        mode_debug: dict = {}
-        tracks = postprocess_prob_to_tracks(
-            prob_move,
-            embedding_map=embedding_map,
-            debug=mode_debug,
-            **mode_params,
-        )
-        if not tracks:
-            continue
-        quality = _trackset_quality_impl(tracks)
-        count = int(len(tracks))
-        med_prob = float(np.median([float(tr.get("mean_prob", 0.0)) for tr in tracks]))
-
-        if strict_tracks:
-            count_limit = max(strict_count + 24, int(round(1.6 * strict_count)))
-            if count > count_limit and quality <= (1.20 * strict_quality):
-                continue
-            prob_floor = max(0.85 * base_min_mean_prob, 0.75 * strict_med_prob, 0.08)
-            if med_prob < prob_floor:
+    # Strict missed its targets: run recover and rescue side by side. They
+    # only run here, so the common strict case never pays for them.
+    pool = ThreadPoolExecutor(max_workers=len(ladders))
+    futures = [pool.submit(run_pass, mode_params) for _mode, mode_params in ladders]
+    try:
+        # results are taken in ladder order, as when the passes ran one by one
+        for (mode, mode_params), future in zip(ladders, futures):
+            while not future.done():
+                _raise_if_autopick_canceled(cancel_requested)
+                wait([future], timeout=0.1)
+            _raise_if_autopick_canceled(cancel_requested)
+            tracks, mode_debug = future.result()
+            if not tracks:
                 continue
+            quality = _trackset_quality_impl(tracks)
+            count = int(len(tracks))
+            med_prob = float(np.median([float(tr.get("mean_prob", 0.0)) for tr in tracks]))
 
-        merged_inputs.append(tracks)
-        mode_results.append((mode, mode_params, quality, count))
-        selected_debug = mode_debug
+            if strict_tracks:
+                count_limit = max(strict_count + 24, int(round(1.6 * strict_count)))
+                if count > count_limit and quality <= (1.20 * strict_quality):
+                    continue
+                prob_floor = max(0.85 * base_min_mean_prob, 0.75 * strict_med_prob, 0.08)
+                if med_prob < prob_floor:
+                    continue
+
+            merged_inputs.append(tracks)
+            mode_results.append((mode, mode_params, quality, count))
+            selected_debug = mode_debug
+    finally:
+        # on cancel, passes still running are not waited for
+        pool.shutdown(wait=False, cancel_futures=True)
 
     _raise_if_autopick_canceled(cancel_requested)
     if merged_inputs:
@@ -202,17 +214,61 @@ def _postprocess_with_fallback_impl(
     return [], "strict", dict(base), 0.0, strict_debug
 
 
+def _autopick_result_impl(prob_move, embedding_map, params: dict, cancel_requested=None) -> dict:
+    embedding_map = np.asarray(embedding_map, dtype=np.float32) if embedding_map is not None else None
+    tracks, mode, _params, _quality, debug = _postprocess_with_fallback_impl(
+        prob_move,
+        params,
+        embedding_map=embedding_map,
+        cancel_requested=cancel_requested,
+    )
+    return {
+        "prob_move": np.asarray(prob_move, dtype=np.float32),
+        "embedding_map": embedding_map,
+        "tracks": tracks,
+        "mode": mode,
+        "source": "bright",
+        "debug": debug,
+    }
+
+
+def _infer_tiled_impl(model, kymo, tiling, cancel_requested):
+    """
+    Model inference in overlapping time tiles (see AutoPickModel.infer_tiled);
+    tiling is {"tile_frames": ..., "tile_overlap": ...}.
+    """
+    tiling = tiling or {}
+    out = model.infer_tiled(
+        kymo,
+        tile=tiling.get("tile_frames", TILE_FRAMES),
+        overlap=tiling.get("tile_overlap", TILE_OVERLAP),
+        is_canceled=cancel_requested,
+    )
+    if out is None:
+        raise AutoPickCanceled()
+    return out
+
+
 class AutoPickWorker(QtCore.QObject):
     finished = pyqtSignal(object)
     error = pyqtSignal(str)
     canceled = pyqtSignal()
     stage_changed = pyqtSignal(str)
 
-    def __init__(self, kymo_array: np.ndarray, onnx_path: str, postprocess_params: dict | None = None):
+    def __init__(
+        self,
+        kymo_array: np.ndarray,
+        onnx_path: str,
+        postprocess_params: dict | None = None,
+        model: AutoPickModel | None = None,
+        tiling: dict | None = None,
+    ):
         super().__init__()
         self.kymo_array = np.asarray(kymo_array)
         self.onnx_path = str(onnx_path)
         self.postprocess_params = dict(postprocess_params or {})
+        self.model = model if model is not None else get_autopick_model(self.onnx_path)
+        self.tiling = dict(tiling or {})
         self._cancel_requested = False
 
     def cancel(self):
@@ -221,44 +277,112 @@ class AutoPickWorker(QtCore.QObject):
     @pyqtSlot()
     def run(self):
         try:
-            from kymo_autopick.infer_onnx import infer_prob_move_and_embeddings_onnx
-
             cancel_requested = lambda: bool(self._cancel_requested)
             _raise_if_autopick_canceled(cancel_requested)
 
             self.stage_changed.emit("Running model...")
-            prob_bright, emb_bright = infer_prob_move_and_embeddings_onnx(
-                self.kymo_array,
-                self.onnx_path,
-                time_axis="y",
+            prob_bright, emb_bright = _infer_tiled_impl(
+                self.model, self.kymo_array, self.tiling, cancel_requested
             )
 
             _raise_if_autopick_canceled(cancel_requested)
             self.stage_changed.emit("Finding anchors...")
 
-            tracks_b, mode_b, _params_b, q_b, debug_b = _postprocess_with_fallback_impl(
+            result = _autopick_result_impl(
                 prob_bright,
+                emb_bright,
                 self.postprocess_params,
-                embedding_map=np.asarray(emb_bright, dtype=np.float32) if emb_bright is not None else None,
                 cancel_requested=cancel_requested,
             )
-            chosen_prob = np.asarray(prob_bright, dtype=np.float32)
-            tracks = tracks_b
-            mode = mode_b
-            source = "bright"
 
             _raise_if_autopick_canceled(cancel_requested)
 
-            self.finished.emit(
-                {
-                    "prob_move": chosen_prob,
-                    "embedding_map": np.asarray(emb_bright, dtype=np.float32) if emb_bright is not None else None,
-                    "tracks": tracks,
-                    "mode": mode,
-                    "source": source,
-                    "debug": debug_b,
-                }
-            )
+            self.finished.emit(result)
+        except AutoPickCanceled:
+            self.canceled.emit()
+        except Exception as exc:
+            self.error.emit(str(exc))
+
+
+class BatchAutoPickWorker(QtCore.QObject):
+    """
+    Auto-pick over several kymographs with one shared model session.
+    Inference of the next kymograph runs while the previous one is
+    postprocessed on a helper thread (ONNX Runtime releases the GIL).
+    Only the tracks are kept per kymograph, so memory does not grow with the
+    probability and embedding maps; a kymograph that fails is reported in
+    the result instead of stopping the batch.
+    """
+    progress = pyqtSignal(int, int)   # (kymographs done, total)
+    finished = pyqtSignal(object)     # {"results": {name: {...}}, "errors": {name: message}}
+    error = pyqtSignal(str)
+    canceled = pyqtSignal()
+    stage_changed = pyqtSignal(str)
+
+    def __init__(self, kymos: dict, model: AutoPickModel, postprocess_params: dict | None = None,
+                 tiling: dict | None = None):
+        super().__init__()
+        self.kymos = {name: np.asarray(kymo) for name, kymo in kymos.items()}
+        self.model = model
+        self.postprocess_params = dict(postprocess_params or {})
+        self.tiling = dict(tiling or {})
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def _postprocess(self, prob_move, embedding_map, cancel_requested):
+        result = _autopick_result_impl(prob_move, embedding_map, self.postprocess_params, cancel_requested)
+        return {key: result[key] for key in ("tracks", "mode", "source")}
+
+    @pyqtSlot()
+    def run(self):
+        cancel_requested = lambda: bool(self._cancel_requested)
+        results: dict = {}
+        errors: dict = {}
+        total = len(self.kymos)
+        done = 0
+        pending = None  # (name, future) being postprocessed
+
+        def collect(item):
+            nonlocal done
+            name, future = item
+            try:
+                results[name] = future.result()
+            except AutoPickCanceled:
+                raise
+            except Exception as exc:
+                errors[name] = str(exc)
+            done += 1
+            self.progress.emit(done, total)
+
+        try:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                for idx, (name, kymo) in enumerate(self.kymos.items(), start=1):
+                    _raise_if_autopick_canceled(cancel_requested)
+                    self.stage_changed.emit(f"Running model on {name} ({idx}/{total})...")
+                    try:
+                        prob_move, embedding_map = _infer_tiled_impl(
+                            self.model, kymo, self.tiling, cancel_requested
+                        )
+                    except AutoPickCanceled:
+                        raise
+                    except Exception as exc:
+                        prob_move = None
+                        errors[name] = str(exc)
+                    if pending is not None:
+                        collect(pending)
+                        pending = None
+                    if prob_move is None:
+                        done += 1
+                        self.progress.emit(done, total)
+                        continue
+                    pending = (name, pool.submit(self._postprocess, prob_move, embedding_map, cancel_requested))
+                if pending is not None:
+                    self.stage_changed.emit("Finding anchors...")
+                    collect(pending)
+            _raise_if_autopick_canceled(cancel_requested)
+            self.finished.emit({"results": results, "errors": errors})
         except AutoPickCanceled:
             self.canceled.emit()
         except Exception as exc:
@@ -1576,6 +1700,106 @@ class _AutoPickReviewDialog(QDialog):
             return
         self.accept()
 
+class _BatchAutoPickDialog(QDialog):
+    """
+    Checkable list of kymographs: which ones to auto-pick, and afterwards
+    (with `results`) which ones to add, with their track counts at the
+    chosen confidence threshold.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        message: str,
+        names: list[str],
+        *,
+        results: dict | None = None,
+        errors: dict | None = None,
+        ok_text: str = "Run",
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setStyleSheet(QApplication.instance().styleSheet())
+        self._names = list(names)
+        self._results = results
+
+        layout = QVBoxLayout(self)
+        label = QLabel(message)
+        label.setWordWrap(True)
+        layout.addWidget(label)
+
+        self._threshold_spin = None
+        if results is not None:
+            thr_layout = QHBoxLayout()
+            thr_label = QLabel("Min confidence:")
+            thr_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self._threshold_spin = QDoubleSpinBox()
+            self._threshold_spin.setRange(0.0, 1.0)
+            self._threshold_spin.setSingleStep(0.01)
+            self._threshold_spin.setDecimals(2)
+            self._threshold_spin.valueChanged.connect(self._refresh_items)
+            thr_layout.addWidget(thr_label)
+            thr_layout.addWidget(self._threshold_spin)
+            layout.addLayout(thr_layout)
+
+        self._list = QtWidgets.QListWidget()
+        for name in self._names:
+            item = QtWidgets.QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self._list.addItem(item)
+        layout.addWidget(self._list)
+
+        if errors:
+            err_label = QLabel(
+                "Failed: " + ", ".join(f"{name} ({msg})" for name, msg in errors.items())
+            )
+            err_label.setWordWrap(True)
+            layout.addWidget(err_label)
+
+        btns = QHBoxLayout()
+        btns.addWidget(QPushButton("All", clicked=lambda: self._set_all(Qt.Checked)))
+        btns.addWidget(QPushButton("None", clicked=lambda: self._set_all(Qt.Unchecked)))
+        btns.addStretch(1)
+        btns.addWidget(QPushButton("Cancel", clicked=self.reject))
+        btn_ok = QPushButton(ok_text, clicked=self.accept)
+        btn_ok.setDefault(True)
+        btns.addWidget(btn_ok)
+        layout.addLayout(btns)
+
+        self._refresh_items()
+
+    def _set_all(self, state):
+        for row in range(self._list.count()):
+            self._list.item(row).setCheckState(state)
+
+    def threshold(self) -> float:
+        return float(self._threshold_spin.value()) if self._threshold_spin is not None else 0.0
+
+    def filtered_tracks(self, name: str) -> list[dict]:
+        result = (self._results or {}).get(name) or {}
+        thr = self.threshold()
+        return [tr for tr in result.get("tracks") or [] if float(tr.get("mean_prob", 0.0)) >= thr]
+
+    def _refresh_items(self, *_args):
+        if self._results is None:
+            return
+        for row, name in enumerate(self._names):
+            item = self._list.item(row)
+            count = len(self.filtered_tracks(name))
+            noun = "track" if count == 1 else "tracks"
+            item.setText(f"{name}: {count} {noun}")
+            if count == 0:
+                item.setCheckState(Qt.Unchecked)
+
+    def checked_names(self) -> list[str]:
+        return [
+            name for row, name in enumerate(self._names)
+            if self._list.item(row).checkState() == Qt.Checked
+        ]
+
+
 class NavigatorAutoPickMixin:
     def _packaged_autopick_model_path(self) -> str:
         resolver = getattr(self, "resource_path", None)
@@ -1630,8 +1854,24 @@ class NavigatorAutoPickMixin:
             "disable_fallback": True,
         }
         self.autopick_default_postprocess_params = dict(self.autopick_postprocess_params)
+        # ONNX Runtime threads for the shared session (0: runtime default);
+        # TRACY_AUTOPICK_THREADS sets the intra-op count
+        try:
+            self.autopick_intra_op_threads = int(os.environ.get("TRACY_AUTOPICK_THREADS", "") or 0)
+        except ValueError:
+            self.autopick_intra_op_threads = 0
+        self.autopick_inter_op_threads = 0
+        # long kymographs are inferred in overlapping tiles of this many frames
+        self.autopick_tile_frames = TILE_FRAMES
+        self.autopick_tile_overlap = TILE_OVERLAP
         self._autopick_shutdown = False
 
+    def _autopick_tiling(self):
+        return {
+            "tile_frames": int(getattr(self, "autopick_tile_frames", TILE_FRAMES)),
+            "tile_overlap": int(getattr(self, "autopick_tile_overlap", TILE_OVERLAP)),
+        }
+
     def _autopick_settings_specs(self):
         return [
             (
@@ -2319,6 +2559,49 @@ class NavigatorAutoPickMixin:
         # LoG is a visualization toggle only.
         return kymo_name, np.asarray(kymo)
 
+    def _resolve_autopick_model_path(self) -> str | None:
+        onnx_path = self.autopick_onnx_path
+        if not onnx_path or not Path(onnx_path).exists():
+            bundled_path = self._packaged_autopick_model_path()
+            if bundled_path:
+                onnx_path = bundled_path
+                self.autopick_onnx_path = bundled_path
+        if not onnx_path or not Path(onnx_path).exists():
+            onnx_path = self._select_autopick_model_path()
+        if not onnx_path:
+            self.flash_message("Auto-pick canceled")
+            return None
+        if not Path(onnx_path).exists():
+            QMessageBox.warning(self, "", f"Model not found:\n{onnx_path}")
+            return None
+        return onnx_path
+
+    def _get_autopick_model(self, onnx_path: str) -> AutoPickModel:
+        # one session per model and thread settings, shared by every run
+        return get_autopick_model(
+            onnx_path,
+            intra_op_threads=getattr(self, "autopick_intra_op_threads", 0),
+            inter_op_threads=getattr(self, "autopick_inter_op_threads", 0),
+        )
+
+    def preload_autopick_model(self):
+        """
+        Build and warm the auto-pick session on a background thread, so the
+        first FIND does not wait for onnxruntime. TRACY_AUTOPICK_PRELOAD=0
+        turns this off.
+        """
+        if os.environ.get("TRACY_AUTOPICK_PRELOAD", "").strip() == "0":
+            return
+        onnx_path = self.autopick_onnx_path or self._packaged_autopick_model_path()
+        if not onnx_path or not Path(onnx_path).exists():
+            return
+
+        def on_error(exc):
+            if getattr(self, "debug_mode", False):
+                print(f"Auto-pick preload failed: {exc}")
+
+        self._get_autopick_model(onnx_path).preload(on_error=on_error)
+
     def on_autopick_clicked(self):
         if self._autopick_running:
             return
@@ -2337,19 +2620,8 @@ class NavigatorAutoPickMixin:
         self.cancel_left_click_sequence()
         self._clear_autopick_preview_overlay()
 
-        onnx_path = self.autopick_onnx_path
-        if not onnx_path or not Path(onnx_path).exists():
-            bundled_path = self._packaged_autopick_model_path()
-            if bundled_path:
-                onnx_path = bundled_path
-                self.autopick_onnx_path = bundled_path
-        if not onnx_path or not Path(onnx_path).exists():
-            onnx_path = self._select_autopick_model_path()
+        onnx_path = self._resolve_autopick_model_path()
         if not onnx_path:
-            self.flash_message("Auto-pick canceled")
-            return
-        if not Path(onnx_path).exists():
-            QMessageBox.warning(self, "", f"Model not found:\n{onnx_path}")
             return
 
         self._autopick_cancel_requested = False
@@ -2363,6 +2635,8 @@ class NavigatorAutoPickMixin:
             raw_kymo.copy(),
             onnx_path,
             dict(self.autopick_postprocess_params),
+            model=self._get_autopick_model(onnx_path),
+            tiling=self._autopick_tiling(),
         )
         if self._autopick_cancel_requested:
             self._autopick_worker.cancel()
@@ -2381,6 +2655,141 @@ class NavigatorAutoPickMixin:
 
         self._autopick_thread.start()
 
+    def on_batch_autopick_clicked(self):
+        if self._autopick_running:
+            return
+        if self._autopick_thread is not None and self._autopick_thread.isRunning():
+            self.flash_message("Auto-pick already running")
+            return
+        if self.movie is None:
+            self.flash_message("Load a movie first")
+            return
+        names = [name for name in self.kymographs if self.kymographs.get(name) is not None]
+        if not names:
+            self.flash_message("No kymographs")
+            return
+
+        chooser = _BatchAutoPickDialog(
+            "Find in kymographs",
+            "Auto-pick the checked kymographs; the results are reviewed together at the end.",
+            names,
+            parent=self,
+        )
+        if chooser.exec_() != QDialog.Accepted:
+            return
+        names = chooser.checked_names()
+        if not names:
+            return
+
+        self.cancel_left_click_sequence()
+        self._clear_autopick_preview_overlay()
+
+        onnx_path = self._resolve_autopick_model_path()
+        if not onnx_path:
+            return
+
+        self._autopick_cancel_requested = False
+        self._autopick_running = True
+        if hasattr(self, "autopick_button"):
+            self.autopick_button.setEnabled(False)
+        self._show_autopick_progress_dialog()
+        dialog = self._autopick_progress_dialog
+        if dialog is not None:
+            dialog.setMaximum(len(names))
+
+        self._autopick_thread = QtCore.QThread()
+        self._autopick_worker = BatchAutoPickWorker(
+            # Auto-pick always uses the underlying unfiltered kymographs.
+            {name: np.asarray(self.kymographs[name]).copy() for name in names},
+            self._get_autopick_model(onnx_path),
+            dict(self.autopick_postprocess_params),
+            tiling=self._autopick_tiling(),
+        )
+        self._autopick_worker.moveToThread(self._autopick_thread)
+
+        self._autopick_thread.started.connect(self._autopick_worker.run)
+        self._autopick_worker.stage_changed.connect(self._on_autopick_stage_changed)
+        self._autopick_worker.progress.connect(self._on_batch_autopick_progress)
+        self._autopick_worker.finished.connect(self._on_batch_autopick_finished)
+        self._autopick_worker.error.connect(self._on_autopick_error)
+        self._autopick_worker.canceled.connect(self._on_autopick_canceled)
+
+        self._autopick_worker.finished.connect(self._autopick_thread.quit)
+        self._autopick_worker.error.connect(self._autopick_thread.quit)
+        self._autopick_worker.canceled.connect(self._autopick_thread.quit)
+        self._autopick_thread.finished.connect(self._on_autopick_thread_finished)
+
+        self._autopick_thread.start()
+
+    def _on_batch_autopick_progress(self, done: int, total: int):
+        dialog = getattr(self, "_autopick_progress_dialog", None)
+        if dialog is not None:
+            dialog.setMaximum(int(total))
+            dialog.setValue(int(done))
+
+    def _on_batch_autopick_finished(self, result):
+        try:
+            if self._autopick_cancel_requested:
+                self.flash_message("Finding canceled")
+                return
+            self._close_autopick_progress_dialog()
+            results = dict((result or {}).get("results") or {})
+            errors = dict((result or {}).get("errors") or {})
+            names = [name for name in results if results[name].get("tracks")]
+            if not names:
+                failed = f" ({len(errors)} failed)" if errors else ""
+                self.flash_message(f"No tracks found in {len(results)} kymographs{failed}")
+                return
+
+            total = sum(len(results[name]["tracks"]) for name in names)
+            review = _BatchAutoPickDialog(
+                "Review found tracks",
+                f"Found {total} candidate tracks in {len(names)} of {len(results)} kymographs. "
+                "Add the tracks of the checked kymographs?",
+                names,
+                results=results,
+                errors=errors,
+                ok_text="Add",
+                parent=self,
+            )
+            if review.exec_() != QDialog.Accepted:
+                self.flash_message(f"Found {total} candidate tracks; nothing added")
+                return
+
+            current = self.kymoCombo.currentText()
+            added = 0
+            canceled = False
+            for name in review.checked_names():
+                prepared_anchors = self._prepare_autopick_anchor_sets(review.filtered_tracks(name))
+                if not prepared_anchors or name not in self.kymographs:
+                    continue
+                # trajectories are added to the kymograph (and its ROI/channel) shown
+                self.kymoCombo.setCurrentText(name)
+                n, canceled = self._add_autopick_anchor_sets_to_trajectories(prepared_anchors)
+                added += n
+                if canceled:
+                    break
+            if current and self.kymoCombo.currentText() != current:
+                self.kymoCombo.setCurrentText(current)
+
+            noun = "trajectory" if added == 1 else "trajectories"
+            if canceled:
+                self.flash_message(f"Finding stopped after adding {added} {noun}")
+            else:
+                self.flash_message(f"Auto-picked {added} {noun}")
+            if added > 0:
+                self.kymoCanvas.draw_trajectories_on_kymo()
+                self.kymoCanvas.draw_idle()
+                self.movieCanvas.draw_trajectories_on_movie()
+                self.movieCanvas.draw_idle()
+        except Exception as exc:
+            if self._autopick_cancel_requested:
+                self.flash_message("Finding canceled")
+                return
+            QMessageBox.warning(self, "", f"Auto-pick failed:\n{exc}")
+        finally:
+            self._finish_autopick_ui()
+
     def _finish_autopick_ui(self):
         self._autopick_running = False
         self._close_autopick_progress_dialog()
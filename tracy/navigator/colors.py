@@ -138,7 +138,7 @@ class NavigatorColorMixin:
         if not col:
             # use per-point intensities to decide color
             intensities = traj.get("intensities", [])
-            if isinstance(intensities, (list, tuple)) and intensities:
+            if isinstance(intensities, (list, tuple, PointColumn)) and intensities:
                 colors = ["magenta" if val is not None else "grey" for val in intensities]
             else:
                 # fallback if no intensities list: use existing colors or uniform magenta
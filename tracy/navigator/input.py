@@ -2,7 +2,7 @@ from ._shared import *
 
 class NavigatorInputMixin:
     def toggleTracking(self):
-        modes = ["Independent", "Tracked", "Smooth"] #, "Same center"
+        modes = ["Independent", "Tracked", "Smooth", "Fast"] #, "Same center"
         try:
             i = modes.index(self.tracking_mode)
         except ValueError:
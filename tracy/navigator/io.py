@@ -69,10 +69,8 @@ class NavigatorIOMixin:
         if fname:
             self._last_dir = os.path.dirname(fname)
             # try:
-            with tifffile.TiffFile(fname) as tif:
-                temp_movie = tif.asarray()
-                self.movie_metadata = tif.imagej_metadata or {}
-                page = tif.pages[0]
+            # memory-mapped / lazily decoded for large files (see tools.movie_backend)
+            temp_movie, self.movie_metadata, page = open_movie(fname)
 
             tags = page.tags
             description = page.description
@@ -119,7 +117,7 @@ class NavigatorIOMixin:
                             except Exception:
                                 pass
 
-                desc = tif.pages[0].tags["ImageDescription"].value
+                desc = page.tags["ImageDescription"].value
                 try:
                     match = re.search(r'finterval=([\d\.]+)', desc)
                     if match:
@@ -213,11 +211,20 @@ class NavigatorIOMixin:
 
             self.movieCanvas.stop_idle_animation()
             self.movieCanvas.clear_canvas()
-            self.movie = temp_movie
-            self.original_movie = self.movie.copy()
+            self.stop_frame_prefetch()
+            self.shutdown_kymo_thread()
+            close_movie(self.movie)
+            # edits are recorded per frame on top of the loaded data, which
+            # itself stays the pristine original (no second full copy)
+            self.movie = CopyOnWriteMovie(temp_movie)
+            self.original_movie = self.movie.original
 
             # Reset the frame cache whenever a new movie is loaded.
-            self.frame_cache = {}
+            self.report_frame_cache_stats()
+            self._get_frame_cache().clear()
+            self._get_kymo_sample_cache().clear()
+            # ...and every memoized fit (this also covers loading a drift-corrected movie)
+            self.invalidate_fit_cache()
 
             if self.movie.ndim == 4:
                 # 4D movie (multi‑channel)
@@ -362,10 +369,45 @@ class NavigatorIOMixin:
             # except Exception as e:
             #     QMessageBox.critical(self, "Error", f"Could not load movie:\n{str(e)}")
 
-    def get_movie_frame(self, frame_idx, channel_override=None):
-        if self.movie is None:
-            return None
+    def _get_frame_cache(self):
+        if getattr(self, "frame_cache", None) is None:
+            self.frame_cache = FrameCache()
+        return self.frame_cache
+
+    def pin_frame_cache(self, frame_idx):
+        """
+        Keep frame_idx and its neighbours in the frame cache while it is shown.
+        """
+        reach = int(getattr(self, "frame_cache_pin", 2))
+        self._get_frame_cache().pin(range(frame_idx - reach, frame_idx + reach + 1))
+
+    def report_frame_cache_stats(self):
+        if not getattr(self, "debug_mode", False):
+            return
+        st = self._get_frame_cache().stats()
+        print(
+            f"[frame cache] {st['entries']} frames, "
+            f"{st['bytes'] / 1024**2:.1f}/{st['max_bytes'] / 1024**2:.0f} MB, "
+            f"{st['hits']} hits / {st['misses']} misses ({100*st['hit_rate']:.1f}%), "
+            f"{st['evictions']} evicted"
+        )
+
+    def show_frame_cache_stats(self):
+        st = self._get_frame_cache().stats()
+        self.report_frame_cache_stats()
+        QMessageBox.information(
+            self, "Frame cache",
+            f"Frames cached: {st['entries']} ({st['pinned']} pinned)\n"
+            f"Memory: {st['bytes'] / 1024**2:.1f} MB of {st['max_bytes'] / 1024**2:.0f} MB\n"
+            f"Hits: {st['hits']}\nMisses: {st['misses']}\n"
+            f"Hit rate: {100*st['hit_rate']:.1f}%\nEvicted: {st['evictions']}"
+        )
 
+    def _frame_cache_key(self, frame_idx, channel_override=None):
+        """
+        (cache_key, selected_chan, channel_axis) of a frame; reads the channel
+        combo, so call it on the UI thread.
+        """
         # For 4D movies, include selected channel and channel axis in the cache key.
         if self.movie.ndim == 4:
             if channel_override is None:
@@ -375,34 +417,106 @@ class NavigatorIOMixin:
                 # Use the override value.
                 selected_chan = channel_override-1
             channel_axis = self._channel_axis
-            cache_key = (frame_idx, selected_chan, channel_axis)
+            return (frame_idx, selected_chan, channel_axis), selected_chan, channel_axis
+        return frame_idx, None, None
+
+    @staticmethod
+    def _read_movie_frame(movie, frame_idx, selected_chan, channel_axis):
+        if movie.ndim == 4:
+            idx = [0] * movie.ndim
+            idx[0] = frame_idx
+            for ax in range(1, movie.ndim):
+                idx[ax] = selected_chan if ax == channel_axis else slice(None)
+            frame = movie[tuple(idx)]
         else:
-            cache_key = frame_idx
+            frame = movie[frame_idx]
+        if isinstance(frame, np.memmap):
+            # read it now, so a cached (or prefetched) frame is really in RAM
+            frame = np.array(frame)
+        return frame
 
-        # Initialize cache if it doesn't exist.
-        if not hasattr(self, "frame_cache"):
-            self.frame_cache = {}
+    def get_movie_frame(self, frame_idx, channel_override=None):
+        if self.movie is None:
+            return None
+
+        cache_key, selected_chan, channel_axis = self._frame_cache_key(frame_idx, channel_override)
 
         # Return the frame from the cache if available.
-        if cache_key in self.frame_cache:
-            return self.frame_cache[cache_key]
+        cache = self._get_frame_cache()
+        found, frame = cache.lookup(cache_key)
+        if found:
+            return frame
 
         try:
-            if self.movie.ndim == 4:
-                idx = [0] * self.movie.ndim
-                idx[0] = frame_idx
-                for ax in range(1, self.movie.ndim):
-                    idx[ax] = selected_chan if ax == channel_axis else slice(None)
-                frame = self.movie[tuple(idx)]
-            else:
-                frame = self.movie[frame_idx]
+            frame = self._read_movie_frame(self.movie, frame_idx, selected_chan, channel_axis)
             # Store the computed frame in the cache.
-            self.frame_cache[cache_key] = frame
+            cache.store(cache_key, frame)
             return frame
         except IndexError:
             print(f"index {frame_idx} out of bounds.")
             return None
 
+    def _get_frame_prefetcher(self):
+        if getattr(self, "_frame_prefetcher", None) is None:
+            self._frame_prefetcher = FramePrefetcher(
+                self._prefetch_frame, lookahead=getattr(self, "prefetch_lookahead", 8)
+            )
+        return self._frame_prefetcher
+
+    def _prefetch_frame(self, job):
+        # runs on the prefetch thread
+        movie, frame_idx, cache_key, selected_chan, channel_axis = job
+        cache = self._get_frame_cache()
+        if movie is not self.movie or cache_key in cache:
+            return False
+        cache.store(cache_key, self._read_movie_frame(movie, frame_idx, selected_chan, channel_axis))
+        return True
+
+    def prefetch_frames(self, frames):
+        """
+        Decode `frames` (most urgent first) into the frame cache in the
+        background. Only lazy / memory-mapped movies need this; the look-ahead
+        is capped at prefetch_lookahead frames and a quarter of the cache budget.
+        """
+        movie = self.movie
+        if movie is None or not is_lazy_movie(movie):
+            return
+        cache = self._get_frame_cache()
+        n = movie.shape[0]
+        frame_bytes = max(1, movie.nbytes // max(1, n))
+        limit = min(int(getattr(self, "prefetch_lookahead", 8)), max(1, cache.max_bytes // 4 // frame_bytes))
+        jobs = []
+        seen = set()
+        for f in frames:
+            f = int(f)
+            if not 0 <= f < n or f in seen:
+                continue
+            seen.add(f)
+            cache_key, selected_chan, channel_axis = self._frame_cache_key(f)
+            if cache_key in cache:
+                continue
+            jobs.append((movie, f, cache_key, selected_chan, channel_axis))
+            if len(jobs) >= limit:
+                break
+        self._get_frame_prefetcher().request(jobs)
+
+    def prefetch_around(self, frame_idx, step=0):
+        """
+        Prefetch after showing frame_idx: ahead in the scroll direction when
+        the last move was small, else on both sides.
+        """
+        ahead = int(getattr(self, "prefetch_lookahead", 8))
+        if step and abs(step) <= 4 * ahead:
+            frames = [frame_idx + k * step for k in range(1, ahead + 1)]
+        else:
+            frames = [frame_idx + s * k for k in range(1, ahead + 1) for s in (1, -1)]
+        self.prefetch_frames(frames)
+
+    def stop_frame_prefetch(self):
+        prefetcher = getattr(self, "_frame_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.cancel()
+
     def on_channel_axis_changed(self):
         """
         Called when the user changes the channel axis selection.
@@ -1173,38 +1287,19 @@ class NavigatorIOMixin:
             QMessageBox.Yes | QMessageBox.No
         )
 
-        # 4) Determine how many channels we have
-        if self.movie.ndim == 4:
-            n_chan = self.movie.shape[self._channel_axis]
+        # 4) Register every ROI × channel as orphaned (no kymograph yet)
+        self.register_orphaned_kymographs(rois)
+
+        # 5) Rebuild & show only current channel’s list once done
+        def refresh(_stored=True):
+            self.update_kymo_list_for_channel()
+            self.update_kymo_visibility()
+
+        # 6) Generate all ROIs and channels in one pass over the movie
+        if resp == QMessageBox.Yes:
+            self.build_kymographs_in_background(rois, on_done=refresh)
         else:
-            n_chan = 1
-
-        # 5) For each ROI, loop over ALL channels
-        for roi_name, roi in rois.items():
-            for ch in range(n_chan):
-                kymo_name = f"ch{ch+1}-{roi_name}"
-                if resp == QMessageBox.Yes:
-                    # Generate kymograph for this channel
-                    kymo = self.movieCanvas.generate_kymograph(
-                        roi, channel_override=ch+1
-                    )
-                    self.kymographs[kymo_name] = kymo
-                    self.kymo_roi_map[kymo_name] = {
-                        "roi":      roi_name,
-                        "channel":  ch+1,
-                        "orphaned": False
-                    }
-                else:
-                    # Register as orphaned
-                    self.kymo_roi_map[kymo_name] = {
-                        "roi":      roi_name,
-                        "channel":  ch+1,
-                        "orphaned": True
-                    }
-
-        # 6) Rebuild & show only current channel’s list
-        self.update_kymo_list_for_channel()
-        self.update_kymo_visibility()
+            refresh()
 
     def _select_next_kymo(self):
         """Advance the kymo combo one step (if possible)."""
@@ -2558,205 +2653,156 @@ class NavigatorIOMixin:
 
         self.trajectoryCanvas.hide_empty_columns()
 
-    def correct_drift(self):
+    def save_movie_stack(self, fname, movie, parent=None, label="Saving movie..."):
         """
-        Corrects the drift in the currently loaded movie using spot tracking.
+        Stream `movie` (any ndarray-like movie, e.g. a lazy corrected view)
+        to an ImageJ TIFF, a chunk of frames at a time, with a cancelable
+        progress dialog. Returns True once the file is written.
+        """
+        parent = parent or self
+        n_frames = movie.shape[0]
+        progress = QProgressDialog(label, "Cancel", 0, n_frames, parent)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        chunk = max(1, int(getattr(self, "movie_save_chunk", 16)))
 
-        For multi–channel movies the analysis is performed on the currently selected
-        channel but the correction is applied to the full frame so that the original
-        movie shape (including channel axis) is preserved. New areas are padded with black.
+        def frames():
+            # read (and correct) frames only as the writer needs them
+            for start in range(0, n_frames, chunk):
+                yield np.asarray(movie[start:start + chunk])
+
+        metadata = dict(getattr(self, "movie_metadata", None) or {})
+        resolution = None
+        if self.pixel_size:
+            # pixel_size is in nm; ImageJ resolution is pixels per unit
+            resolution = (1000.0 / self.pixel_size, 1000.0 / self.pixel_size)
+            metadata["unit"] = "um"
+        try:
+            return write_movie(
+                fname, frames(), movie.shape, movie.dtype,
+                channel_axis=self._channel_axis if movie.ndim == 4 else None,
+                metadata=metadata,
+                resolution=resolution,
+                compression=getattr(self, "movie_save_compression", None),
+                progress=progress.setValue,
+                is_canceled=progress.wasCanceled,
+            )
+        except Exception as e:
+            QMessageBox.critical(parent, "Save Error", f"Error saving movie:\n{e}")
+            return False
+        finally:
+            progress.close()
 
-        The tracking uses the spot center from one frame as the search center for the next.
-        If no spot is found, the same displacement as in the previous frame is applied.
-        At the end, any gaps are filled in via linear interpolation.
+    def set_movie_drift(self, displacements):
+        """
+        Correct the loaded movie for drift as its frames are read, from an
+        (n_frames, 2) table of (dx, dy); None restores the uncorrected movie.
+        Every cached frame, fit and kymograph sample is dropped, and the
+        kymographs are regenerated from the corrected frames.
         """
         if self.movie is None:
-            QMessageBox.warning(self, "", "Please load a movie first.")
-            return
-
-        if not hasattr(self, "drift_reference") or self.drift_reference is None:
-            QMessageBox.warning(self, "",
-                                "Please click a stationary spot that can be found in all frames first.")
             return
-
-        reply = QMessageBox.question(
-            self,
-            "Confirm Drift Tracking Spot",
-            "Is the currently selected spot suitable for drift tracking?",
-            QMessageBox.Yes | QMessageBox.Cancel,
-            QMessageBox.Cancel
+        self.stop_frame_prefetch()
+        self.shutdown_kymo_thread()
+        self.movie.set_drift(
+            displacements,
+            channel_axis=self._channel_axis if self.movie.ndim == 4 else None,
+            order=0,
         )
-        if reply != QMessageBox.Yes:
+        self._get_frame_cache().clear()
+        self._get_kymo_sample_cache().clear()
+        # bumps the movie token, so nothing computed on the old frames is reused
+        self.invalidate_fit_cache()
+        self.movieCanvas.clear_sum_cache()
+        self.set_current_frame(self.frameSlider.value())
+        self.apply_kymo_line_settings()
+
+    def correct_drift(self):
+        """
+        Corrects the drift in the currently loaded movie.
+
+        The drift of every frame is estimated by phase correlation against a
+        reference (the mean of the first N frames, or a rolling window of N
+        frames) on the chosen channel, so no spot has to be picked. If a spot
+        was clicked it can serve as a fallback: frames whose correlation is
+        too weak are found by fitting that spot instead of interpolating.
+
+        For multi–channel movies the correction is applied to the full frame so
+        that the original movie shape (including channel axis) is preserved.
+        New areas are padded with black. The result is only a drift table on a
+        view of the movie: preview, saving and Apply read corrected frames
+        from it one at a time, so no corrected copy is ever held in memory.
+        """
+        if self.movie is None:
+            QMessageBox.warning(self, "", "Please load a movie first.")
             return
 
-        ref_spot = self.drift_reference  # (x, y)
         n_frames = self.movie.shape[0]
         multi_channel = (self.movie.ndim == 4)
+        ref_spot = getattr(self, "drift_reference", None)  # (x, y)
+        spot_frame = getattr(self, "spot_frame", 0) or 0
+
+        if multi_channel:
+            n_channels = self.movie.shape[self._channel_axis]
+            try:
+                current_chan = int(self.movieChannelCombo.currentText()) - 1
+            except Exception:
+                current_chan = 0
+        else:
+            n_channels, current_chan = 1, 0
 
-        # Initialize a list to hold the tracked spot centers.
-        spot_centers = [None] * n_frames
-        spot_centers[self.spot_frame] = ref_spot
+        dlg = DriftSettingsDialog(n_channels, current_chan, n_frames, ref_spot is not None, self)
+        if dlg.exec_() != QDialog.Accepted:
+            return
 
         crop_size = int(2 * self.searchWindowSpin.value())
 
-        def get_analysis_frame(full_frame):
-            if not multi_channel:
-                return full_frame
-            current_chan = int(self.movieChannelCombo.currentText()) - 1
-            if self._channel_axis == 1:  # channels-first: (channels, H, W)
-                return full_frame[current_chan]
-            else:  # channels-last: (H, W, channels)
-                return full_frame[..., current_chan]
-
-        # --- Create a single progress dialog for both tracking and shifting ---
-        total_tracking = (n_frames - self.spot_frame - 1) + self.spot_frame
-        total_shifts = n_frames
-        total_steps = total_tracking + total_shifts
-
-        progress = QProgressDialog("Tracking spot and applying shift...", "Cancel", 0, total_steps, self)
+        def locate(frame, guess):
+            fitted_center, *_ = perform_gaussian_fit(frame, guess, crop_size, pixelsize=self.pixel_size)
+            return fitted_center
+
+        # --- Estimate the drift of every frame ---
+        progress = QProgressDialog("Estimating drift...", "Cancel", 0, n_frames, self)
         progress.setWindowModality(Qt.WindowModal)
         progress.setMinimumDuration(0)
         progress.show()
-        current_progress = 0
-
-        # --- Forward Tracking ---
-        current_spot = ref_spot
-        last_disp = (0, 0)
-        for i in range(self.spot_frame + 1, n_frames):
-            if progress.wasCanceled():
-                return
-            full_frame = self.movie[i] if multi_channel else self.get_movie_frame(i)
-            if full_frame is None:
-                spot_centers[i] = current_spot
-                current_progress += 1
-                progress.setValue(current_progress)
-                continue
 
-            analysis_frame = get_analysis_frame(full_frame)
-            analysis_frame = np.atleast_2d(analysis_frame)
-            if analysis_frame.ndim != 2:
-                spot_centers[i] = current_spot
-                current_progress += 1
-                progress.setValue(current_progress)
-                continue
-
-            try:
-                fitted_center, sigma, intensity, peak, bkgr = perform_gaussian_fit(analysis_frame, current_spot, crop_size, pixelsize = self.pixel_size)
-            except Exception as e:
-                print(f"Forward Gaussian fit error at frame {i}: {e}")
-                fitted_center = None
-
-            if fitted_center is not None:
-                new_spot = fitted_center
-                last_disp = (new_spot[0] - current_spot[0], new_spot[1] - current_spot[1])
-            else:
-                new_spot = (current_spot[0] + last_disp[0], current_spot[1] + last_disp[1])
-            spot_centers[i] = new_spot
-            current_spot = new_spot
-            current_progress += 1
-            progress.setValue(current_progress)
-
-        # --- Backward Tracking ---
-        current_spot = ref_spot
-        last_disp = (0, 0)
-        for i in range(self.spot_frame - 1, -1, -1):
-            if progress.wasCanceled():
-                return
-            full_frame = self.movie[i] if multi_channel else self.get_movie_frame(i)
-            if full_frame is None:
-                spot_centers[i] = current_spot
-                current_progress += 1
-                progress.setValue(current_progress)
-                continue
-
-            analysis_frame = get_analysis_frame(full_frame)
-            analysis_frame = np.atleast_2d(analysis_frame)
-            if analysis_frame.ndim != 2:
-                spot_centers[i] = current_spot
-                current_progress += 1
-                progress.setValue(current_progress)
-                continue
-
-            try:
-                fitted_center, sigma, intensity, peak, bkgr = perform_gaussian_fit(analysis_frame, current_spot, crop_size, pixelsize = self.pixel_size)
-            except Exception as e:
-                print(f"Backward Gaussian fit error at frame {i}: {e}")
-                fitted_center = None
-
-            if fitted_center is not None:
-                new_spot = fitted_center
-                last_disp = (new_spot[0] - current_spot[0], new_spot[1] - current_spot[1])
-            else:
-                new_spot = (current_spot[0] + last_disp[0], current_spot[1] + last_disp[1])
-            spot_centers[i] = new_spot
-            current_spot = new_spot
-            current_progress += 1
-            progress.setValue(current_progress)
-        # End of tracking phase.
-
-        # --- Fill in Gaps with Linear Interpolation ---
-        for i in range(n_frames):
-            if spot_centers[i] is None:
-                prev = i - 1
-                while prev >= 0 and spot_centers[prev] is None:
-                    prev -= 1
-                nxt = i + 1
-                while nxt < n_frames and spot_centers[nxt] is None:
-                    nxt += 1
-                if prev >= 0 and nxt < n_frames:
-                    t = (i - prev) / (nxt - prev)
-                    x_interp = spot_centers[prev][0] + t * (spot_centers[nxt][0] - spot_centers[prev][0])
-                    y_interp = spot_centers[prev][1] + t * (spot_centers[nxt][1] - spot_centers[prev][1])
-                    spot_centers[i] = (x_interp, y_interp)
-                elif prev >= 0:
-                    spot_centers[i] = spot_centers[prev]
-                elif nxt < n_frames:
-                    spot_centers[i] = spot_centers[nxt]
-                else:
-                    spot_centers[i] = ref_spot
-
-        displacements = [(sc[0] - ref_spot[0], sc[1] - ref_spot[1]) for sc in spot_centers]
-
-        # --- Apply Correction (Shifting) ---
-        corrected_frames = [None] * n_frames
-
-        for i in range(n_frames):
-            if progress.wasCanceled():
-                return
-            full_frame = self.movie[i] if multi_channel else self.get_movie_frame(i)
-            if full_frame is None:
-                corrected_frames[i] = None
-                current_progress += 1
-                progress.setValue(current_progress)
-                continue
-
-            if full_frame.ndim == 2:
-                shift_vector = [-displacements[i][1], -displacements[i][0]]
-            elif full_frame.ndim == 3:
-                if multi_channel:
-                    if self._channel_axis == 1:  # channels-first: (channels, H, W)
-                        shift_vector = [0, -displacements[i][1], -displacements[i][0]]
-                    else:  # channels-last: (H, W, channels)
-                        shift_vector = [-displacements[i][1], -displacements[i][0], 0]
-                else:
-                    shift_vector = [-displacements[i][1], -displacements[i][0]]
-            else:
-                QMessageBox.critical(self, "Drift Correction Error",
-                                    "Unexpected movie dimensions; cannot apply drift correction.")
-                progress.close()
-                return
+        try:
+            result = estimate_drift(
+                self.movie,
+                channel=dlg.new_channel if multi_channel else None,
+                channel_axis=self._channel_axis if multi_channel else None,
+                reference=dlg.new_reference,
+                ref_frames=dlg.new_ref_frames,
+                locate=locate if dlg.use_spot else None,
+                spot=ref_spot if dlg.use_spot else None,
+                spot_frame=spot_frame,
+                progress=progress.setValue,
+                is_canceled=progress.wasCanceled,
+            )
+        except Exception as e:
+            progress.close()
+            QMessageBox.critical(self, "Drift Correction Error", f"Drift estimation failed:\n{e}")
+            return
+        if result is None:
+            progress.close()
+            return
+        displacements, quality = result
+        if getattr(self, "debug_mode", False):
+            print(f"Drift: max |d| = {np.abs(displacements).max():.2f} px, "
+                  f"min peak quality = {quality.min():.1f}")
 
-            try:
-                # Use order=0 (nearest neighbor) so that pixel values are unchanged.
-                corrected_frames[i] = shift(full_frame, shift=shift_vector, order=0, mode='constant', cval=0)
-            except Exception as e:
-                QMessageBox.critical(self, "Drift Correction Error",
-                                    f"Error applying shift on frame {i}:\n{e}")
-                corrected_frames[i] = full_frame
-            current_progress += 1
-            progress.setValue(current_progress)
         progress.close()
 
+        # --- Corrected view: the drift table is applied as frames are read ---
+        if self.movie.drift is not None:
+            # the estimate ran on the already corrected frames
+            displacements = displacements + self.movie.drift
+        corrected = self.movie.copy()
+        # order=0 (nearest neighbor) so that pixel values are unchanged
+        corrected.set_drift(displacements, channel_axis=self._channel_axis if multi_channel else None, order=0)
+
         # --- Display the Corrected Movie in a Popup Dialog ---
         dialog = QDialog(self)
         dialog.setWindowTitle("Drift-Corrected Movie")
@@ -2788,7 +2834,7 @@ class NavigatorIOMixin:
         # Create a slider for frame navigation.
         slider = QSlider(Qt.Horizontal)
         slider.setMinimum(0)
-        slider.setMaximum(len(corrected_frames) - 1)
+        slider.setMaximum(n_frames - 1)
         dialog_layout.addWidget(slider)
 
         # Create a channel dropdown if the movie has multiple channels.
@@ -2804,9 +2850,7 @@ class NavigatorIOMixin:
 
         # Define a function to update the displayed frame:
         def update_frame(val):
-            frame = corrected_frames[val]
-            if frame is None:
-                return
+            frame = corrected[val]
             if self.movie.ndim == 4 and channel_dropdown is not None:
                 ch_index = channel_dropdown.currentIndex()
                 if self._channel_axis == 1:
@@ -2827,7 +2871,7 @@ class NavigatorIOMixin:
 
             # ensure we have defaults for this channel
             # get a slice of the first corrected frame
-            first_frame = corrected_frames[0]
+            first_frame = corrected[0]
             if self.movie.ndim == 4:
                 if self._channel_axis == 1:
                     sample = first_frame[ch0]
@@ -2865,9 +2909,12 @@ class NavigatorIOMixin:
 
         # Add dialog buttons.
         btn_layout = QHBoxLayout()
+        btn_apply = QPushButton("Apply")
+        btn_apply.setToolTip("Correct the loaded movie without saving a copy")
         btn_save = QPushButton("Save Movie")
         btn_save_load = QPushButton("Save and Load Movie")
         btn_cancel = QPushButton("Cancel")
+        btn_layout.addWidget(btn_apply)
         btn_layout.addWidget(btn_save)
         btn_layout.addWidget(btn_save_load)
         btn_layout.addWidget(btn_cancel)
@@ -2886,20 +2933,26 @@ class NavigatorIOMixin:
             if not fname:
                 # user clicked Cancel in the file-chooser → do nothing
                 return False
-            try:
-                # actually write it out
-                tifffile.imwrite(
-                    fname,
-                    np.array(corrected_frames),
-                    #bigtiff=True, NEEDS TESTING
-                    imagej=True,
-                    metadata=getattr(self, "movie_metadata", {})
-                )
+
+            if self.save_movie_stack(fname, corrected, parent=dialog, label="Saving corrected movie..."):
                 saved_file["path"] = fname
                 return True
-            except Exception as e:
-                QMessageBox.critical(dialog, "Save Error", f"Error saving movie:\n{e}")
-                return False
+            return False
+
+        def apply_drift():
+            if (hasattr(self, 'trajectoryCanvas') and self.trajectoryCanvas.trajectories):
+                reply = QMessageBox.question(
+                    dialog,
+                    "Apply Drift Correction",
+                    "Existing trajectories were measured on the uncorrected movie "
+                    "and will not be moved. Apply the correction anyway?",
+                    QMessageBox.Yes | QMessageBox.Cancel,
+                    QMessageBox.Cancel
+                )
+                if reply != QMessageBox.Yes:
+                    return
+            self.set_movie_drift(corrected.drift)
+            dialog.accept()
 
         def save_and_load_movie():
             # bail out if the user canceled (or if save_movie hit an error)
@@ -2934,6 +2987,7 @@ class NavigatorIOMixin:
                 # only close the corrected‐movie popup if we actually saved
                 dialog.accept()
 
+        btn_apply.clicked.connect(apply_drift)
         btn_save.clicked.connect(on_save_clicked)
         btn_save_load.clicked.connect(save_and_load_movie)
         btn_cancel.clicked.connect(dialog.reject)
@@ -423,7 +423,7 @@ class NavigatorKymoMixin:
         return selected_idx, traj, roi, kymo_w, num_frames_m1
 
     def _traj_matches_current_kymo(self, traj: dict, roi: dict) -> bool:
-        if not isinstance(traj, dict) or not isinstance(roi, dict):
+        if not isinstance(traj, Mapping) or not isinstance(roi, dict):
             return False
         traj_roi = traj.get("roi")
         if not isinstance(traj_roi, dict):
@@ -1189,6 +1189,8 @@ class NavigatorKymoMixin:
         # For a vertically flipped kymograph, the frame index is computed as below:
         num_frames = kymograph.shape[0]
         frame_val = num_frames - y
+        # a click here jumps to this frame, so have it (and its neighbours) ready
+        self.prefetch_around((num_frames - 1) - int(round(y)))
 
         # If an ROI exists, compute the corresponding movie coordinate based on the ROI.
         if self.roiCombo.count() > 0:
@@ -1494,3 +1496,371 @@ class NavigatorKymoMixin:
         self._update_legends()
         self.kymoCanvas.draw_trajectories_on_kymo()
         self.kymoCanvas.draw_idle()
+
+    def kymograph_channels(self):
+        """
+        0-based channels kymographs are generated for (None for 3D movies).
+        """
+        if self.movie is not None and self.movie.ndim == 4:
+            return list(range(self.movie.shape[self._channel_axis]))
+        return [None]
+
+    def build_kymographs(self, rois, channels=None, progress=None, is_canceled=None, on_chunk=None):
+        """
+        {(roi_name, channel): kymograph} for every ROI in `rois` and every
+        channel, from a single pass over the movie. Safe to call off the UI
+        thread; returns None when canceled.
+        """
+        if self.movie is None:
+            return {}
+        movie = self.movie
+        token = getattr(self, "_movie_token", 0)
+        channels = self.kymograph_channels() if channels is None else list(channels)
+        line_width = getattr(self, "line_width", 2)
+        cache = self._get_kymo_sample_cache()
+        # keep the raw samples for re-reduction when they fit the cache
+        samples = {} if raw_samples_nbytes(movie, rois, channels, line_width) <= cache.max_bytes else None
+        kymos = batch_kymographs(
+            movie, rois,
+            channels=channels,
+            channel_axis=getattr(self, "_channel_axis", None),
+            line_width=line_width,
+            method=getattr(self, "line_integration_method", "max"),
+            progress=progress,
+            is_canceled=is_canceled,
+            samples_out=samples,
+            on_chunk=on_chunk,
+        )
+        if kymos is not None and samples:
+            for (roi_name, ch), raw in samples.items():
+                cache.store(cache.make_key(token, rois[roi_name], ch), raw, line_width)
+        return kymos
+
+    def _get_kymo_sample_cache(self):
+        if getattr(self, "kymo_sample_cache", None) is None:
+            self.kymo_sample_cache = KymoSampleCache()
+        return self.kymo_sample_cache
+
+    def apply_kymo_line_settings(self):
+        """
+        Bring ROI kymographs in line with the current line_width and
+        line_integration_method: re-reduced from cached samples where
+        possible, the rest regenerated in one background pass.
+        """
+        if self.movie is None:
+            return
+        cache = self._get_kymo_sample_cache()
+        token = getattr(self, "_movie_token", 0)
+        line_width = getattr(self, "line_width", 2)
+        method = getattr(self, "line_integration_method", "max")
+        stale_rois, stale_channels = {}, set()
+        for kymo_name, info in self.kymo_roi_map.items():
+            roi = self.rois.get(info.get("roi"))
+            if info.get("orphaned") or kymo_name not in self.kymographs or roi is None:
+                continue
+            ch = info["channel"] - 1 if self.movie.ndim == 4 else None
+            kymo = cache.reduce(cache.make_key(token, roi, ch), line_width, method)
+            if kymo is None:
+                stale_rois[info["roi"]] = roi
+                stale_channels.add(ch)
+            else:
+                self.kymographs[kymo_name] = kymo
+                self.kymographs_log.pop(kymo_name, None)
+
+        def refresh(_stored=True):
+            if self.kymoCombo.currentText():
+                self.kymo_changed()
+
+        if stale_rois:
+            self.build_kymographs_in_background(
+                stale_rois, on_done=refresh, channels=sorted(stale_channels, key=lambda c: c or 0),
+                replace_only=True,
+            )
+        else:
+            refresh()
+
+    def store_kymographs(self, kymos, replace_only=False):
+        """
+        Register kymographs from build_kymographs as ch<N>-<roi>; with
+        replace_only, only kymographs that already exist are updated.
+        """
+        for (roi_name, ch), kymo in kymos.items():
+            channel = 1 if ch is None else ch + 1
+            kymo_name = f"ch{channel}-{roi_name}"
+            if replace_only and kymo_name not in self.kymographs:
+                continue
+            self.kymographs[kymo_name] = kymo
+            self.kymographs_log.pop(kymo_name, None)
+            self.kymo_roi_map[kymo_name] = {
+                "roi":      roi_name,
+                "channel":  channel,
+                "orphaned": False
+            }
+
+    def register_orphaned_kymographs(self, roi_names):
+        """
+        List every channel of these ROIs as orphaned (no kymograph yet),
+        unless a kymograph already exists.
+        """
+        for roi_name in roi_names:
+            for ch in self.kymograph_channels():
+                channel = 1 if ch is None else ch + 1
+                kymo_name = f"ch{channel}-{roi_name}"
+                if kymo_name in self.kymographs:
+                    continue
+                self.kymo_roi_map[kymo_name] = {
+                    "roi":      roi_name,
+                    "channel":  channel,
+                    "orphaned": True
+                }
+
+    def build_kymographs_in_background(self, rois, on_done=None, channels=None, replace_only=False,
+                                       stream=False, on_ready=None):
+        """
+        Generate and store kymographs for `rois` in a KymographWorker, with a
+        progress dialog over frames. on_done(stored) runs on the UI thread
+        afterwards; stored is False when canceled or failed.
+        With stream=True the kymographs are stored as soon as the first chunk
+        of frames is sampled (on_ready() runs then) and the one on screen
+        fills in as the rest arrives; the progress dialog is not modal, so it
+        can be inspected meanwhile. A streamed request made while a run is
+        going (another ROI drawn) is queued behind it instead of canceling it.
+        """
+        if self.movie is None or not rois:
+            if on_done is not None:
+                on_done(False)
+            return
+        if stream and getattr(self, "_kymo_worker", None) is not None:
+            self._queue_kymographs(rois, on_done, channels, replace_only, on_ready)
+            return
+        self.shutdown_kymo_thread(keep_queue=True)
+
+        progress = QProgressDialog("Generating kymographs…", "Cancel", 0, int(self.movie.shape[0]), self)
+        progress.setWindowModality(Qt.NonModal if stream else Qt.WindowModal)
+        progress.setMinimumDuration(0 if not stream else 500)
+        progress.show()
+        self._kymo_progress = progress
+
+        thread = QtCore.QThread()
+        worker = KymographWorker(rois, self.kymograph_channels() if channels is None else channels, self,
+                                 stream=stream)
+        worker.moveToThread(thread)
+        self._kymo_thread = thread
+        self._kymo_worker = worker
+        self._kymo_partial = {}
+        # what to re-queue if a streamed run is cut short by another build
+        self._kymo_job = None if not stream else {
+            "key": (None if channels is None else tuple(channels), bool(replace_only)),
+            "rois": dict(rois), "channels": channels, "replace_only": replace_only,
+            "on_done": [], "on_ready": [on_ready] if on_ready is not None else [],
+        }
+        last_refresh = [0.0]
+
+        def current():
+            # results of a run that was shut down in the meantime are dropped
+            if self._kymo_worker is worker:
+                return True
+            progress.close()
+            return False
+
+        def finish(stored):
+            progress.close()
+            thread.quit()
+            running = current()
+            if running:
+                if not stored:
+                    self._drop_partial_kymographs()
+                self._kymo_partial = {}
+                # the next run may start now; this thread is only winding down
+                self._kymo_worker = None
+                self._kymo_job = None
+            if on_done is not None:
+                on_done(stored)
+            if running:
+                self._start_queued_kymographs()
+
+        def on_chunk(kymos, done):
+            if not current():
+                return
+            if not self._kymo_partial:
+                self.store_kymographs(kymos, replace_only=replace_only)
+                self._kymo_partial = {
+                    name: self.kymographs[name] for name in self._kymograph_names(kymos)
+                    if name in self.kymographs
+                }
+                if on_ready is not None:
+                    on_ready()
+                last_refresh[0] = time.monotonic()
+                return
+            # redraw at most ~5x per second
+            if time.monotonic() - last_refresh[0] >= 0.2:
+                last_refresh[0] = time.monotonic()
+                self._refresh_partial_kymograph(done)
+
+        def on_finished(kymos):
+            if not current():
+                return
+            streamed = set(self._kymo_partial)
+            self.store_kymographs(kymos, replace_only=replace_only)
+            if streamed:
+                # contrast was picked from a partly empty kymograph
+                for name in streamed:
+                    self.kymographs_log.pop(name, None)
+                    getattr(self, "kymo_contrast_settings", {}).pop(name, None)
+                    getattr(self, "kymo_log_contrast_settings", {}).pop(name, None)
+                self._kymo_partial = {}
+                if self.kymoCombo.currentText() in streamed:
+                    self.kymo_changed()
+            finish(True)
+
+        def on_failed(msg):
+            QMessageBox.critical(self, "Kymograph Error", f"Could not generate kymographs:\n{msg}")
+            finish(False)
+
+        worker.progress.connect(progress.setValue)
+        worker.chunk.connect(on_chunk)
+        worker.finished.connect(on_finished)
+        worker.canceled.connect(lambda: finish(False))
+        worker.failed.connect(on_failed)
+        progress.canceled.connect(worker.cancel)
+        thread.started.connect(worker.run)
+        thread.finished.connect(lambda: self._cleanup_kymo_thread_objects(thread, worker))
+        thread.start()
+
+    def _queue_kymographs(self, rois, on_done, channels, replace_only, on_ready):
+        """
+        Hold a streamed build until the running one ends. Requests for the
+        same channels are merged into one run.
+        """
+        queue = self._kymo_pending_queue()
+        key = (None if channels is None else tuple(channels), bool(replace_only))
+        if queue and queue[-1]["key"] == key:
+            job = queue[-1]
+        else:
+            job = {"key": key, "rois": {}, "channels": channels, "replace_only": replace_only,
+                   "on_done": [], "on_ready": []}
+            queue.append(job)
+        job["rois"].update(rois)
+        if on_done is not None:
+            job["on_done"].append(on_done)
+        if on_ready is not None:
+            job["on_ready"].append(on_ready)
+        progress = getattr(self, "_kymo_progress", None)
+        if progress is not None:
+            n = sum(len(j["rois"]) for j in queue)
+            progress.setLabelText(f"Generating kymographs… ({n} more ROI{'s' if n > 1 else ''} queued)")
+
+    def _kymo_pending_queue(self):
+        queue = getattr(self, "_kymo_queue", None)
+        if queue is None:
+            queue = self._kymo_queue = []
+        return queue
+
+    def _start_queued_kymographs(self):
+        queue = getattr(self, "_kymo_queue", None)
+        if not queue:
+            return
+        job = queue.pop(0)
+        # ROIs deleted while they waited are skipped
+        rois = {name: roi for name, roi in job["rois"].items() if name in (self.rois or {})}
+        if not rois:
+            for cb in job["on_done"]:
+                cb(False)
+            self._start_queued_kymographs()
+            return
+
+        def on_done(stored):
+            for cb in job["on_done"]:
+                cb(stored)
+
+        def on_ready():
+            for cb in job["on_ready"]:
+                cb()
+
+        self.build_kymographs_in_background(
+            rois, on_done=on_done, channels=job["channels"],
+            replace_only=job["replace_only"], stream=True, on_ready=on_ready,
+        )
+
+    @staticmethod
+    def _kymograph_names(kymos):
+        return [f"ch{1 if ch is None else ch + 1}-{roi_name}" for roi_name, ch in kymos]
+
+    def _refresh_partial_kymograph(self, frames_done):
+        """
+        Show the rows sampled so far of the kymograph on screen, if it is
+        still being generated.
+        """
+        name = self.kymoCombo.currentText()
+        kymo = self._kymo_partial.get(name)
+        if kymo is None or self.kymographs.get(name) is not kymo:
+            return
+        img = kymo
+        if getattr(self, "applylogfilter", False):
+            img = self._compute_log_kymograph(kymo)
+        img = np.flipud(img)
+        # frame 0 is the bottom row once flipped
+        valid = slice(img.shape[0] - int(frames_done), None)
+        self.kymoCanvas.update_image_rows(img, valid)
+
+    def _drop_partial_kymographs(self):
+        """
+        Forget kymographs whose generation did not finish; their ROIs are
+        listed as orphaned so they can be generated again.
+        """
+        partial = getattr(self, "_kymo_partial", None) or {}
+        dropped = False
+        for name, kymo in partial.items():
+            if self.kymographs.get(name) is kymo:
+                del self.kymographs[name]
+                self.kymographs_log.pop(name, None)
+                info = self.kymo_roi_map.get(name)
+                if info is not None:
+                    info["orphaned"] = True
+                dropped = True
+        self._kymo_partial = {}
+        if dropped:
+            self.update_kymo_list_for_channel()
+            self.update_kymo_visibility()
+
+    def _cleanup_kymo_thread_objects(self, thread=None, worker=None):
+        thread = thread if thread is not None else getattr(self, "_kymo_thread", None)
+        worker = worker if worker is not None else getattr(self, "_kymo_worker", None)
+        if thread is getattr(self, "_kymo_thread", None):
+            self._kymo_thread = None
+        if worker is getattr(self, "_kymo_worker", None):
+            self._kymo_worker = None
+        for obj in (worker, thread):
+            if obj is not None:
+                try:
+                    obj.deleteLater()
+                except Exception:
+                    pass
+
+    def shutdown_kymo_thread(self, timeout_ms: int = 4000, keep_queue: bool = False) -> bool:
+        """
+        Cancel the running kymograph build. Queued builds are dropped (their
+        ROIs stay listed as orphaned) unless keep_queue, which is how a new
+        build takes over: a streamed run it interrupts goes back to the front
+        of the queue instead of losing its ROIs.
+        """
+        if not keep_queue:
+            self._kymo_queue = []
+        thread = getattr(self, "_kymo_thread", None)
+        if thread is None:
+            return True
+        worker = getattr(self, "_kymo_worker", None)
+        job = getattr(self, "_kymo_job", None)
+        if keep_queue and worker is not None and job is not None:
+            # its on_done still gets False from the canceled run
+            self._kymo_pending_queue().insert(0, job)
+        self._kymo_job = None
+        if thread.isRunning():
+            if worker is not None:
+                worker.cancel()
+            thread.quit()
+            if not thread.wait(int(timeout_ms)):
+                return False
+        self._drop_partial_kymographs()
+        self._cleanup_kymo_thread_objects(thread=thread, worker=worker)
+        return True
@@ -59,6 +59,39 @@ class KymographNavigator(
 
         self.tracking_mode = "Independent"
 
+        # memoized spot fits, see NavigatorAnalysisMixin.cached_gaussian_fit
+        self.fit_cache = FitCache()
+        self._movie_token = 0
+
+        # decoded frames for get_movie_frame, LRU-evicted beyond the budget;
+        # the current frame and frame_cache_pin neighbours on each side are kept
+        # (budget in MB from TRACY_FRAME_CACHE_MB, default 1 GB)
+        try:
+            cache_mb = float(os.environ.get("TRACY_FRAME_CACHE_MB", "") or 1024)
+        except ValueError:
+            cache_mb = 1024
+        self.frame_cache = FrameCache(max_bytes=cache_mb * 1024**2)
+        self.frame_cache_pin = 2
+        # frames decoded ahead in the background while scrubbing / playing
+        self.prefetch_lookahead = 8
+
+        # raw kymograph samples, re-reduced when the line settings change
+        self.kymo_sample_cache = KymoSampleCache()
+
+        # saved movies are streamed movie_save_chunk frames at a time;
+        # compression (e.g. "zlib") is off so saved movies can be memory-mapped
+        self.movie_save_chunk = 16
+        self.movie_save_compression = None
+
+        # process-pool fitting for long trajectories (Spot > Parallel fitting)
+        self.parallel_fitting = False
+        self._parallel_fitter = None
+        self._parallel_lock = threading.Lock()
+
+        # background step detection (see _compute_steps_for_indices)
+        self._steps_thread = None
+        self._steps_worker = None
+
         # Store data from the last analysis run.
         self.analysis_frames = []
         self.analysis_original_coords = []
@@ -220,7 +253,8 @@ class KymographNavigator(
 
         self.avoid_previous_spot = False
         self.same_spot_threshold = 6
-        self.past_centers = []
+        # (frame, x, y) of spots already in trajectories, bucketed per frame
+        self.past_centers = FrameSpatialIndex(cell=self.same_spot_threshold)
 
         self.check_colocalization = False
         self.colocalization_threshold = 4
@@ -283,4 +317,10 @@ class KymographNavigator(
                     pass
                 event.ignore()
                 return
+        self.shutdown_steps_thread()
+        self.shutdown_kymo_thread()
+        self.close_parallel_fitter()
+        prefetcher = getattr(self, "_frame_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.stop()
         super().closeEvent(event)
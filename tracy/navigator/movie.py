@@ -42,7 +42,10 @@ class NavigatorMovieMixin:
         self.frameSlider.setValue(frame_number)
         self.frameSlider.blockSignals(False)
         self.frameNumberLabel.setText(f"{frame_number + 1}")
-        
+        self.pin_frame_cache(frame_number)
+        last_frame = getattr(self, "_last_shown_frame", None)
+        self._last_shown_frame = frame_number
+
         # Get the new frame.
         if self.movieCanvas.sum_mode:
             self.movieCanvas.display_sum_frame()  # You may wish to modify display_sum_frame too.
@@ -52,6 +55,11 @@ class NavigatorMovieMixin:
                 # Update only the image data (without recalculating view limits)
                 self.movieCanvas.update_image_data(frame_image)
         
+        # decode the frames the user is heading to while this one is drawn
+        if not self.movieCanvas.sum_mode:
+            step = 0 if last_frame is None else frame_number - last_frame
+            self.prefetch_around(frame_number, step)
+
         # Restore the saved view limits (thus preserving the manual zoom)
         self.movieCanvas.ax.set_xlim(current_xlim)
         self.movieCanvas.ax.set_ylim(current_ylim)
@@ -162,6 +170,7 @@ class NavigatorMovieMixin:
             if self.analysis_channel is not None:
                 self._select_channel(self.analysis_channel)
 
+            self.pin_frame_cache(frame)
             frame_img = self.get_movie_frame(frame)
             if frame_img is None:
                 return
@@ -387,7 +396,7 @@ class NavigatorMovieMixin:
             bg_guess = np.median(sub[sub < cut]) if np.any(sub < cut) else sub.min()
 
         # Perform a Gaussian fit on the current frame.
-        fitted_center, fitted_sigma, intensity, peak, bkgr = perform_gaussian_fit(frame_image, (x_orig, y_orig), search_crop_size, bg_fixed=bg_guess, pixelsize = self.pixel_size)
+        fitted_center, fitted_sigma, intensity, peak, bkgr = self.cached_gaussian_fit(frame_idx, (x_orig, y_orig), search_crop_size, bg_fixed=bg_guess, frame_image=frame_image)
 
         if not getattr(self, "hide_inset", False):
             self.zoomInsetFrame.setVisible(True)
@@ -517,7 +526,7 @@ class NavigatorMovieMixin:
                     # On double-click, now finalize the ROI (after adding the current click)
                     self.kymoCanvas.manual_zoom = False
                     self.movieCanvas.clear_temporary_roi_markers()
-                    self.movieCanvas.finalize_roi()
+                    self.movieCanvas.finalize_roi(stream=True)
             return
         
         else:
@@ -152,55 +152,44 @@ class NavigatorRoiMixin:
             )
             return
 
-        progress = QProgressDialog("Generating kymographs…", "Cancel", 0, len(unique_rois), self)
-        progress.setWindowModality(Qt.WindowModal)
-        progress.setMinimumDuration(0)
-        progress.show()
-
-        # 2) for each ROI dict...
-        for idx, roi in enumerate(unique_rois):
-            progress.setValue(idx)
-            QApplication.processEvents()
-            if progress.wasCanceled():
-                break
-
-            # 2a) find its name key in self.rois
-            roi_name = None
-            for name, roi_data in self.rois.items():
-                if roi_data is roi:
-                    roi_name = name
-                    break
-
-            # 2b) pick channel from the first matching trajectory
+        # 2) for each ROI dict, register it (kymographs come after, in one
+        #    pass over the movie for all of them)
+        new_rois = {}
+        for roi in unique_rois:
+            # 2a) pick channel from the first matching trajectory
             channel = None
             for traj in self.trajectoryCanvas.trajectories:
                 if traj.get("roi") is roi and traj.get("channel") is not None:
                     channel = traj["channel"]
                     break
 
-
             if channel is not None:
                 self._select_channel(channel)
 
-            # 2c) replay the ROI
+            # 2b) replay the ROI
             self.movieCanvas.roiPoints = roi["points"]
-            self.movieCanvas.finalize_roi(suppress_display=True)
-
-        progress.setValue(len(unique_rois))
-        progress.close()
-
-        self._last_roi = None
-        self.kymoCanvas.manual_zoom = False
-        self.update_kymo_list_for_channel()
-        if self.kymoCombo.count() > 0:
-            self.kymoCombo.blockSignals(True)
-            self.kymoCombo.setCurrentIndex(0)
-            self.kymoCombo.blockSignals(False)
-            self.kymo_changed()
-        self.update_kymo_visibility()
-
-        self.kymoCanvas.draw_trajectories_on_kymo()
-        self.kymoCanvas.draw_idle()
+            name = self.movieCanvas.finalize_roi(suppress_display=True, build_kymographs=False)
+            if name is not None:
+                new_rois[name] = self.rois[name]
+
+        def refresh(stored=True):
+            if not stored:
+                self.register_orphaned_kymographs(new_rois)
+            self._last_roi = None
+            self.kymoCanvas.manual_zoom = False
+            self.update_kymo_list_for_channel()
+            if self.kymoCombo.count() > 0:
+                self.kymoCombo.blockSignals(True)
+                self.kymoCombo.setCurrentIndex(0)
+                self.kymoCombo.blockSignals(False)
+                self.kymo_changed()
+            self.update_kymo_visibility()
+
+            self.kymoCanvas.draw_trajectories_on_kymo()
+            self.kymoCanvas.draw_idle()
+
+        # 3) all kymographs in a background worker
+        self.build_kymographs_in_background(new_rois, on_done=refresh)
 
     def compute_kymo_x_from_roi(self, roi, x_orig, y_orig, kymo_width):
         if x_orig is None:
@@ -1689,10 +1689,10 @@ class NavigatorUiMixin:
 
         else:
             # ---- re-analysis: Gaussian fit + recalc colocalization ----
-            fitted, sigma, intensity, peak, bkgr = perform_gaussian_fit(
-                frame_image, search_ctr, crop_size,
-                pixelsize=self.pixel_size,
-                bg_fixed=self.analysis_background[idx]
+            fitted, sigma, intensity, peak, bkgr = self.cached_gaussian_fit(
+                frame, search_ctr, crop_size,
+                bg_fixed=self.analysis_background[idx],
+                frame_image=frame_image
             )
             self.analysis_fit_params[idx] = (fitted, sigma, peak)
             self.analysis_intensities[idx] = intensity
@@ -2025,6 +2025,11 @@ class NavigatorUiMixin:
         self.channelAxisAction = channelAxisAction
         movieMenu.addAction(channelAxisAction)
 
+        if getattr(self, "debug_mode", False):
+            frameCacheStatsAction = QAction("Frame cache stats", self)
+            frameCacheStatsAction.triggered.connect(self.show_frame_cache_stats)
+            movieMenu.addAction(frameCacheStatsAction)
+
         self.spotMenu = menubar.addMenu("Spot")
         searchRadiusAction = QAction("Search Radius", self)
         searchRadiusAction.triggered.connect(self.set_search_radius)
@@ -2042,6 +2047,13 @@ class NavigatorUiMixin:
         self._apply_checkable_action_style(avoidOldSpotsAction)
         self.spotMenu.addAction(avoidOldSpotsAction)
 
+        parallelFitAction = QAction("Parallel fitting", self, checkable=True)
+        parallelFitAction.setChecked(False)
+        parallelFitAction.setStatusTip("Spread long trajectories over a pool of worker processes")
+        parallelFitAction.toggled.connect(lambda checked: setattr(self, "parallel_fitting", checked))
+        self._apply_checkable_action_style(parallelFitAction)
+        self.spotMenu.addAction(parallelFitAction)
+
         kymoMenu = menubar.addMenu("Kymograph")
 
         kymopreferencesAction = QAction("Line options", self)
@@ -2052,6 +2064,10 @@ class NavigatorUiMixin:
         kymoGenerateFromTrajAction.triggered.connect(self.generate_rois_from_trajectories)
         kymoMenu.addAction(kymoGenerateFromTrajAction)
 
+        kymoBatchFindAction = QAction("Find in all kymographs", self)
+        kymoBatchFindAction.triggered.connect(self.on_batch_autopick_clicked)
+        kymoMenu.addAction(kymoBatchFindAction)
+
         connectgapsAction = QAction("Connect spot gaps", self, checkable=True)
         connectgapsAction.setChecked(False)
         connectgapsAction.toggled.connect(self.on_connect_spot_gaps_toggled)
@@ -2298,8 +2314,12 @@ class NavigatorUiMixin:
         dialog = KymoLineOptionsDialog(current_line_width, current_method, self)
         if dialog.exec_() == QDialog.Accepted:
             line_width, method = dialog.getValues()
+            changed = (line_width != current_line_width
+                       or str(method).lower() != str(current_method).lower())
             self.line_width = line_width
             self.line_integration_method = method
+            if changed:
+                self.apply_kymo_line_settings()
 
     def set_search_radius(self):
         current_radius = self.searchWindowSpin.value()
@@ -2333,7 +2353,7 @@ class NavigatorUiMixin:
 
     def set_tracking_mode(self):
         current_mode = getattr(self, "tracking_mode", "Independent")
-        options = ["Independent", "Tracked", "Smooth"] #, "Same center"
+        options = ["Independent", "Tracked", "Smooth", "Fast"] #, "Same center"
 
         dialog = QInputDialog(self)
         dialog.setWindowTitle("Set Tracking Mode")
@@ -1,6 +1,19 @@
 """Analysis and geometry helper tools for Tracy."""
 
-from .gaussian_tools import perform_gaussian_fit, filterX, find_minima, find_maxima
+from .gaussian_tools import (
+    perform_gaussian_fit,
+    perform_gaussian_fit_batch,
+    fit_gaussian_stack,
+    perform_fast_localization,
+    perform_fast_localization_batch,
+    fast_gaussian_estimate,
+    radial_symmetry_center,
+    weighted_centroid,
+    filterX,
+    filterX_batch,
+    find_minima,
+    find_maxima,
+)
 from .roi_tools import (
     compute_roi_point,
     is_point_near_roi,
@@ -9,9 +22,42 @@ from .roi_tools import (
     generate_multipoint_roi_bytes,
 )
 from .track_tools import calculate_velocities
+from .fit_cache import FitCache
+from .frame_cache import FrameCache
+from .frame_prefetch import FramePrefetcher
+from .kymo_tools import (
+    roi_sampling_geometry,
+    reduce_normal,
+    bilinear_operator,
+    KymoSampler,
+    KymoSampleCache,
+    batch_kymographs,
+)
+from .drift_tools import PhaseCorrelator, estimate_drift
+from .parallel_fit import ParallelFitter
+from .msd_tools import (
+    pack_tracks,
+    msd_fft,
+    fit_power_law,
+    diffusion_for_tracks,
+    ensemble_diffusion,
+)
+from .trajectory_store import TrajectoryStore, TrajectoryRecord, PointColumn, point_array
+from .spatial_index import FrameSpatialIndex
+from .movie_backend import LazyTiffMovie, CopyOnWriteMovie, open_movie, max_projection
+from .movie_writer import write_movie
+from .autopick_model import AutoPickModel, get_autopick_model
 __all__ = [
     "perform_gaussian_fit",
+    "perform_gaussian_fit_batch",
+    "fit_gaussian_stack",
+    "perform_fast_localization",
+    "perform_fast_localization_batch",
+    "fast_gaussian_estimate",
+    "radial_symmetry_center",
+    "weighted_centroid",
     "filterX",
+    "filterX_batch",
     "find_minima",
     "find_maxima",
     "compute_roi_point",
@@ -20,4 +66,33 @@ __all__ = [
     "parse_roi_blob",
     "generate_multipoint_roi_bytes",
     "calculate_velocities",
+    "FitCache",
+    "FrameCache",
+    "FramePrefetcher",
+    "roi_sampling_geometry",
+    "reduce_normal",
+    "bilinear_operator",
+    "KymoSampler",
+    "KymoSampleCache",
+    "batch_kymographs",
+    "PhaseCorrelator",
+    "estimate_drift",
+    "ParallelFitter",
+    "pack_tracks",
+    "msd_fft",
+    "fit_power_law",
+    "diffusion_for_tracks",
+    "ensemble_diffusion",
+    "TrajectoryStore",
+    "TrajectoryRecord",
+    "PointColumn",
+    "point_array",
+    "FrameSpatialIndex",
+    "LazyTiffMovie",
+    "CopyOnWriteMovie",
+    "open_movie",
+    "max_projection",
+    "write_movie",
+    "AutoPickModel",
+    "get_autopick_model",
 ]
@@ -0,0 +1,409 @@
+"""
+Shared ONNX Runtime sessions for auto-pick. Creating an InferenceSession
+(loading and optimizing the graph) takes seconds, so there is one session per
+model file and thread configuration, created on first use and reused by every
+auto-pick run, single or batch. InferenceSession.run is thread-safe, so one
+session can serve several worker threads.
+The optimized graph is saved to a cache directory the first time, so later
+launches load it without optimizing again, and preload() builds and warms
+the session on a background thread before the first click.
+"""
+
+import hashlib
+import inspect
+import os
+import sys
+import threading
+import warnings
+
+import numpy as np
+
+# dummy input for warm-up: a typical kymograph (frames x positions)
+WARMUP_SHAPE = (512, 128)
+
+# kymographs longer than TILE_FRAMES are inferred in overlapping time tiles
+TILE_FRAMES = 2048
+TILE_OVERLAP = 128
+# when kymo_autopick cannot take a shared session, every tile builds its own;
+# tile only kymographs above this many pixels, and in tiles this large
+SESSIONLESS_TILE_PIXELS = 2**23
+
+_models = {}
+_models_lock = threading.Lock()
+
+def _infer_function():
+    from kymo_autopick.infer_onnx import infer_prob_move_and_embeddings_onnx
+    return infer_prob_move_and_embeddings_onnx
+
+def default_cache_dir():
+    """
+    Directory for optimized models (TRACY_ONNX_CACHE_DIR, else the user's
+    cache directory), or None if it cannot be written.
+    """
+    path = os.environ.get("TRACY_ONNX_CACHE_DIR", "").strip()
+    if not path:
+        home = os.path.expanduser("~")
+        if sys.platform == "darwin":
+            base = os.path.join(home, "Library", "Caches", "Tracy")
+        elif sys.platform.startswith("win"):
+            base = os.path.join(os.environ.get("LOCALAPPDATA") or home, "Tracy")
+        else:
+            base = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache"), "tracy")
+        path = os.path.join(base, "onnx")
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        return None
+    return path if os.access(path, os.W_OK) else None
+
+def tile_starts(n_frames, tile, overlap):
+    """
+    Start frames of tiles of `tile` frames overlapping by `overlap` that
+    cover n_frames; the last tile ends on the last frame.
+    """
+    if n_frames <= tile:
+        return [0]
+    step = max(1, tile - overlap)
+    starts = list(range(0, n_frames - tile, step))
+    starts.append(n_frames - tile)
+    return starts
+
+def _tile_weights(length, overlap, ramp_start, ramp_end):
+    # linear ramps over the overlaps, so neighbouring tiles cross-fade
+    w = np.ones(length, dtype=np.float32)
+    if overlap > 0:
+        ramp = (np.arange(overlap, dtype=np.float32) + 0.5) / overlap
+        if ramp_start:
+            w[:overlap] = np.minimum(w[:overlap], ramp)
+        if ramp_end:
+            w[length - overlap:] = np.minimum(w[length - overlap:], ramp[::-1])
+    return w
+
+def _time_axis(arr, n_t, n_x):
+    # axis i with arr.shape[i:i+2] == (n_t, n_x): (T, X), (T, X, D), (D, T, X)
+    for i in range(arr.ndim - 1):
+        if arr.shape[i] == n_t and arr.shape[i + 1] == n_x:
+            return i
+    raise ValueError(f"Model output of shape {arr.shape} does not match the {n_t}x{n_x} input")
+
+class _TileBlender:
+    """
+    Weighted sum of tile outputs along their time axis; normalized by the
+    summed weights at the end. Unit-length embeddings stay unit length.
+    """
+
+    def __init__(self, n_frames, n_x):
+        self.n_frames = n_frames
+        self.n_x = n_x
+        self.acc = None
+        self.weight = np.zeros(n_frames, dtype=np.float32)
+        self.axis = None
+        self.unit_norm = True
+
+    def add(self, out, start, w, count_weight):
+        out = np.asarray(out, dtype=np.float32)
+        axis = _time_axis(out, len(w), self.n_x)
+        if self.acc is None:
+            shape = list(out.shape)
+            shape[axis] = self.n_frames
+            self.acc = np.zeros(shape, dtype=np.float32)
+            self.axis = axis
+        if out.ndim == 3 and self.unit_norm:
+            feat_axis = 2 if axis == 0 else 0
+            norms = np.linalg.norm(out, axis=feat_axis)
+            self.unit_norm = bool(np.allclose(norms, 1.0, atol=1e-3))
+        shape = [1] * out.ndim
+        shape[axis] = len(w)
+        index = [slice(None)] * out.ndim
+        index[axis] = slice(start, start + len(w))
+        self.acc[tuple(index)] += out * w.reshape(shape)
+        if count_weight:
+            self.weight[start:start + len(w)] += w
+
+    def result(self, weight):
+        shape = [1] * self.acc.ndim
+        shape[self.axis] = self.n_frames
+        out = self.acc / np.maximum(weight, 1e-12).reshape(shape)
+        if out.ndim == 3 and self.unit_norm:
+            feat_axis = 2 if self.axis == 0 else 0
+            out /= np.maximum(np.linalg.norm(out, axis=feat_axis, keepdims=True), 1e-12)
+        return out
+
+_warned_session_per_tile = False
+
+def _warn_session_per_tile():
+    global _warned_session_per_tile
+    if not _warned_session_per_tile:
+        _warned_session_per_tile = True
+        warnings.warn(
+            "kymo_autopick does not accept a shared session; tiled auto-pick "
+            "builds an ONNX session per tile. Update kymo_autopick to avoid this.",
+            RuntimeWarning,
+        )
+
+def _accepts_session(fn):
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return "session" in params or any(p.kind == p.VAR_KEYWORD for p in params.values())
+
+class AutoPickModel:
+    """
+    One auto-pick model with a lazily created, shared InferenceSession.
+    - intra_op_threads: threads used inside an operator (0: all cores)
+    - inter_op_threads: threads running independent operators in parallel
+      (0: sequential execution)
+    infer(kymo) returns (prob_move, embedding_map) like
+    kymo_autopick.infer_onnx.infer_prob_move_and_embeddings_onnx.
+    """
+
+    def __init__(self, onnx_path, intra_op_threads=0, inter_op_threads=0, cache_dir=False):
+        self.onnx_path = str(onnx_path)
+        self.intra_op_threads = int(intra_op_threads or 0)
+        self.inter_op_threads = int(inter_op_threads or 0)
+        # False: default_cache_dir(); None: no optimized-model cache
+        self.cache_dir = default_cache_dir() if cache_dir is False else cache_dir
+        self._session = None
+        self._lock = threading.Lock()
+        self._warm_thread = None
+        self.warm = False
+
+    def session_options(self):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        if self.intra_op_threads > 0:
+            opts.intra_op_num_threads = self.intra_op_threads
+        if self.inter_op_threads > 0:
+            opts.inter_op_num_threads = self.inter_op_threads
+            opts.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        return opts
+
+    def optimized_model_path(self):
+        """
+        Cache file for the optimized graph of this model file, onnxruntime
+        version and execution providers (None without a cache directory).
+        """
+        if not self.cache_dir:
+            return None
+        import onnxruntime as ort
+
+        try:
+            st = os.stat(self.onnx_path)
+        except OSError:
+            return None
+        ident = "|".join(str(v) for v in (
+            os.path.abspath(self.onnx_path), st.st_size, st.st_mtime_ns,
+            ort.__version__, ",".join(ort.get_available_providers()),
+        ))
+        digest = hashlib.sha1(ident.encode("utf-8")).hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(self.onnx_path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{digest}.opt.onnx")
+
+    def _create_session(self):
+        import onnxruntime as ort
+
+        providers = ort.get_available_providers()
+        opts = self.session_options()
+        cached = self.optimized_model_path()
+        if cached and os.path.exists(cached):
+            # the saved graph has the extended optimizations already; loading
+            # it with ORT_ENABLE_ALL only adds the cheap, CPU specific layout
+            # passes
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            try:
+                return ort.InferenceSession(cached, sess_options=opts, providers=providers)
+            except Exception:
+                # stale or truncated cache file: rebuild it below
+                try:
+                    os.remove(cached)
+                except OSError:
+                    pass
+                opts = self.session_options()
+        tmp = None
+        if cached:
+            # only the portable (extended) optimizations go into the saved
+            # graph; the layout ones of ORT_ENABLE_ALL are CPU specific
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+            tmp = f"{cached}.{os.getpid()}.tmp"
+            opts.optimized_model_filepath = tmp
+        session = ort.InferenceSession(self.onnx_path, sess_options=opts, providers=providers)
+        if tmp is not None:
+            try:
+                os.replace(tmp, cached)
+            except OSError:
+                return session
+            # run on the fully optimized graph from the first launch on
+            opts = self.session_options()
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            try:
+                session = ort.InferenceSession(cached, sess_options=opts, providers=providers)
+            except Exception:
+                pass
+        return session
+
+    @property
+    def loaded(self):
+        return self._session is not None
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    @property
+    def shares_session(self):
+        """
+        True if kymo_autopick can run on this model's session; older versions
+        build their own session from the path on every call.
+        """
+        return _accepts_session(_infer_function())
+
+    def warm_up(self, shape=WARMUP_SHAPE):
+        """
+        Build the session and run one dummy inference, so the first real run
+        pays neither session creation nor first-run allocations. When the
+        session cannot be shared, only onnxruntime is imported: a session
+        built here would never be used.
+        """
+        if not self.shares_session:
+            import onnxruntime  # noqa: F401
+            return
+        self.session
+        if self.warm:
+            return
+        rng = np.random.default_rng(0)
+        dummy = rng.integers(90, 110, size=shape).astype(np.uint16)
+        self.infer(dummy)
+        self.warm = True
+
+    def preload(self, shape=WARMUP_SHAPE, on_error=None):
+        """
+        warm_up() on a daemon thread; errors go to on_error(exc) (the first
+        real run reports them again otherwise).
+        """
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            return self._warm_thread
+
+        def run():
+            try:
+                self.warm_up(shape)
+            except Exception as exc:
+                if on_error is not None:
+                    on_error(exc)
+
+        self._warm_thread = threading.Thread(target=run, name="autopick-preload", daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def infer(self, kymo):
+        fn = _infer_function()
+        if _accepts_session(fn):
+            return fn(kymo, self.onnx_path, time_axis="y", session=self.session)
+        # older kymo_autopick: it builds its own session from the path
+        return fn(kymo, self.onnx_path, time_axis="y")
+
+    def infer_tiled(self, kymo, tile=TILE_FRAMES, overlap=TILE_OVERLAP, max_workers=None,
+                    is_canceled=None):
+        """
+        infer() on overlapping tiles of `tile` frames along the time axis
+        (rows), cross-faded over `overlap` frames, so peak memory is bounded
+        by the tile size, not the kymograph length. Tiles run on max_workers
+        threads (None: as many as the cores allow with intra_op_threads
+        each; 1 when the session already uses all cores). Without a shared
+        session (older kymo_autopick), only kymographs over
+        SESSIONLESS_TILE_PIXELS are tiled.
+        Returns (prob_move, embedding_map), or None if is_canceled() became
+        True.
+        """
+        kymo = np.asarray(kymo)
+        n_frames, n_x = kymo.shape[:2]
+        tile = max(1, int(tile))
+        if not self.shares_session:
+            # every tile would build a session: tile only what is too big to
+            # run whole, in the largest tiles allowed, one at a time
+            if n_frames * n_x <= SESSIONLESS_TILE_PIXELS:
+                return self.infer(kymo)
+            tile = max(tile, SESSIONLESS_TILE_PIXELS // max(1, n_x))
+            max_workers = 1
+            if n_frames > tile:
+                _warn_session_per_tile()
+        if n_frames <= tile:
+            return self.infer(kymo)
+        overlap = int(np.clip(overlap, 0, tile // 2))
+        starts = tile_starts(n_frames, tile, overlap)
+        if max_workers is None:
+            cores = os.cpu_count() or 1
+            max_workers = max(1, cores // self.intra_op_threads) if self.intra_op_threads > 0 else 1
+        max_workers = max(1, min(int(max_workers), len(starts)))
+
+        prob = _TileBlender(n_frames, n_x)
+        emb = _TileBlender(n_frames, n_x)
+        has_emb = True
+
+        def run(i):
+            if is_canceled is not None and is_canceled():
+                return i, None
+            start = starts[i]
+            return i, self.infer(kymo[start:start + tile])
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # at most max_workers tiles are in flight, so at most that many
+            # tile outputs exist before they are blended in
+            pending = set()
+            next_tile = 0
+            while next_tile < len(starts) or pending:
+                while next_tile < len(starts) and len(pending) < max_workers:
+                    pending.add(pool.submit(run, next_tile))
+                    next_tile += 1
+                done = next(as_completed(pending))
+                pending.discard(done)
+                i, out = done.result()
+                if out is None:
+                    for fut in pending:
+                        fut.cancel()
+                    return None
+                w = _tile_weights(tile, overlap, i > 0, i < len(starts) - 1)
+                prob_t, emb_t = out
+                prob.add(prob_t, starts[i], w, True)
+                if emb_t is None:
+                    has_emb = False
+                elif has_emb:
+                    emb.add(emb_t, starts[i], w, False)
+        return prob.result(prob.weight), (emb.result(prob.weight) if has_emb else None)
+
+    def close(self):
+        with self._lock:
+            self._session = None
+            self.warm = False
+
+def get_autopick_model(onnx_path, intra_op_threads=0, inter_op_threads=0):
+    """
+    The shared AutoPickModel for a model file and thread configuration;
+    replacing the file on disk gives a fresh session.
+    """
+    path = os.path.abspath(os.path.expanduser(str(onnx_path)))
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    key = (path, mtime, int(intra_op_threads or 0), int(inter_op_threads or 0))
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            # sessions of an older version of the file are dropped
+            for old in [k for k in _models if k[0] == path and k[1] != mtime]:
+                _models.pop(old).close()
+            model = _models[key] = AutoPickModel(path, intra_op_threads, inter_op_threads)
+        return model
+
+def release_autopick_models():
+    with _models_lock:
+        for model in _models.values():
+            model.close()
+        _models.clear()
@@ -0,0 +1,233 @@
+"""
+Drift estimation by FFT phase correlation. Every frame is registered to a
+reference image (the mean of the first N frames, or of the preceding window
+of N frames for a rolling reference) without picking a spot. Frames are read
+in chunks and their FFTs run on a thread pool; frames whose correlation peak
+is too weak can fall back to locating a reference spot, or are interpolated.
+Displacements are (dx, dy) of the frame content relative to the reference, so
+shifting a frame by (-dy, -dx) corrects it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import os
+
+import numpy as np
+
+from .kymo_tools import channel_plane
+
+# the window and filter only depend on the frame shape, so every correlator
+# of a run shares one copy (they are never written to)
+@lru_cache(maxsize=8)
+def _hann2d(shape):
+    return np.outer(np.hanning(shape[0]), np.hanning(shape[1]))
+
+@lru_cache(maxsize=8)
+def _lowpass(shape, sigma):
+    """
+    Gaussian weights over the rfft2 frequency grid; sigma is a fraction of the
+    Nyquist frequency (None: no filtering).
+    """
+    if not sigma:
+        return None
+    fy = np.fft.fftfreq(shape[0])[:, None]
+    fx = np.fft.rfftfreq(shape[1])[None, :]
+    return np.exp(-(fx**2 + fy**2) / (2 * (0.5 * sigma)**2))
+
+def _parabolic(c_minus, c0, c_plus):
+    denom = c_minus - 2*c0 + c_plus
+    with np.errstate(invalid='ignore', divide='ignore'):
+        off = np.where(denom < 0, 0.5 * (c_minus - c_plus) / denom, 0.0)
+    return np.clip(np.nan_to_num(off), -0.5, 0.5)
+
+class PhaseCorrelator:
+    """
+    Registers stacks of (H, W) frames against one reference image.
+    - lowpass: Gaussian low-pass on the cross-power spectrum (fraction of
+      Nyquist), which keeps single-molecule noise from dominating the peak
+    - max_shift: largest displacement searched, in pixels (None: any)
+    register() returns (shifts (n, 2) as (dx, dy), peak quality (n,)), the
+    quality being the peak height over the correlation's standard deviation.
+    """
+
+    def __init__(self, reference, lowpass=0.25, max_shift=None, workers=1):
+        from scipy import fft as sfft
+
+        self._fft = sfft
+        self.workers = max(1, int(workers))
+        reference = np.asarray(reference, dtype=np.float64)
+        self.shape = tuple(reference.shape)
+        self._window = _hann2d(self.shape)
+        self._filter = _lowpass(self.shape, lowpass)
+        self.max_shift = max_shift
+        self._ref = np.conj(self._spectrum(reference[None]))[0]
+
+    def _spectrum(self, frames):
+        frames = np.asarray(frames, dtype=np.float64)
+        frames = frames - frames.mean(axis=(-2, -1), keepdims=True)
+        return self._fft.rfft2(frames * self._window, axes=(-2, -1), workers=self.workers)
+
+    def register(self, frames):
+        cross = self._spectrum(frames) * self._ref
+        cross /= np.abs(cross) + 1e-12
+        if self._filter is not None:
+            cross *= self._filter
+        corr = self._fft.irfft2(cross, s=self.shape, axes=(-2, -1), workers=self.workers)
+        corr = np.fft.fftshift(corr, axes=(-2, -1))
+        h, w = self.shape
+        cy, cx = h // 2, w // 2
+        if self.max_shift is not None:
+            r = int(np.ceil(self.max_shift))
+            outside = np.ones((h, w), dtype=bool)
+            outside[max(0, cy - r):cy + r + 1, max(0, cx - r):cx + r + 1] = False
+            corr[:, outside] = -np.inf
+
+        n = corr.shape[0]
+        flat = corr.reshape(n, -1)
+        peak = flat.argmax(axis=1)
+        py, px = np.unravel_index(peak, (h, w))
+        idx = np.arange(n)
+        c0 = corr[idx, py, px]
+        dy = _parabolic(corr[idx, (py - 1) % h, px], c0, corr[idx, (py + 1) % h, px])
+        dx = _parabolic(corr[idx, py, (px - 1) % w], c0, corr[idx, py, (px + 1) % w])
+        finite = np.where(np.isfinite(flat), flat, np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            quality = (c0 - np.nanmean(finite, axis=1)) / np.nanstd(finite, axis=1)
+        shifts = np.column_stack((px - cx + dx, py - cy + dy))
+        return shifts, np.nan_to_num(quality)
+
+def _interpolate_gaps(disp, good):
+    """
+    Fill rows of disp where good is False by linear interpolation (edges hold
+    the nearest good value); all zero if nothing is good.
+    """
+    if good.all():
+        return disp
+    if not good.any():
+        return np.zeros_like(disp)
+    t = np.arange(disp.shape[0])
+    out = disp.copy()
+    for d in range(disp.shape[1]):
+        out[~good, d] = np.interp(t[~good], t[good], disp[good, d])
+    return out
+
+def estimate_drift(movie, channel=None, channel_axis=None, reference="first", ref_frames=10,
+                   chunk=64, lowpass=0.25, max_shift=None, min_quality=5.0,
+                   locate=None, spot=None, spot_frame=0,
+                   max_workers=None, progress=None, is_canceled=None):
+    """
+    Per-frame drift of `movie` by phase correlation.
+    - channel / channel_axis: channel registered in a 4D movie (channel_axis
+      counts the frame axis, as in movie.shape)
+    - reference: "first" registers every frame to the mean of the first
+      ref_frames frames; "rolling" registers each window of ref_frames frames
+      to the mean of the window before it and chains the window offsets, which
+      follows slowly changing samples (bleaching, focus)
+    - min_quality: frames with a weaker correlation peak are treated as
+      failed; with locate(frame_2d, (x, y)) -> (x, y) or None and the spot's
+      (x, y) on spot_frame they are found by tracking that spot instead,
+      otherwise they are interpolated from their neighbours
+    - progress(frames_done) is called from the calling thread; when
+      is_canceled() returns True, None is returned
+    Returns (displacements (n, 2) as (dx, dy) relative to the reference,
+    quality (n,)).
+    """
+    n = movie.shape[0]
+    if n == 0:
+        return np.zeros((0, 2)), np.zeros(0)
+    ref_frames = max(1, min(int(ref_frames), n))
+    chunk = max(1, int(chunk))
+    workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+
+    def read(start, stop):
+        return np.asarray(channel_plane(np.asarray(movie[start:stop]), channel, channel_axis), dtype=np.float64)
+
+    if reference == "rolling":
+        # window k is registered against the mean of window k-1 (window 0 to
+        # itself). A job reads a run of whole windows plus the window before
+        # it and builds each window's reference as it goes, so only the jobs
+        # in flight hold frames and correlators.
+        bounds = [(s, min(n, s + ref_frames)) for s in range(0, n, ref_frames)]
+        per_job = -(-chunk // ref_frames)
+        jobs = [(a, min(len(bounds), a + per_job)) for a in range(0, len(bounds), per_job)]
+
+        def run(job):
+            a, b = job
+            first = bounds[max(0, a - 1)][0]
+            frames = read(first, bounds[b - 1][1])
+            prev = frames[:bounds[a][0] - first].mean(axis=0) if a > 0 else None
+            sh, q = [], []
+            for ws, we in bounds[a:b]:
+                block = frames[ws - first:we - first]
+                mean = block.mean(axis=0)
+                corr = PhaseCorrelator(mean if prev is None else prev, lowpass=lowpass, max_shift=max_shift)
+                k_sh, k_q = corr.register(block)
+                sh.append(k_sh)
+                q.append(k_q)
+                prev = mean
+            return bounds[a][0], bounds[b - 1][1], np.concatenate(sh), np.concatenate(q)
+    else:
+        correlator = PhaseCorrelator(read(0, ref_frames).mean(axis=0), lowpass=lowpass, max_shift=max_shift)
+        jobs = [(s, min(n, s + chunk)) for s in range(0, n, chunk)]
+
+        def run(job):
+            s, e = job
+            sh, q = correlator.register(read(s, e))
+            return s, e, sh, q
+
+    shifts = np.zeros((n, 2))
+    quality = np.zeros(n)
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run, job) for job in jobs]
+        for fut in futures:
+            if is_canceled is not None and is_canceled():
+                for f in futures:
+                    f.cancel()
+                return None
+            s, e, sh, q = fut.result()
+            shifts[s:e] = sh
+            quality[s:e] = q
+            done += e - s
+            if progress is not None:
+                progress(done)
+
+    good = quality >= min_quality
+    if reference == "rolling":
+        # chain windows: a frame's drift is its offset to the previous
+        # window's mean image plus that window's own mean drift
+        disp = np.zeros_like(shifts)
+        prev_mean = np.zeros(2)
+        for k, (s, e) in enumerate(bounds):
+            disp[s:e] = shifts[s:e] + (prev_mean if k > 0 else 0.0)
+            ok = good[s:e]
+            prev_mean = (disp[s:e][ok] if ok.any() else disp[s:e]).mean(axis=0)
+    else:
+        disp = shifts
+
+    if not good.all() and locate is not None and spot is not None:
+        disp, good = _spot_fallback(movie, disp, good, locate, spot, spot_frame, channel, channel_axis)
+    return _interpolate_gaps(disp, good), quality
+
+def _spot_fallback(movie, disp, good, locate, spot, spot_frame, channel, channel_axis):
+    """
+    Locate the reference spot in the failed frames, starting from where the
+    drift so far predicts it; its offset from spot_frame gives the drift.
+    """
+    disp = disp.copy()
+    good = good.copy()
+    base = np.asarray(spot, dtype=float) - disp[spot_frame]
+    for i in np.flatnonzero(~good):
+        # predict from the nearest good frame before this one
+        before = np.flatnonzero(good[:i])
+        guess_disp = disp[before[-1]] if before.size else disp[i]
+        frame = channel_plane(np.asarray(movie[i:i + 1]), channel, channel_axis)[0]
+        try:
+            found = locate(np.asarray(frame), tuple(base + guess_disp))
+        except Exception:
+            found = None
+        if found is not None and all(np.isfinite(found)):
+            disp[i] = np.asarray(found, dtype=float) - base
+            good[i] = True
+    return disp, good
@@ -0,0 +1,100 @@
+"""
+Bounded LRU memo for spot-fit results, so the same (frame, center, settings)
+fit is not recomputed on every hover, re-add or recalculation.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# rough footprint of one entry (key tuple + 5-tuple result + dict slot)
+_ENTRY_BYTES = 640
+
+class FitCache:
+    """
+    Thread-safe LRU cache of fit results with a memory budget.
+    - max_bytes: approximate budget; the oldest entries are evicted beyond it
+    - quantum: centers are rounded to this many pixels before keying
+    hits / misses / evictions count lookups since the last clear().
+    """
+
+    def __init__(self, max_bytes=32 * 1024**2, quantum=1e-3):
+        self.max_bytes = int(max_bytes)
+        self.quantum = float(quantum)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_entries(self):
+        return max(1, self.max_bytes // _ENTRY_BYTES)
+
+    def make_key(self, movie_token, channel, frame, center, crop_size, **settings):
+        """
+        Build a hashable key. Floats in `settings` (bg_fixed, pixel size, …) are
+        rounded so tiny representation noise does not cause misses.
+        Returns None for centers that cannot be keyed (None / NaN).
+        """
+        if center is None or any(c is None or not np.isfinite(c) for c in center):
+            return None
+        q = self.quantum
+        cx = int(round(float(center[0]) / q))
+        cy = int(round(float(center[1]) / q))
+        extra = []
+        for name in sorted(settings):
+            v = settings[name]
+            if isinstance(v, (float, np.floating)):
+                v = round(float(v), 6)
+            elif isinstance(v, np.integer):
+                v = int(v)
+            extra.append((name, v))
+        return (movie_token, channel, int(frame), cx, cy, int(crop_size), tuple(extra))
+
+    def lookup(self, key):
+        """
+        Return (found, value), counting the hit or miss.
+        """
+        with self._lock:
+            if key is not None and key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def store(self, key, value):
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            limit = self.max_entries
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "approx_bytes": len(self._entries) * _ENTRY_BYTES,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
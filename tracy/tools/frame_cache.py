@@ -0,0 +1,142 @@
+"""
+Bounded LRU cache of decoded movie frames for get_movie_frame, so scrubbing
+through a long movie no longer keeps every visited frame in RAM until the next
+movie is loaded.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 1024**3
+
+def _frame_of(key):
+    # keys are frame_idx (3D movies) or (frame_idx, channel, channel_axis)
+    return int(key[0]) if isinstance(key, tuple) else int(key)
+
+def _frame_bytes(frame):
+    return int(getattr(frame, "nbytes", 0) or np.asarray(frame).nbytes)
+
+class FrameCache:
+    """
+    Thread-safe LRU cache of frames with a byte budget.
+    - max_bytes: budget for the cached arrays; least recently used frames are
+      evicted beyond it
+    - pinned frames (see pin()) are never evicted, so the frame on screen and
+      its neighbours survive a burst of far-away reads
+    hits / misses / evictions count lookups since the last clear().
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()   # key -> (frame, nbytes)
+        self._pinned = frozenset()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key):
+        """
+        Return (found, frame), counting the hit or miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def store(self, key, frame):
+        if frame is None:
+            return
+        size = _frame_bytes(frame)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes_used -= old[1]
+            self._entries[key] = (frame, size)
+            self.bytes_used += size
+            self._evict()
+
+    def _evict(self):
+        if self.bytes_used <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self.bytes_used <= self.max_bytes:
+                break
+            if _frame_of(key) in self._pinned:
+                continue
+            _, size = self._entries.pop(key)
+            self.bytes_used -= size
+            self.evictions += 1
+
+    def pin(self, frames):
+        """
+        Protect the given frame indices (every channel) from eviction; replaces
+        the previous pin set.
+        """
+        with self._lock:
+            self._pinned = frozenset(int(f) for f in frames)
+            self._evict()
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            self._evict()
+
+    def get(self, key, default=None):
+        found, frame = self.lookup(key)
+        return frame if found else default
+
+    def __contains__(self, key):
+        # no LRU bump and no hit / miss counting
+        with self._lock:
+            return key in self._entries
+
+    def __getitem__(self, key):
+        found, frame = self.lookup(key)
+        if not found:
+            raise KeyError(key)
+        return frame
+
+    def __setitem__(self, key, frame):
+        self.store(key, frame)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.bytes_used -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pinned = frozenset()
+            self.bytes_used = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes_used,
+                "max_bytes": self.max_bytes,
+                "pinned": len(self._pinned),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
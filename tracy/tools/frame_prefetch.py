@@ -0,0 +1,68 @@
+"""
+Background frame prefetch: while a movie is scrubbed or played back, the
+frames expected next are decoded on a worker thread so the UI thread finds
+them in the frame cache instead of waiting on disk / decompression.
+"""
+
+import threading
+
+class FramePrefetcher:
+    """
+    Single daemon thread that runs `load(job)` for queued jobs, oldest first.
+    - request(jobs) replaces the queue: only the newest prediction matters,
+      and at most `lookahead` jobs are kept
+    - cancel() drops the queue and waits for the job in progress, so nothing
+      is stored after the caller swaps the movie or clears the cache
+    `load` does the decoding and caching itself; its exceptions are ignored.
+    """
+
+    def __init__(self, load, lookahead=8):
+        self._load = load
+        self.lookahead = max(0, int(lookahead))
+        self._pending = []
+        self._cond = threading.Condition()
+        self._job_lock = threading.Lock()
+        self._stopped = False
+        self.loaded = 0
+        self._thread = threading.Thread(target=self._run, name="tracy-frame-prefetch", daemon=True)
+        self._thread.start()
+
+    def request(self, jobs):
+        jobs = list(jobs)[:self.lookahead]
+        with self._cond:
+            self._pending = jobs
+            if jobs:
+                self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self._pending = []
+        # let the job in progress finish
+        with self._job_lock:
+            pass
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._pending = []
+            self._cond.notify()
+        self._thread.join(timeout=2.0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                job = self._pending.pop(0)
+                # take the job lock before releasing the queue lock, so
+                # cancel() cannot slip in between
+                self._job_lock.acquire()
+            try:
+                if self._load(job):
+                    self.loaded += 1
+            except Exception:
+                pass
+            finally:
+                self._job_lock.release()
@@ -1,5 +1,7 @@
 """
-Holds the 2D Gaussian fitting function used by curve_fit.
+Holds the 2D Gaussian fitting function used by curve_fit, plus a batched
+NumPy solver for fitting many crops (e.g. a whole trajectory) at once, and a
+non-iterative localizer (radial symmetry + closed-form amplitude) for fast passes.
 """
 
 import numpy as np
@@ -18,160 +20,270 @@ def gaussian2d_flat(coords, A, x0, y0, sigma_x, sigma_y, offset):
     )) + offset
     return g.ravel()
 
+def _gaussian_jacobian(A, dx, dy, ex, sigma_x, sigma_y, with_offset=True):
+    """
+    Analytic derivatives of gaussian2d_flat with respect to
+    [A, x0, y0, sigma_x, sigma_y(, offset)], stacked on the last axis.
+    dx, dy and ex are x - x0, y - y0 and the exponential term of the model;
+    parameters broadcast, so this serves single fits and stacks alike.
+    """
+    Aex = A*ex
+    sx2 = sigma_x*sigma_x
+    sy2 = sigma_y*sigma_y
+    cols = [
+        ex,
+        Aex*dx/sx2,
+        Aex*dy/sy2,
+        Aex*dx*dx/(sx2*sigma_x),
+        Aex*dy*dy/(sy2*sigma_y),
+    ]
+    if with_offset:
+        cols.append(np.ones_like(ex))
+    return np.stack(cols, axis=-1)
+
+class _FitContext:
+    """
+    Per-crop-size state shared by every fit of that size: pixel grids (2D and
+    flattened) and the center-weighted sigma array that down-weights pixels far
+    from the crop center.
+    """
+    def __init__(self, crop_size):
+        yi, xi = np.indices((crop_size, crop_size))
+        d2 = (xi - crop_size//2)**2 + (yi - crop_size//2)**2
+        w_sigma = crop_size/10.0
+        self.crop_size = crop_size
+        self.xi = xi
+        self.yi = yi
+        self.x = xi.ravel().astype(float)
+        self.y = yi.ravel().astype(float)
+        self.sigma_arr = 1.0/np.sqrt(np.exp(-d2/(2*w_sigma**2)) + 1e-6)
+        self.sigma_flat = self.sigma_arr.ravel()
+
+    def model_functions(self, bg_fixed=None):
+        """
+        Return (model, jac) for curve_fit: the 6-parameter model when bg_fixed
+        is None, else the 5-parameter model with the offset held at bg_fixed.
+        Both ignore the coords argument in favour of the cached grids, and jac
+        reuses the exponent computed by the last model call at the same point.
+        Build them once per fit; the exponent cache is not shared between fits.
+        """
+        x, y = self.x, self.y
+        last = {"key": None, "terms": None}
+
+        def terms(x0, y0, sx, sy):
+            key = (x0, y0, sx, sy)
+            if last["key"] != key:
+                dx = x - x0
+                dy = y - y0
+                ex = np.exp(-(dx*dx/(2*sx*sx) + dy*dy/(2*sy*sy)))
+                last["key"] = key
+                last["terms"] = (dx, dy, ex)
+            return last["terms"]
+
+        if bg_fixed is None:
+            def model(_coords, A, x0, y0, sx, sy, offset):
+                _, _, ex = terms(x0, y0, sx, sy)
+                return A*ex + offset
+
+            def jac(_coords, A, x0, y0, sx, sy, offset):
+                dx, dy, ex = terms(x0, y0, sx, sy)
+                return _gaussian_jacobian(A, dx, dy, ex, sx, sy, with_offset=True)
+        else:
+            def model(_coords, A, x0, y0, sx, sy):
+                _, _, ex = terms(x0, y0, sx, sy)
+                return A*ex + bg_fixed
+
+            def jac(_coords, A, x0, y0, sx, sy):
+                dx, dy, ex = terms(x0, y0, sx, sy)
+                return _gaussian_jacobian(A, dx, dy, ex, sx, sy, with_offset=False)
+        return model, jac
+
 _fit_cache = {}
 
+def _fit_context(crop_size):
+    """
+    Return the shared _FitContext for crop_size, building it on first use.
+    """
+    ctx = _fit_cache.get(crop_size)
+    if ctx is None:
+        ctx = _FitContext(crop_size)
+        _fit_cache[crop_size] = ctx
+    return ctx
+
+def _sigma_bounds(crop_size, pixelsize):
+    """
+    A Gaussian’s FWHM is related to its standard deviation σ by:
+    FWHM = 2 sqrt(2ln(2))*sigma
+    The leading factor of 2 enforces a minimum width of twice the PSF σ,
+    to guard against spuriously sharp fits that would be smaller than what optics can actually resolve
+    """
+    sigma_min = 1.0
+    if pixelsize is not None:
+        sigma_min = 2*(200/2.355)/pixelsize
+    sigma_max = crop_size/4.0
+    return sigma_min, sigma_max
+
+def _passes_snr_check(frame_image, center, crop_size):
+    """
+    Early SNR check on a minimal patch around `center`.
+    """
+    H, W = frame_image.shape
+    half = crop_size // 2
+    cx0, cy0 = center
+    x0, y0 = int(round(cx0)), int(round(cy0))
+    sub0 = frame_image[
+        max(0, y0-half):min(H, y0+half),
+        max(0, x0-half):min(W, x0+half)
+    ]
+    if sub0.size == 0 or (sub0.max() - np.median(sub0)) < 4 * sub0.std():
+        return False
+    return True
+
+def _prepare_fit_window(frame_image, center, crop_size, bg_fixed, sigma_min, sigma_max):
+    """
+    Crop (and pad at borders) a crop_size window around `center` and build the
+    initial guess and bounds for the fit.
+    Returns (sub, x1, y1, p0, lb, ub), or None if the window has no usable spot.
+    """
+    H, W = frame_image.shape
+    half = crop_size // 2
+    cx, cy = center
+    x1 = max(0, int(round(cx)) - half)
+    y1 = max(0, int(round(cy)) - half)
+    x2 = min(W, x1 + crop_size)
+    y2 = min(H, y1 + crop_size)
+
+    sub = frame_image[y1:y2, x1:x2]
+    if sub.shape[0] != crop_size or sub.shape[1] != crop_size:
+        # pad to full crop_size if at border
+        pad_y = crop_size - sub.shape[0]
+        pad_x = crop_size - sub.shape[1]
+        bg = bg_fixed if bg_fixed is not None else float(np.percentile(sub,20))
+        sub = np.pad(sub, ((0,pad_y),(0,pad_x)), mode='constant', constant_values=bg)
+
+    # compute border width = 25% of the smaller dimension (larger sampling region)
+    h_sub, w_sub = sub.shape
+    border_fraction = 0.25  # sample 20-30% of edges for background estimate
+    border = max(1, int(min(h_sub, w_sub) * border_fraction))
+
+    # extract the four edge strips
+    edges = np.concatenate([
+        sub[:border, :].ravel(),     # top
+        sub[-border:, :].ravel(),    # bottom
+        sub[:, :border].ravel(),     # left
+        sub[:, -border:].ravel()     # right
+    ])
+
+    # use the median of those border pixels as the background
+    bg_guess = float(np.median(edges))
+
+    A0 = float(sub.max() - bg_guess)
+    if A0 < 4*sub.std():
+        return None
+
+    # initial parameters and bounds
+    x0_guess = float(np.clip(cx - x1, 0, crop_size - 1))
+    y0_guess = float(np.clip(cy - y1, 0, crop_size - 1))
+    x0_min = max(0.0, x0_guess - 4.0)
+    x0_max = min(float(crop_size), x0_guess + 4.0)
+    y0_min = max(0.0, y0_guess - 4.0)
+    y0_max = min(float(crop_size), y0_guess + 4.0)
+    # parameters now: if bg_fixed is None → [A, x0, y0, sx, sy, off]
+    #                else           → [A, x0, y0, sx, sy]
+    if bg_fixed is None:
+        p0 = [A0, x0_guess, y0_guess,
+              crop_size/8, crop_size/8, bg_guess]
+        lb = [0, x0_min, y0_min, sigma_min, sigma_min, -np.inf]
+        ub = [np.inf, x0_max, y0_max, sigma_max, sigma_max, np.inf]
+    else:
+        p0 = [A0, x0_guess, y0_guess,
+              crop_size/8, crop_size/8]
+        lb = [0, x0_min, y0_min, sigma_min, sigma_min]
+        ub = [np.inf, x0_max, y0_max, sigma_max, sigma_max]
+    return sub, x1, y1, p0, lb, ub
+
+def _unpack_fit(popt, bg_fixed, x1, y1, crop_size):
+    """
+    Turn fitted parameters into (fitted_center, avg_sigma, intensity, peak, offset)
+    in full-image coordinates, or None for edge / bad fits.
+    """
+    if bg_fixed is None:
+        A, x0_fit, y0_fit, sx, sy, off = popt
+    else:
+        A, x0_fit, y0_fit, sx, sy = popt
+        off = bg_fixed
+
+    tol=4
+    # reject edge / bad fits
+    if not (tol < x0_fit < crop_size - tol and tol < y0_fit < crop_size - tol):
+        return None
+
+    # map back to full-image coords, compute intensity/peak…
+    fitted_center = (x1 + x0_fit, y1 + y0_fit)
+    avg_sig = 0.5*(sx + sy)
+    intensity = 2*np.pi * A * sx * sy
+    peak = A
+    return fitted_center, avg_sig, intensity, peak, off
+
 def perform_gaussian_fit(frame_image,
                          center,
                          crop_size,
                          pixelsize=None,
                          max_nfev=200,
                          iterations=2,
-                         bg_fixed=None):
+                         bg_fixed=None,
+                         warm_start=False):
     """
     Perform a 2D Gaussian fit on a subimage around `center`, then optionally recrop
     around the fitted center and refit for improved accuracy.
     This version caches xi, yi and sigma_arr per crop_size, and uses a percentile
     for background instead of a full histogram.
+    With warm_start, the initial center / σ come from fast_gaussian_estimate.
     """
     if center is None or any(c is None or np.isnan(c) for c in center):
         return (None, None, None, None, None)
-    # Early SNR check on a minimal patch
-    H, W = frame_image.shape
-    half = crop_size // 2
-    cx0, cy0 = center
-    x0, y0 = int(round(cx0)), int(round(cy0))
-    sub0 = frame_image[
-        max(0, y0-half):min(H, y0+half),
-        max(0, x0-half):min(W, x0+half)
-    ]
-    if sub0.size == 0 or (sub0.max() - np.median(sub0)) < 4 * sub0.std():
+    if not _passes_snr_check(frame_image, center, crop_size):
         return (None, None, None, None, None)
-    # Prepare min/max sigma
-    """
-    A Gaussian’s FWHM is related to its standard deviation σ by:
-    FWHM = 2 sqrt(2ln(2))*sigma
-    The leading factor of 2 enforces a minimum width of twice the PSF σ,
-    to guard against spuriously sharp fits that would be smaller than what optics can actually resolve
-    """
-    sigma_min = 1.0
-    if pixelsize is not None:
-        sigma_min = 2*(200/2.355)/pixelsize
-    sigma_max = crop_size/4.0
-
-    # Cache grids & sigma_arr keyed by crop_size
-    if crop_size not in _fit_cache:
-        yi, xi = np.indices((crop_size, crop_size))
-        d2 = (xi - crop_size//2)**2 + (yi - crop_size//2)**2
-        w_sigma = crop_size/10.0
-        sigma_arr = 1.0/np.sqrt(np.exp(-d2/(2*w_sigma**2)) + 1e-6)
-        _fit_cache[crop_size] = (xi, yi, sigma_arr)
 
-    xi_full, yi_full, sigma_arr_full = _fit_cache[crop_size]
+    sigma_min, sigma_max = _sigma_bounds(crop_size, pixelsize)
+    ctx = _fit_context(crop_size)
+    # one model/Jacobian pair per fit, shared by every refinement iteration
+    fit_func, fit_jac = ctx.model_functions(bg_fixed)
 
     fitted_center = center
     for it in range(iterations):
-        cx, cy = fitted_center
-        x1 = max(0, int(round(cx)) - half)
-        y1 = max(0, int(round(cy)) - half)
-        x2 = min(W, x1 + crop_size)
-        y2 = min(H, y1 + crop_size)
-
-        sub = frame_image[y1:y2, x1:x2]
-        if sub.shape[0] != crop_size or sub.shape[1] != crop_size:
-            # pad to full crop_size if at border
-            pad_y = crop_size - sub.shape[0]
-            pad_x = crop_size - sub.shape[1]
-            bg = bg_fixed if bg_fixed is not None else float(np.percentile(sub,20))
-            sub = np.pad(sub, ((0,pad_y),(0,pad_x)), mode='constant', constant_values=bg)
-
-        # compute border width = 25% of the smaller dimension (larger sampling region)
-        h_sub, w_sub = sub.shape
-        border_fraction = 0.25  # sample 20-30% of edges for background estimate
-        border = max(1, int(min(h_sub, w_sub) * border_fraction))
-
-        # extract the four edge strips
-        edges = np.concatenate([
-            sub[:border, :].ravel(),     # top
-            sub[-border:, :].ravel(),    # bottom
-            sub[:, :border].ravel(),     # left
-            sub[:, -border:].ravel()     # right
-        ])
-
-        # use the median of those border pixels as the background
-        bg_guess = float(np.median(edges))
-
-        A0 = float(sub.max() - bg_guess)
-        if A0 < 4*sub.std():
+        window = _prepare_fit_window(
+            frame_image, fitted_center, crop_size, bg_fixed, sigma_min, sigma_max
+        )
+        if window is None:
             return (None,)*5
-
-        # initial parameters and bounds
-        x0_guess = float(np.clip(cx - x1, 0, crop_size - 1))
-        y0_guess = float(np.clip(cy - y1, 0, crop_size - 1))
-        x0_min = max(0.0, x0_guess - 4.0)
-        x0_max = min(float(crop_size), x0_guess + 4.0)
-        y0_min = max(0.0, y0_guess - 4.0)
-        y0_max = min(float(crop_size), y0_guess + 4.0)
-        # parameters now: if bg_fixed is None → [A, x0, y0, sx, sy, off]
-        #                else           → [A, x0, y0, sx, sy]
-        if bg_fixed is None:
-            p0 = [A0, x0_guess, y0_guess,
-                  crop_size/8, crop_size/8, bg_guess]
-            lb = [0, x0_min, y0_min, sigma_min, sigma_min, -np.inf]
-            ub = [np.inf, x0_max, y0_max, sigma_max, sigma_max, np.inf]
-        else:
-            p0 = [A0, x0_guess, y0_guess,
-                  crop_size/8, crop_size/8]
-            lb = [0, x0_min, y0_min, sigma_min, sigma_min]
-            ub = [np.inf, x0_max, y0_max, sigma_max, sigma_max]
-
-        # choose which model function / fitting tuple to call
-        if bg_fixed is None:
-            fit_func = gaussian2d_flat  # expects 6 params
-            bounds = (lb, ub)
-        else:
-            # wrap a 5-parameter version:
-            def gaussian5_flat(xy, A, x0, y0, sx, sy):
-                return gaussian2d_flat(
-                    xy, A, x0, y0, sx, sy, bg_fixed
-                )
-            fit_func = gaussian5_flat
-            bounds = (lb, ub)
+        sub, x1, y1, p0, lb, ub = window
+        if warm_start:
+            p0 = _warm_start(sub, p0, lb, ub, bg_fixed)
 
         try:
             popt, _ = curve_fit(
                 fit_func,
-                (xi_full, yi_full),
+                (ctx.xi, ctx.yi),
                 sub.ravel(),
                 p0=p0,
-                bounds=bounds,
-                sigma=sigma_arr_full.ravel(),
+                bounds=(lb, ub),
+                sigma=ctx.sigma_flat,
+                jac=fit_jac,
                 max_nfev=max_nfev,
                 method='trf'
             )
         except Exception:
             return (None,)*5
 
-        # unpack the fit
-        if bg_fixed is None:
-            A, x0_fit, y0_fit, sx, sy, off = popt
-        else:
-            A, x0_fit, y0_fit, sx, sy = popt
-            off = bg_fixed
-
-        tol=4
-        # reject edge / bad fits
-        if not (tol < x0_fit < crop_size - tol and tol < y0_fit < crop_size - tol):
+        unpacked = _unpack_fit(popt, bg_fixed, x1, y1, crop_size)
+        if unpacked is None:
             return (None, None, None, None, None)
-        
-        # map back to full-image coords, compute intensity/peak…
-        fitted_center = (x1 + x0_fit, y1 + y0_fit)
-        avg_sig = 0.5*(sx + sy)
-        intensity = 2*np.pi * A * sx * sy
-        peak = A
+        fitted_center, avg_sig, intensity, peak, off = unpacked
 
         if it == iterations-1:
 
-            if A<4.0:
+            if peak<4.0:
                 return (None, None, None, None, None)
             
             return (fitted_center, avg_sig, float(intensity),
@@ -179,6 +291,446 @@ def perform_gaussian_fit(frame_image,
 
     return (None,)*5
 
+def fit_gaussian_stack(crops, p0, lb, ub, sigma=None, bg_fixed=None,
+                       max_nfev=200, ftol=1e-8, xtol=1e-8, bound_tol=1e-6):
+    """
+    Fit a 2D Gaussian to every crop in a stack with a vectorized, bound-constrained
+    Levenberg–Marquardt solver.
+    - crops: (N, C, C) array of square crops.
+    - p0, lb, ub: (N, K) initial guesses and bounds, K=6 ([A, x0, y0, sx, sy, off])
+      or K=5 when bg_fixed is given.
+    - sigma: optional (C, C) per-pixel uncertainty, as passed to curve_fit.
+    - bg_fixed: None, a scalar or an (N,) array of fixed offsets.
+    Returns (popt, ok): popt is (N, K), ok is a boolean (N,) mask of fits that
+    produced finite parameters.
+    """
+    crops = np.asarray(crops, dtype=float)
+    N, C = crops.shape[0], crops.shape[1]
+    p = np.array(p0, dtype=float, copy=True).reshape(N, -1)
+    lb = np.broadcast_to(np.asarray(lb, dtype=float), p.shape)
+    ub = np.broadcast_to(np.asarray(ub, dtype=float), p.shape)
+    K = p.shape[1]
+    if N == 0:
+        return p, np.zeros(0, dtype=bool)
+    p = np.clip(p, lb, ub)
+
+    ctx = _fit_context(C)
+    x, y = ctx.x, ctx.y
+    data = crops.reshape(N, -1)
+    w = np.ones_like(x) if sigma is None else 1.0/np.asarray(sigma, dtype=float).ravel()
+    if bg_fixed is None:
+        offsets = None
+    else:
+        offsets = np.broadcast_to(np.asarray(bg_fixed, dtype=float), (N,))
+
+    def residuals_and_jacobian(params, rows, with_jac=True):
+        A, x0, y0, sx, sy = (params[:, k:k+1] for k in range(5))
+        off = params[:, 5:6] if offsets is None else offsets[rows, None]
+        dx = x[None, :] - x0
+        dy = y[None, :] - y0
+        ex = np.exp(-(dx*dx/(2*sx*sx) + dy*dy/(2*sy*sy)))
+        r = (A*ex + off - data[rows]) * w
+        if not with_jac:
+            return r, None
+        J = _gaussian_jacobian(A, dx, dy, ex, sx, sy, with_offset=offsets is None)
+        J *= w[None, :, None]
+        return r, J
+
+    lam = np.full(N, 0.1)
+    active = np.arange(N)
+    r, J = residuals_and_jacobian(p, active)
+    cost = np.einsum('np,np->n', r, r)
+    ok = np.isfinite(cost)
+    active = active[ok]
+    r, J = r[ok], J[ok]
+    eye = np.eye(K)
+
+    for _ in range(max_nfev):
+        if active.size == 0:
+            break
+        Jt = J.transpose(0, 2, 1)
+        JtJ = Jt @ J
+        Jtr = (Jt @ r[..., None])[..., 0]
+        # freeze parameters pinned at a bound whose gradient points outward
+        p_cur = p[active]
+        lo, hi = lb[active], ub[active]
+        at_lo = np.isfinite(lo) & (p_cur - lo <= bound_tol*(1 + np.abs(lo)))
+        at_hi = np.isfinite(hi) & (hi - p_cur <= bound_tol*(1 + np.abs(hi)))
+        pinned = (at_lo & (Jtr > 0)) | (at_hi & (Jtr < 0))
+        if pinned.any():
+            free = ~pinned
+            JtJ = JtJ * (free[:, :, None] & free[:, None, :])
+            Jtr = np.where(pinned, 0.0, Jtr)
+        diag = np.einsum('nkk->nk', JtJ)
+        damped = JtJ + (lam[active, None] * np.maximum(diag, 1e-12))[:, :, None] * eye
+        try:
+            step = np.linalg.solve(damped, -Jtr[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            step = np.einsum('nkl,nl->nk', np.linalg.pinv(damped), -Jtr)
+
+        p_old = p_cur
+        # steps are clipped to the bounds, except that an amplitude overshooting
+        # below zero only moves halfway there: A=0 zeroes every other derivative,
+        # so a single bad step would otherwise leave the fit stuck on a flat model
+        p_new = np.clip(p_old + step, lo, hi)
+        A_try = p_old[:, 0] + step[:, 0]
+        p_new[:, 0] = np.where(A_try < lo[:, 0], 0.5*(p_old[:, 0] + lo[:, 0]), p_new[:, 0])
+        r_new, _ = residuals_and_jacobian(p_new, active, with_jac=False)
+        cost_new = np.einsum('np,np->n', r_new, r_new)
+        cost_old = cost[active]
+
+        improved = np.isfinite(cost_new) & (cost_new < cost_old)
+        lam[active] = np.where(improved, np.maximum(lam[active]/10.0, 1e-12),
+                               lam[active]*10.0)
+        accepted = active[improved]
+        p[accepted] = p_new[improved]
+        cost[accepted] = cost_new[improved]
+
+        dp = np.abs(p_new - p_old).max(axis=1)
+        scale = np.abs(p_old).max(axis=1) + xtol
+        converged = improved & (
+            ((cost_old - cost_new) <= ftol*cost_old) | (dp <= xtol*scale)
+        )
+        stalled = lam[active] > 1e10
+        keep = ~(converged | stalled)
+        active = active[keep]
+        if active.size == 0:
+            break
+        r, J = residuals_and_jacobian(p[active], active)
+
+    ok = np.isfinite(p).all(axis=1) & np.isfinite(cost)
+    return p, ok
+
+def perform_gaussian_fit_batch(frame_images,
+                               centers,
+                               crop_size,
+                               pixelsize=None,
+                               max_nfev=200,
+                               iterations=2,
+                               bg_fixed=None,
+                               warm_start=False):
+    """
+    Batched counterpart of perform_gaussian_fit: fit one spot per
+    (frame_image, center) pair and return a list with the same
+    (fitted_center, sigma, intensity, peak, background) 5-tuple for each.
+    All crops of one refinement iteration are solved together by fit_gaussian_stack.
+    With warm_start, the initial center / σ come from fast_gaussian_estimate.
+    """
+    n = len(centers)
+    results = [(None,)*5 for _ in range(n)]
+    sigma_min, sigma_max = _sigma_bounds(crop_size, pixelsize)
+    ctx = _fit_context(crop_size)
+
+    active = []
+    for i, (img, center) in enumerate(zip(frame_images, centers)):
+        if img is None or center is None or any(c is None or np.isnan(c) for c in center):
+            continue
+        if _passes_snr_check(img, center, crop_size):
+            active.append(i)
+
+    fitted_centers = {i: centers[i] for i in active}
+    for it in range(iterations):
+        if not active:
+            break
+        rows, crops, origins, p0s, lbs, ubs = [], [], [], [], [], []
+        for i in active:
+            window = _prepare_fit_window(
+                frame_images[i], fitted_centers[i], crop_size, bg_fixed, sigma_min, sigma_max
+            )
+            if window is None:
+                continue
+            sub, x1, y1, p0, lb, ub = window
+            rows.append(i)
+            crops.append(sub)
+            origins.append((x1, y1))
+            p0s.append(p0)
+            lbs.append(lb)
+            ubs.append(ub)
+        if not rows:
+            break
+
+        crops = np.stack(crops)
+        p0s = np.array(p0s)
+        lbs = np.array(lbs)
+        ubs = np.array(ubs)
+        if warm_start:
+            est, est_ok = fast_gaussian_estimate(crops, lbs, ubs, bg_fixed)
+            p0s[est_ok, 1:5] = est[est_ok, 1:5]
+
+        popt, ok = fit_gaussian_stack(
+            crops, p0s, lbs, ubs,
+            sigma=ctx.sigma_arr, bg_fixed=bg_fixed, max_nfev=max_nfev
+        )
+
+        next_active = []
+        for k, i in enumerate(rows):
+            if not ok[k]:
+                continue
+            x1, y1 = origins[k]
+            unpacked = _unpack_fit(popt[k], bg_fixed, x1, y1, crop_size)
+            if unpacked is None:
+                continue
+            fitted_center, avg_sig, intensity, peak, off = unpacked
+            if it == iterations-1:
+                if peak < 4.0:
+                    continue
+                results[i] = (fitted_center, float(avg_sig), float(intensity),
+                              float(peak), float(off))
+            else:
+                fitted_centers[i] = fitted_center
+                next_active.append(i)
+        active = next_active
+
+    return results
+
+def _box3(a):
+    """
+    3x3 box smoothing over the last two axes, with edge padding.
+    """
+    pad = [(0, 0)]*(a.ndim - 2) + [(1, 1), (1, 1)]
+    p = np.pad(a, pad, mode='edge')
+    h, w = a.shape[-2], a.shape[-1]
+    out = np.zeros_like(a)
+    for i in range(3):
+        for j in range(3):
+            out += p[..., i:i+h, j:j+w]
+    return out/9.0
+
+def radial_symmetry_center(crops):
+    """
+    Closed-form radial-symmetry center (Parthasarathy, Nat. Methods 2012).
+    Every pixel-corner gradient defines a line; the center is the point with the
+    smallest weighted squared distance to all of them.
+    - crops: one (C, C) crop or an (N, C, C) stack.
+    Returns (x, y) in crop pixel coordinates (scalars or (N,) arrays),
+    NaN where the crop has no usable gradient.
+    """
+    I = np.asarray(crops, dtype=float)
+    d1 = I[..., 1:, 1:] - I[..., :-1, :-1]
+    d2 = I[..., 1:, :-1] - I[..., :-1, 1:]
+    gx = _box3(0.5*(d1 - d2))
+    gy = _box3(0.5*(d1 + d2))
+    ym, xm = np.indices(gx.shape[-2:]) + 0.5
+    g2 = gx*gx + gy*gy
+    axes = (-2, -1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tot = g2.sum(axis=axes)
+        xc0 = (g2*xm).sum(axis=axes)/tot
+        yc0 = (g2*ym).sum(axis=axes)/tot
+        # gradients far from the rough (gradient-weighted) center count less
+        dist = np.sqrt((xm - xc0[..., None, None])**2 + (ym - yc0[..., None, None])**2)
+        w = g2/np.maximum(dist, 0.5)
+        gnorm = np.sqrt(g2)
+        nx = np.nan_to_num(-gy/gnorm)
+        ny = np.nan_to_num(gx/gnorm)
+        c = nx*xm + ny*ym
+        sxx = (w*nx*nx).sum(axis=axes)
+        sxy = (w*nx*ny).sum(axis=axes)
+        syy = (w*ny*ny).sum(axis=axes)
+        bx = (w*nx*c).sum(axis=axes)
+        by = (w*ny*c).sum(axis=axes)
+        det = sxx*syy - sxy*sxy
+        xc = (syy*bx - sxy*by)/det
+        yc = (sxx*by - sxy*bx)/det
+    return xc, yc
+
+def weighted_centroid(crops, background):
+    """
+    Background-subtracted intensity centroid of one crop or an (N, C, C) stack.
+    Returns (x, y) in crop pixel coordinates.
+    """
+    I = np.asarray(crops, dtype=float)
+    bg = np.asarray(background, dtype=float)[..., None, None]
+    sig = np.clip(I - bg, 0, None)
+    yi, xi = np.indices(I.shape[-2:])
+    axes = (-2, -1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tot = sig.sum(axis=axes)
+        return (sig*xi).sum(axis=axes)/tot, (sig*yi).sum(axis=axes)/tot
+
+def _linear_amplitude(crops, x0, y0, sigmas, bg_fixed=None):
+    """
+    For a fixed center and each candidate σ, the isotropic Gaussian model is linear
+    in (A, offset), so both have a closed-form least-squares solution. The Gaussian
+    is separable, so every sum reduces to 1D profiles and one einsum over the crop.
+    - crops: (N, C, C); x0, y0: (N,); sigmas: (N, K)
+    Returns A, offset and the residual sum of squares, each (N, K).
+    """
+    h, w = crops.shape[-2:]
+    xs = np.arange(w, dtype=float)
+    ys = np.arange(h, dtype=float)
+    two_s2 = 2*sigmas[:, :, None]**2
+    gx = np.exp(-(xs[None, None, :] - x0[:, None, None])**2/two_s2)   # (N, K, w)
+    gy = np.exp(-(ys[None, None, :] - y0[:, None, None])**2/two_s2)   # (N, K, h)
+
+    m = h*w
+    sg = gx.sum(-1)*gy.sum(-1)
+    sgg = (gx*gx).sum(-1)*(gy*gy).sum(-1)
+    sgy = np.einsum('nky,nyx,nkx->nk', gy, crops, gx)
+    sy = crops.sum(axis=(-2, -1))[:, None]
+    syy = (crops*crops).sum(axis=(-2, -1))[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if bg_fixed is None:
+            det = sgg*m - sg*sg
+            A = (m*sgy - sg*sy)/det
+            off = (sgg*sy - sg*sgy)/det
+        else:
+            off = np.full(sigmas.shape, float(bg_fixed))
+            A = (sgy - off*sg)/sgg
+    rss = syy - 2*A*sgy - 2*off*sy + A*A*sgg + 2*A*off*sg + m*off*off
+    return A, off, rss
+
+def fast_gaussian_estimate(crops, lb, ub, bg_fixed=None, n_sigma=24):
+    """
+    Non-iterative spot estimate for a stack of crops, in the same parameter
+    layout as fit_gaussian_stack ([A, x0, y0, sx, sy(, offset)] per row).
+    - center: radial symmetry, falling back to the background-subtracted centroid,
+      clipped to the [lb, ub] center bounds
+    - sigma: best of n_sigma values spanning the σ bounds (refined with a parabola
+      through the neighbouring residuals), with A and offset solved linearly
+    Returns (params, ok).
+    """
+    crops = np.asarray(crops, dtype=float)
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+    n = crops.shape[0]
+
+    xc, yc = radial_symmetry_center(crops)
+    bad = ~(np.isfinite(xc) & np.isfinite(yc))
+    if bad.any():
+        bg = np.median(crops.reshape(n, -1), axis=1) if bg_fixed is None else bg_fixed
+        xw, yw = weighted_centroid(crops, bg)
+        xc = np.where(bad, xw, xc)
+        yc = np.where(bad, yw, yc)
+    ok = np.isfinite(xc) & np.isfinite(yc)
+    xc = np.clip(np.nan_to_num(xc), lb[:, 1], ub[:, 1])
+    yc = np.clip(np.nan_to_num(yc), lb[:, 2], ub[:, 2])
+
+    s_lo = lb[:, 3]
+    s_hi = np.maximum(ub[:, 3], s_lo)
+    grid = s_lo[:, None] + (s_hi - s_lo)[:, None]*np.linspace(0.0, 1.0, n_sigma)[None, :]
+    _, _, rss = _linear_amplitude(crops, xc, yc, grid, bg_fixed)
+    rss = np.where(np.isfinite(rss), rss, np.inf)
+    k = np.argmin(rss, axis=1)
+    rows = np.arange(n)
+    sigma = grid[rows, k]
+
+    # parabolic refinement between grid neighbours
+    inner = (k > 0) & (k < n_sigma - 1)
+    if inner.any():
+        km = np.clip(k - 1, 0, n_sigma - 1)
+        kp = np.clip(k + 1, 0, n_sigma - 1)
+        r0, r1, r2 = rss[rows, km], rss[rows, k], rss[rows, kp]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            denom = r0 - 2*r1 + r2
+            shift = 0.5*(r0 - r2)/denom
+        step = grid[rows, kp] - grid[rows, k]
+        good = inner & np.isfinite(shift) & (denom > 0)
+        sigma = np.where(good, sigma + np.clip(shift, -0.5, 0.5)*step, sigma)
+
+    A, off, _ = _linear_amplitude(crops, xc, yc, sigma[:, None], bg_fixed)
+    A, off = A[:, 0], off[:, 0]
+    ok &= np.isfinite(A) & np.isfinite(off) & (A > 0)
+
+    cols = [A, xc, yc, sigma, sigma]
+    if bg_fixed is None:
+        cols.append(off)
+    return np.stack(cols, axis=1), ok
+
+def _warm_start(sub, p0, lb, ub, bg_fixed):
+    """
+    Replace the center / σ entries of p0 with the non-iterative estimate for
+    `sub`, keeping p0 as is if the estimate fails.
+    """
+    est, ok = fast_gaussian_estimate(sub[None], np.array([lb]), np.array([ub]), bg_fixed)
+    if not ok[0]:
+        return p0
+    p0 = list(p0)
+    p0[1:5] = [float(v) for v in est[0, 1:5]]
+    return p0
+
+def perform_fast_localization_batch(frame_images,
+                                    centers,
+                                    crop_size,
+                                    pixelsize=None,
+                                    iterations=2,
+                                    bg_fixed=None):
+    """
+    Non-iterative alternative to perform_gaussian_fit_batch (radial symmetry center,
+    closed-form amplitude / background), with the same inputs, recropping and
+    rejection rules, and the same 5-tuple per spot.
+    Much faster than a least-squares fit and usually within a small fraction of a
+    pixel of it on clean, isolated spots; less robust on crowded or very dim ones.
+    """
+    n = len(centers)
+    results = [(None,)*5 for _ in range(n)]
+    sigma_min, sigma_max = _sigma_bounds(crop_size, pixelsize)
+
+    active = []
+    for i, (img, center) in enumerate(zip(frame_images, centers)):
+        if img is None or center is None or any(c is None or np.isnan(c) for c in center):
+            continue
+        if _passes_snr_check(img, center, crop_size):
+            active.append(i)
+
+    fitted_centers = {i: centers[i] for i in active}
+    for it in range(iterations):
+        if not active:
+            break
+        rows, crops, origins, lbs, ubs = [], [], [], [], []
+        for i in active:
+            window = _prepare_fit_window(
+                frame_images[i], fitted_centers[i], crop_size, bg_fixed, sigma_min, sigma_max
+            )
+            if window is None:
+                continue
+            sub, x1, y1, _, lb, ub = window
+            rows.append(i)
+            crops.append(sub)
+            origins.append((x1, y1))
+            lbs.append(lb)
+            ubs.append(ub)
+        if not rows:
+            break
+
+        est, ok = fast_gaussian_estimate(np.stack(crops), np.array(lbs), np.array(ubs), bg_fixed)
+
+        next_active = []
+        for k, i in enumerate(rows):
+            if not ok[k]:
+                continue
+            x1, y1 = origins[k]
+            unpacked = _unpack_fit(est[k], bg_fixed, x1, y1, crop_size)
+            if unpacked is None:
+                continue
+            fitted_center, avg_sig, intensity, peak, off = unpacked
+            if it == iterations-1:
+                if peak < 4.0:
+                    continue
+                results[i] = (fitted_center, float(avg_sig), float(intensity),
+                              float(peak), float(off))
+            else:
+                fitted_centers[i] = fitted_center
+                next_active.append(i)
+        active = next_active
+
+    return results
+
+def perform_fast_localization(frame_image,
+                              center,
+                              crop_size,
+                              pixelsize=None,
+                              iterations=2,
+                              bg_fixed=None):
+    """
+    Single-spot version of perform_fast_localization_batch; a drop-in for
+    perform_gaussian_fit.
+    """
+    return perform_fast_localization_batch(
+        [frame_image], [center], crop_size,
+        pixelsize=pixelsize, iterations=iterations, bg_fixed=bg_fixed
+    )[0]
+
 def find_minima(x: np.ndarray) -> np.ndarray:
     """
     Return indices i where x[i] is a local minimum.
@@ -227,6 +779,82 @@ def find_maxima(x: np.ndarray) -> np.ndarray:
     return np.nonzero(flags)[0]
 
 
+def _edge_pad(x, lengths, W):
+    """
+    Rows of x (M, L) padded by W copies of their first value on the left and
+    of their last valid value (index lengths-1) on the right, up to L + 2W.
+    """
+    M, L = x.shape
+    rows = np.arange(M)
+    last = x[rows, lengths - 1]
+    xpad = np.empty((M, L + 2*W))
+    xpad[:, :W] = x[:, :1]
+    xpad[:, W:W+L] = x
+    # everything past the valid part of a row repeats its last value
+    cols = np.arange(L + 2*W)
+    tail = cols[None, :] >= (W + lengths)[:, None]
+    xpad[tail] = np.broadcast_to(last[:, None], xpad.shape)[tail]
+    return xpad
+
+def _window_moments(xpad, W, L, with_var=True):
+    """
+    Means (and population variances) of the forward window xpad[i+W : i+2W+1]
+    and the backward window xpad[i : i+W+1] for every i < L, from cumulative sums.
+    Values are shifted by each row's first entry before summing, which keeps
+    E[x^2] - E[x]^2 from cancelling catastrophically on large intensities.
+    """
+    n = W + 1
+    ref = xpad[:, :1]
+    d = xpad - ref
+    c1 = np.zeros((d.shape[0], d.shape[1] + 1))
+    np.cumsum(d, axis=1, out=c1[:, 1:])
+    i = np.arange(L)
+    s_for = c1[:, i + 2*W + 1] - c1[:, i + W]
+    s_bak = c1[:, i + W + 1] - c1[:, i]
+    ave_for = s_for/n
+    ave_bak = s_bak/n
+    if not with_var:
+        return ave_for + ref, ave_bak + ref
+    c2 = np.zeros_like(c1)
+    np.cumsum(d*d, axis=1, out=c2[:, 1:])
+    var_for = np.maximum((c2[:, i + 2*W + 1] - c2[:, i + W])/n - ave_for*ave_for, 0.0)
+    var_bak = np.maximum((c2[:, i + W + 1] - c2[:, i])/n - ave_bak*ave_bak, 0.0)
+    # windows of identical values get exactly zero variance, as np.var gives,
+    # not the rounding residue of the sums; run_start[j] is where the run of
+    # equal values ending at j starts
+    cols = np.arange(xpad.shape[1])
+    change = np.ones(xpad.shape, dtype=bool)
+    change[:, 1:] = xpad[:, 1:] != xpad[:, :-1]
+    run_start = np.maximum.accumulate(np.where(change, cols, 0), axis=1)
+    var_for[run_start[:, i + 2*W] <= i + W] = 0.0
+    var_bak[run_start[:, i + W] <= i] = 0.0
+    return ave_for + ref, var_for, ave_bak + ref, var_bak
+
+def _filterX_rows(x, lengths, W, passes, r=10):
+    """
+    filterX on every row of x (M, L); only the first lengths[m] entries of row m
+    are data. Returns (I, Px), each (M, L), with the padding columns undefined.
+    """
+    x = np.array(x, dtype=float)
+    lengths = np.asarray(lengths, dtype=int)
+    L = x.shape[1]
+    for _ in range(passes):
+        xavefor, xvarfor, xavebak, xvarbak = _window_moments(_edge_pad(x, lengths, W), W, L)
+        with np.errstate(over='ignore', invalid='ignore'):
+            rsp = np.power(xvarfor, r)
+            rsm = np.power(xvarbak, r)
+            denom = rsp + rsm
+            # avoid divide-by-zero: if both windows are flat, rsp and rsm
+            # are 0 and so are both weights (as in the original loop)
+            denom[denom == 0] = 1.0
+            gm = rsp/denom
+            gp = rsm/denom
+        x = gp*xavefor + gm*xavebak
+
+    # after the last pass, forward/backward means once more for Px
+    xavefor, xavebak = _window_moments(_edge_pad(x, lengths, W), W, L, with_var=False)
+    return x, xavefor - xavebak
+
 def filterX(x0: np.ndarray, W: int, passes: int) -> dict:
     """
     Edge-preserving smoother + pseudo-derivative.
@@ -237,52 +865,30 @@ def filterX(x0: np.ndarray, W: int, passes: int) -> dict:
       'I0': original x0,
       'I' : smoothed result,
       'Px': pseudo-derivative = forward_mean - backward_mean
+    Window means / variances come from cumulative sums, so each pass is O(N).
     """
-    r = 10
-    NT = x0.size
-    x = x0.copy().astype(float)
+    x0 = np.asarray(x0)
+    I, Px = _filterX_rows(x0.astype(float)[None, :], [x0.size], W, passes)
+    return {"I0": x0.astype(float), "I": I[0], "Px": Px[0]}
 
-    for _ in range(passes):
-        # Pad on both ends by repeating the endpoint W times
-        left_pad  = np.full(W, x[0])
-        right_pad = np.full(W, x[-1])
-        xpad = np.concatenate((left_pad, x, right_pad))
-
-        # Pre-allocate arrays
-        xavefor = np.empty(NT)
-        xvarfor = np.empty(NT)
-        xavebak = np.empty(NT)
-        xvarbak = np.empty(NT)
-
-        # For each i in [0 .. NT-1], correspond to xpad index i+W
-        for i in range(NT):
-            forward_slice  = xpad[i+W : i+W+W+1]    # length = W+1
-            backward_slice = xpad[i : i+W+1]        # length = W+1
-            xavefor[i] = np.mean(forward_slice)
-            xvarfor[i] = np.var(forward_slice, ddof=0)
-            xavebak[i] = np.mean(backward_slice)
-            xvarbak[i] = np.var(backward_slice, ddof=0)
-
-        rsp = np.power(xvarfor, r)
-        rsm = np.power(xvarbak, r)
-        denom = rsp + rsm
-        # avoid divide-by-zero: if denom==0, give equal weight
-        zero_denom = (denom == 0)
-        denom[zero_denom] = 1.0
-        gm = rsp / denom
-        gp = rsm / denom
-        x = gp * xavefor + gm * xavebak
-
-    # After the last pass, recompute forward/backward means once more for Px:
-    left_pad  = np.full(W, x[0])
-    right_pad = np.full(W, x[-1])
-    xpad = np.concatenate((left_pad, x, right_pad))
-    xavefor = np.empty(NT)
-    xavebak = np.empty(NT)
-    for i in range(NT):
-        xavefor[i] = np.mean(xpad[i+W : i+W+W+1])
-        xavebak[i] = np.mean(xpad[i : i+W+1])
-
-    Px = xavefor - xavebak
-
-    return {"I0": x0.astype(float), "I": x, "Px": Px}
+def filterX_batch(traces, W: int, passes: int) -> list:
+    """
+    filterX for many traces at once. Traces of different lengths are packed into
+    one padded 2-D array; each row is edge-padded from its own last value, so
+    every result matches filterX on that trace alone.
+    Returns a list of filterX-style dicts, one per trace (None for empty traces).
+    """
+    traces = [np.asarray(t, dtype=float).ravel() for t in traces]
+    out = [None]*len(traces)
+    rows = [k for k, t in enumerate(traces) if t.size > 0]
+    if not rows:
+        return out
+    lengths = np.array([traces[k].size for k in rows])
+    X = np.zeros((len(rows), lengths.max()))
+    for m, k in enumerate(rows):
+        X[m, :lengths[m]] = traces[k]
+    I, Px = _filterX_rows(X, lengths, W, passes)
+    for m, k in enumerate(rows):
+        n = lengths[m]
+        out[k] = {"I0": traces[k], "I": I[m, :n], "Px": Px[m, :n]}
+    return out
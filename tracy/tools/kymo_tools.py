@@ -0,0 +1,288 @@
+"""
+Kymograph sampling. The ROI geometry (sample points along the line and their
+offsets along the local normal) is compiled once into a sparse bilinear
+interpolation matrix; a whole stack of frames is then sampled with one sparse
+matrix product and reduced along the normal (max or average).
+batch_kymographs walks the movie once for any number of ROIs and channels,
+which matters when frames come from disk. The raw samples can be kept in a
+KymoSampleCache, so a new integration method or a narrower line is just a
+new reduction.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+def roi_sampling_geometry(roi, line_width=2):
+    """
+    Sample coordinates of an ROI line: one sample per pixel of length (at
+    least 2), each with 2*line_width+1 points along the unit normal.
+    Returns (sample_x_full, sample_y_full), both (num_samples, n_offsets).
+    """
+    xs = np.array(roi["x"], dtype=float)
+    ys = np.array(roi["y"], dtype=float)
+
+    # cumulative distance along the ROI
+    distances = np.sqrt(np.diff(xs)**2 + np.diff(ys)**2)
+    cum_dist = np.concatenate(([0], np.cumsum(distances)))
+    total_length = cum_dist[-1]
+
+    num_samples = max(int(total_length), 2)
+    sample_positions = np.linspace(0, total_length, num_samples)
+    sample_x = np.interp(sample_positions, cum_dist, xs)
+    sample_y = np.interp(sample_positions, cum_dist, ys)
+
+    # tangent by finite differences; the unit normal is (-dy, dx)
+    tangent_dx = np.gradient(sample_x)
+    tangent_dy = np.gradient(sample_y)
+    normal_x = -tangent_dy
+    normal_y = tangent_dx
+    norm = np.sqrt(normal_x**2 + normal_y**2)
+    norm[norm == 0] = 1
+    normal_x /= norm
+    normal_y /= norm
+
+    # -line_width .. +line_width pixels across the line
+    offsets = np.arange(-line_width, line_width + 1, dtype=float)
+    sample_x_full = sample_x[:, None] + normal_x[:, None] * offsets[None, :]
+    sample_y_full = sample_y[:, None] + normal_y[:, None] * offsets[None, :]
+    return sample_x_full, sample_y_full
+
+def reduce_normal(patch_values, method="max"):
+    """
+    Integrate samples along the normal (last axis): "average" or "max".
+    """
+    if str(method).lower() == "average":
+        return np.mean(patch_values, axis=-1)
+    return np.max(patch_values, axis=-1)
+
+def channel_plane(block, channel, channel_axis):
+    """
+    Select `channel` from a block of 4D frames; channel_axis counts the frame
+    axis, as in movie.shape. 3D blocks (channel None) are returned as is.
+    """
+    if channel is None or block.ndim < 4:
+        return block
+    return np.take(block, channel, axis=channel_axis)
+
+def _reflect_index(i, n):
+    # scipy.ndimage mode="reflect" (half-sample symmetric): d c b a | a b c d | d c b a
+    i = np.mod(i, 2 * n)
+    return np.where(i >= n, 2 * n - 1 - i, i)
+
+def bilinear_operator(xy, shape):
+    """
+    Sparse (n_points, H*W) matrix M with M @ image.ravel() equal to
+    map_coordinates(image, xy, order=1, mode="reflect") for an (H, W) image.
+    - xy: (2, n_points) array of (row, col) coordinates
+    """
+    from scipy.sparse import csr_matrix
+
+    h, w = int(shape[0]), int(shape[1])
+    ry, rx = np.asarray(xy[0], dtype=float), np.asarray(xy[1], dtype=float)
+    y0, x0 = np.floor(ry), np.floor(rx)
+    fy, fx = ry - y0, rx - x0
+    y0, x0 = y0.astype(np.int64), x0.astype(np.int64)
+    rows_y = (_reflect_index(y0, h), _reflect_index(y0 + 1, h))
+    cols_x = (_reflect_index(x0, w), _reflect_index(x0 + 1, w))
+    wy = (1.0 - fy, fy)
+    wx = (1.0 - fx, fx)
+
+    n = ry.size
+    cols = np.concatenate([rows_y[a] * w + cols_x[b] for a in (0, 1) for b in (0, 1)])
+    vals = np.concatenate([wy[a] * wx[b] for a in (0, 1) for b in (0, 1)])
+    rows = np.tile(np.arange(n), 4)
+    # duplicate (row, col) pairs from reflected corners are summed
+    return csr_matrix((vals, (rows, cols)), shape=(n, h * w))
+
+def _cast_samples(values, dtype):
+    # map_coordinates returns the input dtype, rounding half away from zero
+    dtype = np.dtype(dtype)
+    if dtype.kind in "ui":
+        return np.trunc(values + np.copysign(0.5, values)).astype(dtype)
+    if dtype.kind == "f":
+        return values.astype(dtype, copy=False)
+    return values
+
+def compact_operator(op):
+    """
+    Drop the pixels an operator never reads: returns (op restricted to the
+    used columns, indices of those pixels in the flattened frame).
+    """
+    used = np.unique(op.indices)
+    return op[:, used].tocsr(), used
+
+def sample_stack(op, planes, pixels=None):
+    """
+    Apply a bilinear_operator to a stack of (H, W) frames at once; with
+    `pixels` (from compact_operator) only those pixels are read.
+    Returns (n_frames, n_points) samples in the frames' dtype.
+    """
+    planes = np.asarray(planes)
+    flat = planes.reshape(planes.shape[0], -1)
+    if pixels is not None:
+        flat = flat[:, pixels]
+    values = np.asarray(op @ flat.T.astype(np.float64, copy=False)).T
+    return _cast_samples(values, planes.dtype)
+
+class KymoSampler:
+    """
+    Compiled sampling geometry of several ROIs on (H, W) frames: the ROIs'
+    operators stacked into one sparse matrix over just the pixels they read,
+    so a stack of frames is sampled for all of them with a single product.
+    """
+
+    def __init__(self, rois, frame_shape, line_width=2):
+        from scipy.sparse import vstack
+
+        self.shapes = {}
+        self.slices = {}
+        ops = []
+        start = 0
+        for name, roi in rois.items():
+            sx, sy = roi_sampling_geometry(roi, line_width)
+            # first row y (rows), second row x
+            ops.append(bilinear_operator(np.vstack((sy.ravel(), sx.ravel())), frame_shape))
+            self.shapes[name] = sx.shape
+            self.slices[name] = slice(start, start + sx.size)
+            start += sx.size
+        self.op, self.pixels = compact_operator(vstack(ops, format="csr"))
+
+    def sample(self, planes):
+        """
+        {name: (n_frames, num_samples, n_offsets) raw samples} for a stack of
+        frames.
+        """
+        values = sample_stack(self.op, planes, self.pixels)
+        n = values.shape[0]
+        return {
+            name: values[:, sl].reshape((n,) + self.shapes[name])
+            for name, sl in self.slices.items()
+        }
+
+def _frame_shape(movie, channel_axis):
+    shape = list(movie.shape[1:])
+    if len(movie.shape) == 4:
+        del shape[channel_axis - 1]
+    return tuple(shape)
+
+def batch_kymographs(movie, rois, channels=(None,), channel_axis=None, line_width=2,
+                     method="max", chunk=32, progress=None, is_canceled=None,
+                     samples_out=None, on_chunk=None):
+    """
+    Kymographs for every (ROI, channel) pair in one pass over the movie.
+    - rois: {name: roi dict}
+    - channels: 0-based channel indices of a 4D movie, or (None,) for 3D
+    - chunk: frames read per movie access
+    - progress(frames_done) is called after each chunk; when is_canceled()
+      returns True the pass stops and None is returned
+    - samples_out: optional dict, filled with the raw samples
+      {(name, channel): (n_frames, num_samples, n_offsets)}
+    - on_chunk(kymos, frames_done) is called after each chunk with the
+      kymographs being filled in place (rows not reached yet are zero), for
+      progressive display
+    Returns {(name, channel): kymo (n_frames, num_samples)}.
+    """
+    n_frames = movie.shape[0]
+    # ROI-major order, like kymographs generated one ROI at a time
+    out = {(name, ch): None for name in rois for ch in channels}
+    if not rois:
+        return out
+    sampler = KymoSampler(rois, _frame_shape(movie, channel_axis), line_width)
+    for start in range(0, n_frames, max(1, int(chunk))):
+        if is_canceled is not None and is_canceled():
+            return None
+        stop = min(n_frames, start + max(1, int(chunk)))
+        block = np.asarray(movie[start:stop])
+        for ch in channels:
+            samples = sampler.sample(channel_plane(block, ch, channel_axis))
+            for name, patch in samples.items():
+                if samples_out is not None:
+                    raw = samples_out.get((name, ch))
+                    if raw is None:
+                        raw = samples_out[(name, ch)] = np.empty((n_frames,) + patch.shape[1:], dtype=patch.dtype)
+                    raw[start:stop] = patch
+                rows = reduce_normal(patch, method)
+                kymo = out[(name, ch)]
+                if kymo is None:
+                    kymo = out[(name, ch)] = np.zeros((n_frames, rows.shape[1]), dtype=rows.dtype)
+                kymo[start:stop] = rows
+        if on_chunk is not None:
+            on_chunk(out, stop)
+        if progress is not None:
+            progress(stop)
+    return out
+
+def raw_samples_nbytes(movie, rois, channels, line_width=2):
+    """
+    Size of the raw samples batch_kymographs would return in samples_out.
+    """
+    n_points = sum(
+        max(int(np.hypot(np.diff(np.asarray(r["x"], float)), np.diff(np.asarray(r["y"], float))).sum()), 2)
+        for r in rois.values()
+    )
+    return n_points * (2 * int(line_width) + 1) * movie.shape[0] * len(channels) * np.dtype(movie.dtype).itemsize
+
+class KymoSampleCache:
+    """
+    Thread-safe LRU of raw kymograph samples (frames × samples × normal
+    offsets) with a byte budget, keyed by movie token, ROI geometry and
+    channel. Each entry remembers the line width it was sampled with; any
+    method and any width up to it can be reduced without the movie.
+    """
+
+    def __init__(self, max_bytes=512 * 1024**2):
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()   # key -> (samples, line_width)
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+
+    @staticmethod
+    def make_key(movie_token, roi, channel):
+        return (
+            movie_token,
+            tuple(float(x) for x in roi["x"]),
+            tuple(float(y) for y in roi["y"]),
+            channel,
+        )
+
+    def store(self, key, samples, line_width):
+        size = int(samples.nbytes)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes_used -= old[0].nbytes
+            self._entries[key] = (samples, int(line_width))
+            self.bytes_used += size
+            while self.bytes_used > self.max_bytes:
+                _, (dropped, _w) = self._entries.popitem(last=False)
+                self.bytes_used -= dropped.nbytes
+
+    def reduce(self, key, line_width, method="max"):
+        """
+        Kymograph for `line_width` and `method` from the cached samples, or
+        None if they are missing or were sampled with a narrower line.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            return None
+        samples, width = entry
+        line_width = int(line_width)
+        if line_width > width:
+            return None
+        # offsets run -width..width, so the narrower line is the middle columns
+        return reduce_normal(samples[..., width - line_width:width + line_width + 1], method)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,365 @@
+"""
+Movie backends. Small movies are still read into RAM; large ones are opened
+lazily so a 20-40 GB acquisition never has to fit in memory:
+- uncompressed TIFFs are memory-mapped (np.memmap, read-only)
+- compressed TIFFs are wrapped in LazyTiffMovie, which decodes only the pages
+  of the frames that are actually indexed
+Both keep the ndarray interface the rest of Tracy uses (shape, ndim, dtype,
+movie[i], movie[i, c], movie[a:b]). CopyOnWriteMovie layers per-frame edits
+on top of any of them without copying the movie.
+"""
+
+import threading
+
+import numpy as np
+
+# decoded size above which compressed movies are opened lazily
+IN_MEMORY_LIMIT = 2 * 1024**3
+
+def _split_frame_key(key, shape):
+    """
+    Split an index into (frames, rest): frames is an int for a single frame,
+    else a list of frame indices; rest indexes the array built from them.
+    """
+    if not isinstance(key, tuple):
+        key = (key,)
+    if key and key[0] is Ellipsis:
+        # movie[..., c] etc.: expand so axis 0 is explicit
+        key = (slice(None),) * (len(shape) - len(key) + 1) + key[1:]
+    first, rest = (key[0], key[1:]) if key else (slice(None), ())
+    n = shape[0]
+    if isinstance(first, (int, np.integer)):
+        f = int(first)
+        if f < 0:
+            f += n
+        if not 0 <= f < n:
+            raise IndexError(f"index {first} is out of bounds for axis 0 with size {n}")
+        return f, rest
+    if isinstance(first, slice):
+        frames = list(range(*first.indices(n)))
+    else:
+        frames = [int(i) for i in np.atleast_1d(np.arange(n)[first])]
+    return frames, (slice(None),) + rest
+
+class LazyTiffMovie:
+    """
+    Read-only, ndarray-like view of the first series of a TIFF file.
+    Frames (axis 0) map to consecutive runs of pages, which are decoded on
+    demand; everything after the frame index is applied to the decoded block.
+    The file stays open until close().
+    """
+
+    def __init__(self, tif):
+        series = tif.series[0]
+        self._tif = tif
+        self._lock = threading.Lock()
+        self.shape = tuple(series.shape)
+        self.dtype = np.dtype(series.dtype)
+        self.ndim = len(self.shape)
+        page_size = int(np.prod(series.keyframe.shape))
+        frame_size = int(np.prod(self.shape[1:]))
+        if page_size == 0 or frame_size % page_size:
+            raise ValueError("Frames do not map to whole TIFF pages.")
+        self._pages_per_frame = frame_size // page_size
+        if len(series.pages) < self.shape[0] * self._pages_per_frame:
+            raise ValueError("TIFF series does not list every page.")
+        self.filename = getattr(tif.filehandle, "path", None)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _read(self, frames):
+        """
+        Decode the frames listed in `frames` into an array of shape
+        (len(frames),) + shape[1:].
+        """
+        ppf = self._pages_per_frame
+        keys = [f*ppf + k for f in frames for k in range(ppf)]
+        if not keys:
+            return np.empty((0,) + self.shape[1:], dtype=self.dtype)
+        with self._lock:
+            data = self._tif.asarray(key=keys, series=0)
+        return np.asarray(data).reshape((len(frames),) + self.shape[1:])
+
+    def __getitem__(self, key):
+        frames, rest = _split_frame_key(key, self.shape)
+        if isinstance(frames, int):
+            block = self._read([frames])[0]
+        else:
+            block = self._read(frames)
+        return block[rest] if rest else block
+
+    def __array__(self, dtype=None, copy=None):
+        data = self[:]
+        return data.astype(dtype) if dtype is not None else data
+
+    def __iter__(self):
+        for i in range(self.shape[0]):
+            yield self[i]
+
+    def copy(self):
+        # the lazy movie is read-only, so a "copy" can share the file
+        return self
+
+    def close(self):
+        with self._lock:
+            self._tif.close()
+
+def shift_frame(data, vector, order=0, cval=0):
+    """
+    scipy.ndimage.shift(data, vector, order, mode="constant") with a fast
+    path: with order=0 or whole-pixel shifts the frame is just offset, as
+    one slice copy into a cval-filled frame (no shift: data itself).
+    """
+    vector = np.asarray(vector, dtype=float)
+    if order == 0:
+        # nearest neighbour only ever moves pixels by a whole-pixel offset
+        vector = np.round(vector)
+    if not np.any(vector):
+        return data
+    if np.all(vector == np.round(vector)):
+        data = np.asarray(data)
+        out = np.full(data.shape, cval, dtype=data.dtype)
+        src, dst = [], []
+        for v, n in zip(vector.astype(int), data.shape):
+            if abs(v) >= n:
+                return out
+            src.append(slice(max(0, -v), n - max(0, v)))
+            dst.append(slice(max(0, v), n - max(0, -v)))
+        out[tuple(dst)] = data[tuple(src)]
+        return out
+    from scipy.ndimage import shift
+    return shift(np.asarray(data), shift=vector, order=order, mode="constant", cval=cval)
+
+class CopyOnWriteMovie:
+    """
+    ndarray-like movie over a read-only base that records edits instead of
+    copying the movie: whole replacement frames, or a shift per frame (e.g.
+    a drift vector) applied when the frame is read. A whole drift table can
+    be set at once with set_drift. Unedited frames come straight from the
+    base, which doubles as the pristine original.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.shape = tuple(base.shape)
+        self.dtype = np.dtype(base.dtype)
+        self.ndim = len(self.shape)
+        self._frames = {}   # frame -> replacement array
+        self._shifts = {}   # frame -> (shift vector over the frame's axes, order, cval)
+        self._drift = None  # (n_frames, 2) drift table as (dx, dy), see set_drift
+        self._drift_args = (None, 0, 0)   # (channel_axis, order, cval)
+        self._lock = threading.Lock()
+
+    @property
+    def original(self):
+        return self.base
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    @property
+    def edited(self):
+        return bool(self._frames or self._shifts) or self._drift is not None
+
+    @property
+    def drift(self):
+        return self._drift
+
+    def edited_frames(self):
+        with self._lock:
+            frames = set(self._frames) | set(self._shifts)
+            if self._drift is not None:
+                frames.update(np.flatnonzero(np.any(self._drift != 0, axis=1)).tolist())
+            return sorted(frames)
+
+    def set_drift(self, displacements, channel_axis=None, order=0, cval=0):
+        """
+        Correct every frame for drift when it is read: displacements is an
+        (n_frames, 2) table of (dx, dy) of the frame content, so frame i is
+        shifted by (-dy, -dx). channel_axis (counted as in movie.shape) marks
+        the unshifted channel axis of 4D movies. None clears the table.
+        Per-frame edits (set_frame / set_shift) take precedence.
+        """
+        if displacements is not None:
+            displacements = np.array(displacements, dtype=float).reshape(self.shape[0], 2)
+            if not np.any(displacements):
+                displacements = None
+        with self._lock:
+            self._drift = displacements
+            self._drift_args = (channel_axis, order, cval)
+
+    def _drift_vector(self, frame_idx):
+        # shift vector over the frame's axes for the drift table
+        dx, dy = self._drift[frame_idx]
+        channel_axis, order, cval = self._drift_args
+        vector = [-dy, -dx]
+        if self.ndim == 4:
+            vector.insert(channel_axis - 1, 0.0)
+        return tuple(vector), order, cval
+
+    def set_frame(self, frame_idx, data):
+        data = np.asarray(data, dtype=self.dtype)
+        if data.shape != self.shape[1:]:
+            raise ValueError(f"Frame shape {data.shape} does not match {self.shape[1:]}")
+        with self._lock:
+            self._shifts.pop(frame_idx, None)
+            self._frames[frame_idx] = data
+
+    def set_shift(self, frame_idx, vector, order=0, cval=0):
+        """
+        Shift frame `frame_idx` by `vector` (one entry per frame axis, as for
+        scipy.ndimage.shift) whenever it is read; order=0 keeps pixel values.
+        """
+        vector = tuple(float(v) for v in vector)
+        with self._lock:
+            self._frames.pop(frame_idx, None)
+            if any(vector):
+                self._shifts[frame_idx] = (vector, order, cval)
+            else:
+                self._shifts.pop(frame_idx, None)
+
+    def revert(self, frame_idx=None):
+        """
+        Drop the edits of one frame, or of every frame.
+        """
+        with self._lock:
+            if frame_idx is None:
+                self._frames.clear()
+                self._shifts.clear()
+                self._drift = None
+            else:
+                self._frames.pop(frame_idx, None)
+                self._shifts.pop(frame_idx, None)
+
+    def original_frame(self, frame_idx):
+        return self.base[frame_idx]
+
+    def frame(self, frame_idx):
+        with self._lock:
+            data = self._frames.get(frame_idx)
+            edit = self._shifts.get(frame_idx)
+            if data is None and edit is None and self._drift is not None:
+                edit = self._drift_vector(frame_idx)
+        if data is not None:
+            return data
+        raw = self.base[frame_idx]
+        if edit is None:
+            return raw
+        vector, order, cval = edit
+        return shift_frame(raw, vector, order=order, cval=cval)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if not self.edited:
+            return self.base[key]
+        frames, rest = _split_frame_key(key, self.shape)
+        if isinstance(frames, int):
+            data = self.frame(frames)
+        elif frames:
+            data = np.stack([np.asarray(self.frame(f)) for f in frames])
+        else:
+            data = np.empty((0,) + self.shape[1:], dtype=self.dtype)
+        return data[rest] if rest else data
+
+    def __array__(self, dtype=None, copy=None):
+        data = np.asarray(self[:])
+        return data.astype(dtype) if dtype is not None else data
+
+    def __iter__(self):
+        for i in range(self.shape[0]):
+            yield self[i]
+
+    def copy(self):
+        # shares the base; only the edit tables are copied
+        out = CopyOnWriteMovie(self.base)
+        with self._lock:
+            out._frames = dict(self._frames)
+            out._shifts = dict(self._shifts)
+            out._drift = self._drift
+            out._drift_args = self._drift_args
+        return out
+
+def is_lazy_movie(movie):
+    """
+    True for movies that are not held in RAM (memory-mapped or lazy).
+    """
+    if isinstance(movie, CopyOnWriteMovie):
+        movie = movie.base
+    return isinstance(movie, (LazyTiffMovie, np.memmap))
+
+def close_movie(movie):
+    # memmaps are left to the garbage collector: cached frames may still be
+    # views into them
+    if isinstance(movie, CopyOnWriteMovie):
+        movie = movie.base
+    if isinstance(movie, LazyTiffMovie):
+        movie.close()
+
+def open_movie(fname, in_memory_limit=IN_MEMORY_LIMIT):
+    """
+    Open `fname` as (movie, imagej_metadata, first_page).
+    Uncompressed files are memory-mapped, compressed files below
+    in_memory_limit bytes are read into RAM, larger ones are opened lazily.
+    """
+    import tifffile
+
+    tif = tifffile.TiffFile(fname)
+    try:
+        metadata = tif.imagej_metadata or {}
+        page = tif.pages[0]
+        series = tif.series[0]
+        nbytes = int(np.prod(series.shape)) * np.dtype(series.dtype).itemsize
+        try:
+            movie = tifffile.memmap(fname, mode="r")
+            if tuple(movie.shape) != tuple(series.shape):
+                movie = movie.reshape(series.shape)
+            if not movie.dtype.isnative:
+                # byte-swapped files are decoded normally
+                movie = None
+        except Exception:
+            movie = None
+        if movie is None and nbytes > in_memory_limit:
+            try:
+                movie = LazyTiffMovie(tif)
+                return movie, metadata, page
+            except ValueError:
+                movie = None
+        if movie is None:
+            movie = tif.asarray()
+    except Exception:
+        tif.close()
+        raise
+    tif.close()
+    return movie, metadata, page
+
+def max_projection(movie, channel=None, channel_axis=None, chunk=64):
+    """
+    Maximum over frames, reading `chunk` frames at a time so memory-mapped
+    and lazy movies are never loaded whole. With a channel, the channel is
+    selected first (channel_axis counts the frame axis, as in movie.shape).
+    """
+    n = movie.shape[0]
+    out = None
+    for start in range(0, n, chunk):
+        block = np.asarray(movie[start:start + chunk])
+        if channel is not None:
+            block = np.take(block, channel, axis=channel_axis)
+        m = block.max(axis=0)
+        out = m if out is None else np.maximum(out, m)
+    return out
@@ -0,0 +1,128 @@
+"""
+Streaming movie writer. Frames come from a generator and are written to the
+TIFF as they arrive, so a corrected or derived movie never has to exist in
+memory as a whole (np.array(frames) used to need the full movie, twice).
+Output is an ImageJ hyperstack (TYX, or TCYX for multi-channel movies).
+Files over 4 GB are written as contiguous ImageJ TIFFs when uncompressed,
+which ImageJ and tifffile both read, and as BigTIFF otherwise.
+"""
+
+import os
+import warnings
+
+import numpy as np
+
+# tifffile switches to BigTIFF a little before 4 GB to leave room for the IFDs
+BIGTIFF_THRESHOLD = 2**32 - 2**25
+
+# ImageJ metadata keys tifffile derives from the data; stale values from the
+# source movie must not override them
+_STRUCTURAL_KEYS = {"ImageJ", "images", "channels", "slices", "frames", "hyperstack", "axes"}
+
+class _Canceled(Exception):
+    pass
+
+def _frames_of(chunks, frame_shape):
+    # accept single frames or (k,) + frame_shape chunks
+    for block in chunks:
+        block = np.asarray(block)
+        if block.shape == frame_shape:
+            yield block
+        else:
+            yield from block.reshape((-1,) + frame_shape)
+
+def write_movie(fname, frames, shape, dtype, channel_axis=None, metadata=None,
+                resolution=None, bigtiff=None, compression=None, compression_workers=None,
+                progress=None, is_canceled=None):
+    """
+    Write a movie to `fname` frame by frame.
+    - frames: iterable of frames (shape[1:]) or chunks of frames
+      ((k,) + shape[1:]), e.g. a generator reading a lazy movie
+    - shape, dtype: of the whole movie; channel_axis (counted as in shape)
+      for 4D movies, whose frames are stored channels-first
+    - metadata: ImageJ metadata to carry over (finterval, unit, Ranges, ...)
+    - resolution: pixels per unit as (x, y)
+    - bigtiff: None picks BigTIFF when the file needs it (> 4 GB, compressed)
+    - compression: e.g. "zlib" or ("zlib", level); the strips of each page
+      are encoded on compression_workers threads (None: all cores)
+    - progress(frames_done) is called as frames are written; when
+      is_canceled() returns True the partial file is removed
+    Returns True once written, False if canceled.
+    """
+    import tifffile
+
+    shape = tuple(int(s) for s in shape)
+    dtype = np.dtype(dtype)
+    n_frames = shape[0]
+    frame_shape = shape[1:]
+    if len(shape) == 4:
+        channel_axis = 1 if channel_axis is None else int(channel_axis)
+        n_channels = shape[channel_axis]
+        out_shape = (n_frames, n_channels) + tuple(
+            s for ax, s in enumerate(shape[1:], start=1) if ax != channel_axis)
+        axes = "TCYX"
+    else:
+        out_shape = shape
+        axes = "TYX"
+
+    if bigtiff is None:
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        bigtiff = nbytes > BIGTIFF_THRESHOLD and compression is not None
+
+    meta = {k: v for k, v in (metadata or {}).items() if k not in _STRUCTURAL_KEYS}
+    meta["axes"] = axes
+
+    def pages():
+        # one (Y, X) plane per page, in T, C order
+        for i, frame in enumerate(_frames_of(frames, frame_shape)):
+            if is_canceled is not None and is_canceled():
+                raise _Canceled()
+            frame = np.asarray(frame, dtype=dtype)
+            if frame.ndim == 3:
+                yield from np.moveaxis(frame, channel_axis - 1, 0)
+            else:
+                yield frame
+            if progress is not None:
+                progress(i + 1)
+
+    kwargs = {}
+    workers = None
+    if compression is not None:
+        # tifffile encodes the strips of a page in parallel, so split each
+        # page into one strip per worker
+        workers = compression_workers or os.cpu_count() or 1
+        height = out_shape[-2]
+        kwargs["rowsperstrip"] = max(16, -(-height // workers))
+    if resolution is not None:
+        kwargs["resolution"] = tuple(resolution)
+    try:
+        with warnings.catch_warnings():
+            # BigTIFF ImageJ files are "nonconformant", but tifffile and
+            # Bio-Formats read them
+            warnings.filterwarnings("ignore", message=".*nonconformant BigTIFF ImageJ")
+            # uncompressed files over 4 GB are written as truncated
+            # (contiguous) ImageJ files on purpose, see the module docstring
+            warnings.filterwarnings("ignore", message=".*truncating ImageJ file")
+            with tifffile.TiffWriter(fname, bigtiff=bool(bigtiff), imagej=True) as tif:
+                tif.write(
+                    pages(),
+                    shape=out_shape,
+                    dtype=dtype,
+                    compression=compression,
+                    maxworkers=workers,
+                    metadata=meta,
+                    **kwargs,
+                )
+    except _Canceled:
+        _remove(fname)
+        return False
+    except BaseException:
+        _remove(fname)
+        raise
+    return True
+
+def _remove(fname):
+    try:
+        os.remove(fname)
+    except OSError:
+        pass
@@ -0,0 +1,209 @@
+"""
+Vectorized mean-squared-displacement (MSD) engine for diffusion analysis.
+Many tracks are packed into one (M, T) frame grid with a validity mask, MSDs at
+every frame lag come from FFT correlations (O(T log T) per track instead of a
+Python loop over lags), and the MSD(Δt) = 4D·Δt^α power law is fitted for all
+tracks at once.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+
+def _valid_points(frames, centers):
+    """
+    (frames, positions) arrays of the valid points of one track, sorted by frame.
+    """
+    n = min(len(frames), len(centers))
+    try:
+        # fast path: every entry is an (x, y) pair, possibly with NaN / None coords
+        pos = np.array(centers[:n], dtype=float).reshape(n, -1)[:, :2]
+        fr = np.asarray(frames[:n], dtype=int)
+    except (TypeError, ValueError):
+        keep = [
+            i for i, c in enumerate(centers[:n])
+            if isinstance(c, (tuple, list)) and len(c) >= 2
+            and c[0] is not None and c[1] is not None
+        ]
+        fr = np.array([frames[i] for i in keep], dtype=int)
+        pos = np.array([centers[i][:2] for i in keep], dtype=float).reshape(-1, 2)
+    ok = np.isfinite(pos).all(axis=1)
+    fr, pos = fr[ok], pos[ok]
+    if fr.size > 1 and np.any(np.diff(fr) < 0):
+        order = np.argsort(fr, kind="stable")
+        fr, pos = fr[order], pos[order]
+    return fr, pos
+
+def _pack_points(parsed):
+    T = max([int(fr[-1] - fr[0]) + 1 for fr, _ in parsed if fr.size] + [1])
+    M = len(parsed)
+    xy = np.zeros((M, T, 2))
+    mask = np.zeros((M, T), dtype=bool)
+    for m, (fr, pos) in enumerate(parsed):
+        if fr.size == 0:
+            continue
+        col = fr - fr[0]
+        xy[m, col] = pos - pos.mean(axis=0)
+        mask[m, col] = True
+    return xy, mask, mask.sum(axis=1)
+
+def pack_tracks(tracks):
+    """
+    Put tracks on a common frame grid.
+    - tracks: list of (frames, centers); centers are (x, y) or None for gaps.
+    Each track starts at column 0 (its first valid frame); missing frames are
+    masked out. Positions are taken relative to each track's mean, which keeps
+    the FFT sums well conditioned (the MSD does not depend on the origin).
+    Returns (xy (M, T, 2), mask (M, T) bool, n_valid (M,)).
+    """
+    return _pack_points([_valid_points(frames, centers) for frames, centers in tracks])
+
+def _xcorr(a, b, nfft, max_lag):
+    # sum_t a[t] * b[t + lag] for lag = 0..max_lag, along the last axis
+    fa = np.fft.rfft(a, n=nfft, axis=-1)
+    fb = np.fft.rfft(b, n=nfft, axis=-1)
+    return np.fft.irfft(np.conj(fa)*fb, n=nfft, axis=-1)[..., :max_lag + 1]
+
+def msd_fft(xy, mask, max_lag):
+    """
+    MSD at frame lags 1..max_lag for every packed track, counting only pairs
+    where both frames are valid:
+        MSD(τ) = Σ m_t m_{t+τ} |r_{t+τ} - r_t|² / Σ m_t m_{t+τ}
+    The numerator expands into cross-correlations of m, m|r|² and m·r, which
+    are all evaluated with one zero-padded FFT size.
+    Returns (msd (M, max_lag), pairs (M, max_lag)); msd is NaN where pairs == 0.
+    """
+    M, T = mask.shape
+    max_lag = int(max(1, min(max_lag, T - 1))) if T > 1 else 1
+    nfft = 1 << int(np.ceil(np.log2(max(2, 2*T))))
+    m = mask.astype(float)
+    r2 = (xy**2).sum(axis=-1)*m
+
+    pairs = _xcorr(m, m, nfft, max_lag)
+    sq = _xcorr(r2, m, nfft, max_lag) + _xcorr(m, r2, nfft, max_lag)
+    for d in range(xy.shape[-1]):
+        c = xy[..., d]*m
+        sq -= 2*_xcorr(c, c, nfft, max_lag)
+
+    pairs = np.rint(pairs[:, 1:]).astype(int)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        msd = np.where(pairs > 0, np.maximum(sq[:, 1:], 0.0)/np.maximum(pairs, 1), np.nan)
+    if msd.shape[1] < max_lag:
+        pad = max_lag - msd.shape[1]
+        msd = np.pad(msd, ((0, 0), (0, pad)), constant_values=np.nan)
+        pairs = np.pad(pairs, ((0, 0), (0, pad)))
+    return msd, pairs
+
+def fit_power_law(msd, pairs, min_pairs=5, eps=1e-12):
+    """
+    Least-squares fit of log MSD = log(4D) + α log τ (τ in frames) for every row,
+    using the lags with at least min_pairs pairs (MSD clamped at eps, as before).
+    Returns (D, alpha) arrays in px² / frame^α; NaN where fewer than 2 lags qualify.
+    """
+    msd = np.atleast_2d(msd)
+    pairs = np.atleast_2d(pairs)
+    lags = np.arange(1, msd.shape[1] + 1, dtype=float)
+    use = (pairs >= min_pairs) & np.isfinite(msd)
+    x = np.log(np.maximum(lags, eps))[None, :]
+    y = np.log(np.maximum(np.where(use, msd, 1.0), eps))
+    w = use.astype(float)
+    n = w.sum(axis=1)
+    sx = (w*x).sum(axis=1)
+    sy = (w*y).sum(axis=1)
+    sxx = (w*x*x).sum(axis=1)
+    sxy = (w*x*y).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        det = n*sxx - sx*sx
+        alpha = (n*sxy - sx*sy)/det
+        intercept = (sy - alpha*sx)/n
+        D = np.exp(intercept)/4.0
+    bad = (n < 2) | ~np.isfinite(alpha)
+    alpha = np.where(bad, np.nan, alpha)
+    D = np.where(bad, np.nan, D)
+    return D, alpha
+
+def ensemble_msd(msd, pairs):
+    """
+    Pair-weighted average MSD over tracks. Returns (msd (L,), pairs (L,)).
+    """
+    w = np.where(np.isfinite(msd), pairs, 0)
+    tot = w.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ens = np.where(tot > 0, (np.nan_to_num(msd)*w).sum(axis=0)/np.maximum(tot, 1), np.nan)
+    return ens, tot
+
+def diffusion_for_tracks(tracks, max_lag=10, min_pairs=5, eps=1e-12, max_cells=4_000_000):
+    """
+    Per-track MSD fit for many tracks in one call.
+    Tracks are grouped by span so one long track does not pad thousands of short
+    segments; each group holds at most max_cells grid entries.
+    Tracks with fewer than 3 valid points get NaN, like a failed fit.
+    Returns (D, alpha) arrays in px² / frame^α.
+    """
+    n = len(tracks)
+    D = np.full(n, np.nan)
+    alpha = np.full(n, np.nan)
+    if n == 0:
+        return D, alpha
+    parsed = [_valid_points(f, c) for f, c in tracks]
+    spans = np.array([int(fr[-1] - fr[0]) + 1 if fr.size else 0 for fr, _ in parsed])
+    order = np.argsort(spans, kind="stable")
+    start = 0
+    while start < n:
+        # spans are sorted, so the last track of a group sets its width
+        stop = start + 1
+        while stop < n and (stop - start + 1)*max(1, spans[order[stop]]) <= max_cells:
+            stop += 1
+        idx = order[start:stop]
+        xy, mask, n_valid = _pack_points([parsed[k] for k in idx])
+        msd, pairs = msd_fft(xy, mask, max_lag)
+        d, a = fit_power_law(msd, pairs, min_pairs=min_pairs, eps=eps)
+        short = n_valid < 3
+        D[idx] = np.where(short, np.nan, d)
+        alpha[idx] = np.where(short, np.nan, a)
+        start = stop
+    return D, alpha
+
+def ensemble_diffusion(tracks, max_lag=10, min_pairs=5, eps=1e-12,
+                       n_boot=0, ci=95.0, seed=None, max_workers=None):
+    """
+    Fit the pair-weighted ensemble MSD of `tracks`.
+    With n_boot > 0, tracks are resampled with replacement n_boot times
+    (bootstrap replicates run on a thread pool) to give percentile confidence
+    intervals for D, α and the ensemble MSD.
+    Returns a dict with 'msd', 'pairs', 'D', 'alpha' and, when bootstrapped,
+    'D_ci', 'alpha_ci', 'msd_ci' (each a (low, high) pair / (2, L) array).
+    D is in px² / frame^α.
+    """
+    xy, mask, n_valid = pack_tracks(tracks)
+    keep = n_valid >= 2
+    msd, pairs = msd_fft(xy[keep], mask[keep], max_lag)
+    ens, tot = ensemble_msd(msd, pairs)
+    D, alpha = fit_power_law(ens[None, :], tot[None, :], min_pairs=min_pairs, eps=eps)
+    out = {"msd": ens, "pairs": tot, "D": float(D[0]), "alpha": float(alpha[0])}
+    if n_boot <= 0 or msd.shape[0] == 0:
+        return out
+
+    n = msd.shape[0]
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, n, size=(int(n_boot), n))
+
+    def replicate(idx):
+        e, t = ensemble_msd(msd[idx], pairs[idx])
+        d, a = fit_power_law(e[None, :], t[None, :], min_pairs=min_pairs, eps=eps)
+        return e, d[0], a[0]
+
+    workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        reps = list(pool.map(replicate, picks))
+
+    lo, hi = (100.0 - ci)/2.0, 100.0 - (100.0 - ci)/2.0
+    boot_msd = np.array([r[0] for r in reps])
+    boot_D = np.array([r[1] for r in reps])
+    boot_a = np.array([r[2] for r in reps])
+    with np.errstate(invalid='ignore'):
+        out["D_ci"] = tuple(np.nanpercentile(boot_D, [lo, hi])) if np.isfinite(boot_D).any() else (np.nan, np.nan)
+        out["alpha_ci"] = tuple(np.nanpercentile(boot_a, [lo, hi])) if np.isfinite(boot_a).any() else (np.nan, np.nan)
+        out["msd_ci"] = np.nanpercentile(boot_msd, [lo, hi], axis=0)
+    return out
@@ -0,0 +1,97 @@
+"""
+Process-pool spot fitting. Each chunk of fits goes to a worker as small
+patches cut around the spots from the frames the caller already holds, so a
+long trajectory is spread over all cores without the movie being copied into
+the workers (memory-mapped and lazily decoded movies stay on disk). The pool
+does not depend on the movie and is started once.
+"""
+
+import os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .gaussian_tools import perform_gaussian_fit_batch, perform_fast_localization_batch
+
+# fitters a worker may run, looked up by name so only strings cross the process boundary
+_FITTERS = {
+    "perform_gaussian_fit_batch": perform_gaussian_fit_batch,
+    "perform_fast_localization_batch": perform_fast_localization_batch,
+}
+
+# refinement iterations of the batch fitters; each may move the center by up
+# to 4 px (the fit bounds) before the window is cut again
+_FIT_ITERATIONS = 2
+
+def default_worker_count():
+    # leave one core for the GUI
+    return max(1, (os.cpu_count() or 1) - 1)
+
+def cut_patch(image, center, crop_size, iterations=_FIT_ITERATIONS):
+    """
+    The part of `image` every fit window around `center` can touch, and its
+    (x, y) origin in the image. Fitting the patch at center - origin gives
+    the same windows, border padding included, as fitting the whole image.
+    Returns (None, (0, 0)) for a missing image or center.
+    """
+    if image is None or center is None or any(c is None or np.isnan(c) for c in center):
+        return None, (0, 0)
+    H, W = image.shape
+    r = crop_size // 2 + crop_size + 4 * iterations + 2
+    x, y = int(round(center[0])), int(round(center[1]))
+    # even origins: round() breaks .5 ties to even, which an even shift keeps
+    x0 = max(0, x - r) & ~1
+    y0 = max(0, y - r) & ~1
+    patch = np.ascontiguousarray(image[y0:min(H, y + r + 1), x0:min(W, x + r + 1)])
+    return patch, (x0, y0)
+
+def _fit_patches(patches, origins, centers, crop_size, pixelsize, bg_fixed, fitter):
+    local = [
+        None if c is None else (c[0] - ox, c[1] - oy)
+        for c, (ox, oy) in zip(centers, origins)
+    ]
+    results = _FITTERS[fitter](patches, local, crop_size, pixelsize=pixelsize, bg_fixed=bg_fixed)
+    out = []
+    for res, (ox, oy) in zip(results, origins):
+        fc = res[0]
+        if fc is not None:
+            res = ((fc[0] + ox, fc[1] + oy),) + tuple(res[1:])
+        out.append(res)
+    return out
+
+class ParallelFitter:
+    """
+    A process pool for batched spot fits. submit() takes the frame images of
+    one chunk, cuts the patches the fits need and returns a Future for the
+    list of 5-tuples; close() shuts the pool down.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or default_worker_count()
+        # spawn, not fork: the GUI process has Qt threads running
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp.get_context("spawn"),
+        )
+
+    def submit(self, images, centers, crop_size, pixelsize=None,
+               bg_fixed=None, fitter="perform_gaussian_fit_batch"):
+        if fitter not in _FITTERS:
+            raise ValueError(f"Unknown fitter {fitter!r}")
+        crop_size = int(crop_size)
+        patches, origins, spot_centers = [], [], []
+        for img, c in zip(images, centers):
+            patch, origin = cut_patch(None if img is None else np.asarray(img), c, crop_size)
+            patches.append(patch)
+            origins.append(origin)
+            spot_centers.append(None if patch is None else (float(c[0]), float(c[1])))
+        return self._pool.submit(
+            _fit_patches, patches, origins, spot_centers, crop_size,
+            pixelsize, bg_fixed, fitter
+        )
+
+    def close(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
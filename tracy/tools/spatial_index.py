@@ -0,0 +1,116 @@
+"""
+Per-frame grid hash of already-tracked spot centers, for the "avoid previous
+spot" check: lookups and deletions only touch the few grid cells around a
+point in one frame instead of every center of every trajectory.
+"""
+
+import math
+
+class FrameSpatialIndex:
+    """
+    Set of (frame, x, y) points bucketed by frame, then by square grid cell.
+    - cell: grid spacing in pixels; radius queries scan ceil(r / cell) cells
+      around the point, so a cell near the usual query radius is best
+    Behaves like the list it replaces for extend / append / iteration / len.
+    """
+
+    def __init__(self, points=(), cell=6.0):
+        self.cell = float(cell)
+        self._frames = {}   # frame -> {(ix, iy): [(x, y), ...]}
+        self._count = 0
+        self.extend(points)
+
+    def _key(self, x, y):
+        return (math.floor(x / self.cell), math.floor(y / self.cell))
+
+    def append(self, point):
+        f, x, y = point
+        x, y = float(x), float(y)
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return
+        grid = self._frames.setdefault(int(f), {})
+        grid.setdefault(self._key(x, y), []).append((x, y))
+        self._count += 1
+
+    def extend(self, points):
+        for p in points:
+            self.append(p)
+
+    def clear(self):
+        self._frames.clear()
+        self._count = 0
+
+    def _cells_near(self, grid, x, y, radius):
+        reach = max(1, math.ceil(radius / self.cell))
+        ix, iy = self._key(x, y)
+        for gx in range(ix - reach, ix + reach + 1):
+            for gy in range(iy - reach, iy + reach + 1):
+                bucket = grid.get((gx, gy))
+                if bucket:
+                    yield (gx, gy), bucket
+
+    def any_within(self, frame, x, y, radius):
+        """
+        True if some stored point on `frame` is closer than `radius` to (x, y).
+        """
+        grid = self._frames.get(int(frame))
+        if not grid:
+            return False
+        r2 = radius * radius
+        for _, bucket in self._cells_near(grid, x, y, radius):
+            for px, py in bucket:
+                if (px - x)**2 + (py - y)**2 < r2:
+                    return True
+        return False
+
+    def query(self, frame, x, y, radius):
+        """
+        Stored (x, y) points on `frame` closer than `radius` to (x, y).
+        """
+        grid = self._frames.get(int(frame))
+        if not grid:
+            return []
+        r2 = radius * radius
+        return [
+            (px, py)
+            for _, bucket in self._cells_near(grid, x, y, radius)
+            for px, py in bucket
+            if (px - x)**2 + (py - y)**2 < r2
+        ]
+
+    def remove_near(self, points, radius):
+        """
+        Drop every stored point closer than `radius` to any (frame, x, y) in
+        `points` on the same frame. Returns the number removed.
+        """
+        r2 = radius * radius
+        removed = 0
+        for f, x, y in points:
+            grid = self._frames.get(int(f))
+            if not grid:
+                continue
+            x, y = float(x), float(y)
+            for key, bucket in list(self._cells_near(grid, x, y, radius)):
+                kept = [(px, py) for px, py in bucket if (px - x)**2 + (py - y)**2 >= r2]
+                if len(kept) != len(bucket):
+                    removed += len(bucket) - len(kept)
+                    if kept:
+                        grid[key] = kept
+                    else:
+                        del grid[key]
+            if not grid:
+                del self._frames[int(f)]
+        self._count -= removed
+        return removed
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for f, grid in self._frames.items():
+            for bucket in grid.values():
+                for x, y in bucket:
+                    yield (f, x, y)
+
+    def __repr__(self):
+        return f"FrameSpatialIndex({self._count} points in {len(self._frames)} frames)"
@@ -0,0 +1,602 @@
+"""
+Columnar storage for trajectories. Per-point fields (frames, coordinates, fit
+parameters, intensities, colocalization flags) live in one contiguous NumPy
+buffer per field, with a (start, length) slot per trajectory, instead of one
+Python list per field per trajectory. Records keep the old dict interface, so
+existing code can go on reading and writing traj["spot_centers"][i] etc.
+Point columns and records pickle as plain lists and dicts.
+"""
+
+import copy
+import threading
+from collections.abc import Mapping, MutableMapping, MutableSequence
+
+import numpy as np
+
+# name -> (kind, dtype, per-point shape)
+#   int:   plain integers
+#   float: floats, None stored as NaN
+#   xy:    (x, y) pairs, None stored as a NaN row
+#   flag:  "Yes" / "No" / None stored as 1 / 0 / -1
+POINT_FIELDS = {
+    "frames":             ("int",   np.int32,   ()),
+    "original_coords":    ("xy",    np.float64, (2,)),
+    "search_centers":     ("xy",    np.float64, (2,)),
+    "spot_centers":       ("xy",    np.float64, (2,)),
+    "sigmas":             ("float", np.float64, ()),
+    "peaks":              ("float", np.float64, ()),
+    "intensities":        ("float", np.float64, ()),
+    "background":         ("float", np.float64, ()),
+    "velocities":         ("float", np.float64, ()),
+    "colocalization_any": ("flag",  np.int8,    ()),
+}
+
+_FLAG_CODES = {"Yes": 1, "No": 0, None: -1}
+_FLAG_NAMES = {1: "Yes", 0: "No", -1: None}
+_MIN_CAPACITY = 1024
+
+def _encode(field, values):
+    """
+    Array for a whole field, or None if the values do not fit the column type
+    (the record then keeps them as a plain list).
+    """
+    kind, dtype, shape = POINT_FIELDS[field]
+    if isinstance(values, PointColumn):
+        values = values.array()
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        if kind == "flag" or values.shape[1:] != shape:
+            return None
+        return values.astype(dtype, copy=True)
+    try:
+        if kind == "flag":
+            return np.array([_FLAG_CODES[v] for v in values], dtype=dtype)
+        if kind == "int":
+            return np.array([int(v) for v in values], dtype=dtype).reshape(-1)
+        if kind == "float":
+            return np.array(
+                [np.nan if v is None else float(v) for v in values], dtype=dtype
+            ).reshape(-1)
+        out = np.full((len(values), 2), np.nan, dtype=dtype)
+        for i, v in enumerate(values):
+            if v is not None and v[0] is not None and v[1] is not None:
+                out[i] = (float(v[0]), float(v[1]))
+        return out
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+
+def _encode_one(field, value):
+    kind = POINT_FIELDS[field][0]
+    if kind == "flag":
+        return _FLAG_CODES[value]
+    if kind == "int":
+        return int(value)
+    if kind == "float":
+        return np.nan if value is None else float(value)
+    if value is None or value[0] is None or value[1] is None:
+        return (np.nan, np.nan)
+    return (float(value[0]), float(value[1]))
+
+def _decode(field, arr):
+    kind = POINT_FIELDS[field][0]
+    if kind == "flag":
+        return [_FLAG_NAMES.get(v) for v in arr.tolist()]
+    if kind == "int":
+        return arr.tolist()
+    if kind == "float":
+        return [None if v != v else v for v in arr.tolist()]
+    return [None if (x != x or y != y) else (x, y) for x, y in arr.tolist()]
+
+class PointColumn(MutableSequence):
+    """
+    List-like view of one per-point field of one trajectory. Reads decode from
+    the store (NaN -> None, flag codes -> "Yes"/"No"), writes go straight back.
+    array() gives the underlying NumPy values without copying. append() and
+    pop() are amortized O(1): each column keeps spare capacity in the store.
+    """
+    __slots__ = ("_record", "_field")
+
+    def __init__(self, record, field):
+        self._record = record
+        self._field = field
+
+    def _plain(self):
+        # the list itself once the record is detached or fell back to a list
+        rec = self._record
+        if rec._store is None or self._field not in rec._slots:
+            return rec._meta.setdefault(self._field, [])
+        return None
+
+    def array(self):
+        return self._record._array(self._field)
+
+    def tolist(self):
+        return list(self)
+
+    # for JSON encoders that honour __json__ / for_json
+    __json__ = tolist
+    for_json = tolist
+
+    def __reduce__(self):
+        # pickle (and multiprocessing) see a plain list, not the whole store
+        return (list, (list(self),))
+
+    def __len__(self):
+        plain = self._plain()
+        return len(plain) if plain is not None else len(self.array())
+
+    def __iter__(self):
+        plain = self._plain()
+        if plain is not None:
+            return iter(list(plain))
+        return iter(_decode(self._field, self.array()))
+
+    def __getitem__(self, i):
+        plain = self._plain()
+        if plain is not None:
+            return plain[i]
+        arr = self.array()
+        if isinstance(i, slice):
+            return _decode(self._field, arr[i])
+        n = len(arr)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("list index out of range")
+        return _decode(self._field, arr[i:i + 1])[0]
+
+    def __setitem__(self, i, value):
+        plain = self._plain()
+        if plain is not None:
+            plain[i] = value
+            return
+        if isinstance(i, slice):
+            values = list(self)
+            values[i] = value
+            self._record[self._field] = values
+            return
+        arr = self.array()
+        if not -len(arr) <= i < len(arr):
+            raise IndexError("list assignment index out of range")
+        try:
+            arr[i] = _encode_one(self._field, value)
+        except (KeyError, TypeError, ValueError, IndexError):
+            # value does not fit the column type: fall back to a plain list
+            values = list(self)
+            values[i] = value
+            self._record._store_plain(self._field, values)
+
+    def __delitem__(self, i):
+        plain = self._plain()
+        if plain is not None:
+            del plain[i]
+            return
+        if isinstance(i, slice):
+            values = list(self)
+            del values[i]
+            self._record[self._field] = values
+            return
+        arr = self.array()
+        n = len(arr)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("list assignment index out of range")
+        # shift the tail down in place; deleting the last point is O(1)
+        arr[i:n - 1] = arr[i + 1:n]
+        self._record._store._resize(self._record, self._field, n - 1)
+
+    def append(self, value):
+        plain = self._plain()
+        if plain is not None:
+            plain.append(value)
+            return
+        try:
+            encoded = _encode_one(self._field, value)
+        except (KeyError, TypeError, ValueError, IndexError):
+            values = list(self)
+            values.append(value)
+            self._record._store_plain(self._field, values)
+            return
+        self._record._store._append(self._record, self._field, encoded)
+
+    def insert(self, i, value):
+        plain = self._plain()
+        if plain is not None:
+            plain.insert(i, value)
+            return
+        n = len(self)
+        i = max(0, min(n, i + n if i < 0 else i))
+        self.append(value)
+        plain = self._plain()
+        if plain is not None:
+            # value did not fit the column type
+            plain.insert(i, plain.pop())
+        elif i < n:
+            arr = self.array()
+            last = arr[n].copy()
+            arr[i + 1:n + 1] = arr[i:n]
+            arr[i] = last
+
+    def __eq__(self, other):
+        if isinstance(other, (PointColumn, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def copy(self):
+        return list(self)
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __repr__(self):
+        return repr(list(self))
+
+class TrajectoryRecord(MutableMapping):
+    """
+    Dict-compatible view of one trajectory in a TrajectoryStore. Per-point
+    fields come back as PointColumn views; everything else (start, end, roi,
+    custom_fields, steps, …) is kept as-is. A record that is removed from or
+    replaced in its store is detached: it keeps working on its own copy.
+    """
+    __slots__ = ("_store", "_meta", "_slots", "_caps")
+
+    def __init__(self, store):
+        self._store = store
+        self._meta = {}
+        self._slots = {}
+        # field -> space reserved in the store (>= the slot length)
+        self._caps = {}
+
+    # --- column plumbing -------------------------------------------------
+    def _array(self, field):
+        store = self._store
+        if store is None or field not in self._slots:
+            # detached, or kept as a plain list
+            value = self._meta.get(field)
+            arr = _encode(field, [] if value is None else value)
+            if arr is None:
+                raise ValueError(f"{field!r} holds values that are not {POINT_FIELDS[field][0]}")
+            return arr
+        with store._lock:
+            start, n = self._slots[field]
+            return store._buf[field][start:start + n]
+
+    def _store_plain(self, field, values):
+        if self._store is not None and field in self._slots:
+            self._store._release(self, field)
+        self._meta[field] = values
+
+    def _detach(self):
+        for field in list(self._slots):
+            self._meta[field] = _decode(field, self._array(field))
+        self._slots.clear()
+        self._caps.clear()
+        self._store = None
+
+    def array(self, field):
+        """
+        Zero-copy NumPy view of a per-point field (NaN for missing values, flag
+        codes 1 / 0 / -1). Valid until the store next grows or compacts.
+        """
+        return self._array(field)
+
+    # --- mapping interface -----------------------------------------------
+    def __getitem__(self, key):
+        if key in self._slots:
+            return PointColumn(self, key)
+        return self._meta[key]
+
+    def __setitem__(self, key, value):
+        if key in POINT_FIELDS and self._store is not None \
+                and isinstance(value, (list, tuple, np.ndarray, PointColumn)):
+            arr = _encode(key, value)
+            if arr is not None:
+                self._meta.pop(key, None)
+                self._store._write(self, key, arr)
+                return
+        if key in self._slots:
+            self._store._release(self, key)
+        self._meta[key] = value
+
+    def __delitem__(self, key):
+        if key in self._slots:
+            self._store._release(self, key)
+            return
+        del self._meta[key]
+
+    def __contains__(self, key):
+        return key in self._slots or key in self._meta
+
+    def __iter__(self):
+        yield from self._slots
+        yield from self._meta
+
+    def __len__(self):
+        return len(self._slots) + len(self._meta)
+
+    def to_dict(self):
+        """
+        Plain dict copy, with per-point fields as Python lists.
+        """
+        return {k: (list(v) if isinstance(v, PointColumn) else v) for k, v in self.items()}
+
+    def copy(self):
+        return self.to_dict()
+
+    def __copy__(self):
+        return self.to_dict()
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self.to_dict(), memo)
+
+    def __reduce__(self):
+        return (dict, (self.to_dict(),))
+
+    def __repr__(self):
+        return f"TrajectoryRecord({self.to_dict()!r})"
+
+class TrajectoryStore(MutableSequence):
+    """
+    Ordered, list-compatible container of trajectories backed by one
+    contiguous buffer per per-point field.
+    - store[i] returns a TrajectoryRecord; assigning or appending a plain dict
+      ingests it (assigning a record back to its own slot is a no-op)
+    - concat(field) returns (values, offsets) over all trajectories without
+      copying, for plotting, export and aggregate statistics
+    Buffers grow geometrically; space freed by shrinking or replacing
+    trajectories is reclaimed once it exceeds half the buffer. A column that
+    is appended to point by point gets spare capacity that doubles as it
+    grows, like a list.
+    """
+
+    def __init__(self, trajectories=()):
+        self._lock = threading.RLock()
+        self._records = []
+        # records being filled by _ingest, not yet in _records; compaction
+        # must move their columns too
+        self._ingesting = []
+        self._buf = {}
+        self._used = {}
+        self._waste = {}
+        for f, (_, dtype, shape) in POINT_FIELDS.items():
+            self._buf[f] = np.empty((_MIN_CAPACITY,) + shape, dtype=dtype)
+            self._used[f] = 0
+            self._waste[f] = 0
+        self.extend(trajectories)
+
+    # --- buffer management -----------------------------------------------
+    def _reserve(self, field, n):
+        buf = self._buf[field]
+        need = self._used[field] + n
+        if need > len(buf):
+            grown = np.empty((max(need, 2 * len(buf)),) + buf.shape[1:], dtype=buf.dtype)
+            grown[:self._used[field]] = buf[:self._used[field]]
+            self._buf[field] = grown
+
+    def _cap(self, record, field):
+        return record._caps.get(field, record._slots[field][1])
+
+    def _write(self, record, field, arr):
+        with self._lock:
+            n = len(arr)
+            slot = record._slots.get(field)
+            if slot is not None and n <= self._cap(record, field):
+                # rewrite in place; give back the tail if it is mostly unused
+                cap = self._cap(record, field)
+                self._buf[field][slot[0]:slot[0] + n] = arr
+                record._slots[field] = (slot[0], n)
+                if n < cap // 4:
+                    self._waste[field] += cap - n
+                    record._caps.pop(field, None)
+            else:
+                if slot is not None:
+                    self._waste[field] += self._cap(record, field)
+                self._reserve(field, n)
+                start = self._used[field]
+                self._buf[field][start:start + n] = arr
+                self._used[field] = start + n
+                record._slots[field] = (start, n)
+                record._caps.pop(field, None)
+            self._maybe_compact(field)
+
+    def _append(self, record, field, value):
+        with self._lock:
+            start, n = record._slots[field]
+            cap = self._cap(record, field)
+            if n == cap:
+                if start + cap == self._used[field]:
+                    # last column in the buffer: grow it where it is
+                    self._reserve(field, 1)
+                    self._used[field] += 1
+                    cap += 1
+                else:
+                    # move to the end with room to double
+                    cap = max(8, 2 * n)
+                    self._reserve(field, cap)
+                    new = self._used[field]
+                    buf = self._buf[field]
+                    buf[new:new + n] = buf[start:start + n]
+                    self._used[field] = new + cap
+                    self._waste[field] += self._cap(record, field)
+                    start = new
+                record._caps[field] = cap
+            self._buf[field][start + n] = value
+            record._slots[field] = (start, n + 1)
+            self._maybe_compact(field)
+
+    def _resize(self, record, field, n):
+        # shrink a column to its first n points, keeping the space
+        with self._lock:
+            start, old = record._slots[field]
+            record._caps[field] = self._cap(record, field)
+            record._slots[field] = (start, min(n, old))
+
+    def _release(self, record, field):
+        with self._lock:
+            self._waste[field] += self._cap(record, field)
+            record._slots.pop(field)
+            record._caps.pop(field, None)
+            self._maybe_compact(field)
+
+    def _maybe_compact(self, field):
+        if self._waste[field] > max(_MIN_CAPACITY, self._used[field] // 2):
+            self._compact(field)
+
+    def _compact(self, field, tight=False):
+        """
+        Rewrite `field` with the records laid out back to back in list order;
+        spare capacity is kept unless tight.
+        """
+        with self._lock:
+            old = self._buf[field]
+            caps = {}
+            live = self._records + self._ingesting
+            for r in live:
+                if field in r._slots:
+                    caps[id(r)] = r._slots[field][1] if tight else self._cap(r, field)
+            total = sum(caps.values())
+            new = np.empty((max(_MIN_CAPACITY, total),) + old.shape[1:], dtype=old.dtype)
+            pos = 0
+            for r in live:
+                slot = r._slots.get(field)
+                if slot is None:
+                    continue
+                start, n = slot
+                new[pos:pos + n] = old[start:start + n]
+                r._slots[field] = (pos, n)
+                cap = caps[id(r)]
+                if cap > n:
+                    r._caps[field] = cap
+                else:
+                    r._caps.pop(field, None)
+                pos += cap
+            self._buf[field] = new
+            self._used[field] = pos
+            self._waste[field] = 0
+
+    def _ingest(self, traj):
+        record = TrajectoryRecord(self)
+        items = traj.items() if isinstance(traj, Mapping) else dict(traj).items()
+        with self._lock:
+            self._ingesting.append(record)
+            try:
+                for key, value in items:
+                    record[key] = value
+            finally:
+                # by identity: records compare equal by content
+                self._ingesting = [r for r in self._ingesting if r is not record]
+        return record
+
+    def _drop(self, record):
+        with self._lock:
+            for field in record._slots:
+                self._waste[field] += self._cap(record, field)
+            record._detach()
+
+    # --- sequence interface ----------------------------------------------
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, i):
+        return self._records[i]
+
+    def __setitem__(self, i, traj):
+        if isinstance(i, slice):
+            old = self._records[i]
+            new = [self._ingest(t) for t in traj]
+            for r in old:
+                if not any(r is n for n in new):
+                    self._drop(r)
+            self._records[i] = new
+            return
+        if traj is self._records[i]:
+            return
+        record = self._ingest(traj)
+        self._drop(self._records[i])
+        self._records[i] = record
+
+    def __delitem__(self, i):
+        old = self._records[i]
+        for r in (old if isinstance(i, slice) else [old]):
+            self._drop(r)
+        del self._records[i]
+
+    def insert(self, i, traj):
+        self._records.insert(i, self._ingest(traj))
+
+    def clear(self):
+        with self._lock:
+            for r in self._records:
+                r._detach()
+            self._records = []
+            for f in POINT_FIELDS:
+                self._used[f] = 0
+                self._waste[f] = 0
+
+    def __deepcopy__(self, memo):
+        # snapshots (backups before a recalculation) are plain dicts
+        return [copy.deepcopy(r, memo) for r in self._records]
+
+    def __copy__(self):
+        return list(self._records)
+
+    def __eq__(self, other):
+        if isinstance(other, (TrajectoryStore, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TrajectoryStore({len(self)} trajectories)"
+
+    # --- columnar access -------------------------------------------------
+    def concat(self, field):
+        """
+        (values, offsets) for `field` over all trajectories, in order, without
+        copying: trajectory i is values[offsets[i]:offsets[i + 1]]. Trajectories
+        that do not hold `field` as a column contribute no points.
+        """
+        if field not in POINT_FIELDS:
+            raise KeyError(field)
+        with self._lock:
+            lengths = np.array(
+                [r._slots[field][1] if field in r._slots else 0 for r in self._records],
+                dtype=np.int64,
+            )
+            offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            in_order = all(
+                r._slots[field][0] == offsets[k] and self._cap(r, field) == r._slots[field][1]
+                for k, r in enumerate(self._records) if field in r._slots
+            )
+            if not in_order or self._waste[field]:
+                self._compact(field, tight=True)
+            return self._buf[field][:offsets[-1]], offsets
+
+    def nbytes(self):
+        return sum(b.nbytes for b in self._buf.values())
+
+def point_array(traj, field):
+    """
+    Per-point field of any trajectory (record or plain dict) as a NumPy array,
+    without copying when `traj` lives in a TrajectoryStore.
+    """
+    if isinstance(traj, TrajectoryRecord):
+        return traj.array(field)
+    values = traj.get(field)
+    arr = _encode(field, [] if values is None else values)
+    if arr is None:
+        raise ValueError(f"{field!r} holds values that are not {POINT_FIELDS[field][0]}")
+    return arr